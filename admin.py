@@ -0,0 +1,373 @@
+"""Admin pages: quiz and user management, analysis, exports and metrics."""
+import csv
+import hmac
+import io
+from datetime import datetime, timedelta
+from flask import (
+    Blueprint, current_app, request, render_template, redirect, url_for, flash, session, jsonify,
+    Response, stream_with_context
+)
+from models import Question, Result, db, User, Quiz
+from db_utils import (
+    add_question, add_quiz, delete_question, delete_quiz, update_question, update_quiz
+)
+from analytics import (
+    results_page, RESULTS_PAGE_SIZE, quiz_average_scores, performance_summary,
+    active_quizzes_with_question_counts
+)
+from auth import admin_required
+from replica import read_replica
+from metrics import metrics, prometheus_text
+from export import export_rows, encode, gzip_chunks, FORMATS as EXPORT_FORMATS
+from quiz_cache import cache_stats
+from provisioning import provision_students
+
+admin = Blueprint('admin', __name__, url_prefix='/admin')
+
+
+@admin.route('')
+@admin_required
+@read_replica
+def admin_dashboard():
+    # --- Dashboard Stats ---
+    total_users = User.query.count()
+    total_active = User.query.filter_by(is_active=True).count()
+    total_quizzes = Quiz.query.filter(Quiz.archived_at.is_(None)).count()
+    total_questions = Question.query.count()
+
+    # --- User Management ---
+    users = User.query.all()
+    
+    # --- Quiz List (question counts come from the same grouped query) ---
+    quiz_rows = active_quizzes_with_question_counts()
+    quizzes = [quiz for quiz, _ in quiz_rows]
+    question_counts = {quiz.id: n for quiz, n in quiz_rows}
+
+    return render_template('admin_dashboard.html',
+                           total_users=total_users,
+                           total_active=total_active,
+                           total_quizzes=total_quizzes,
+                           total_questions=total_questions,
+                           users=users,
+                           quizzes=quizzes,
+                           question_counts=question_counts)
+
+@admin.route('/add_quiz', methods=['GET', 'POST'])
+@admin_required
+def add_quiz_route():
+    if request.method == 'POST':
+        title = request.form.get('title')
+        description = request.form.get('description')
+        quiz = add_quiz(title, description)
+        if quiz:
+            flash('Quiz added successfully!')
+            return redirect(url_for('admin.admin_dashboard'))
+        else:
+            flash('Quiz with this title already exists.')
+    return render_template('add_quiz.html')
+
+
+@admin.route('/update_quiz/<int:quiz_id>', methods=['GET', 'POST'])
+@admin_required
+def update_quiz_route(quiz_id):
+    quiz = Quiz.query.get_or_404(quiz_id)
+    if request.method == 'POST':
+        new_title = request.form.get('title')
+        new_description = request.form.get('description')
+        if update_quiz(quiz_id, new_title, new_description):
+            flash('Quiz updated successfully!')
+            return redirect(url_for('admin.admin_dashboard'))
+        flash('Quiz with this title already exists.')
+    return render_template('update_quiz.html', quiz=quiz)
+
+
+@admin.route('/delete_quiz/<int:quiz_id>', methods=['POST'])
+@admin_required
+def delete_quiz_route(quiz_id):
+    # Quizzes with many attempts are archived now and purged in chunks later
+    archive = Result.query.filter_by(quiz_id=quiz_id).count() > current_app.config['QUIZ_ARCHIVE_THRESHOLD']
+    if delete_quiz(quiz_id, archive=archive):
+        if archive:
+            flash('Quiz archived! Its results will be removed by the next purge.')
+        else:
+            flash('Quiz deleted successfully!')
+    else:
+        flash('Quiz not found.')
+    return redirect(url_for('admin.admin_dashboard'))
+
+
+@admin.route('/<int:quiz_id>/grade_sheets', methods=['GET', 'POST'])
+@admin_required
+def grade_sheets_route(quiz_id):
+    from omr import grade_sheets, summarize  # pulls in NumPy, only needed here
+
+    quiz = Quiz.query.get_or_404(quiz_id)
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('sheets')
+        if not upload or not upload.filename:
+            flash('⚠️ Choose a CSV file of answer sheets.')
+            return redirect(url_for('admin.grade_sheets_route', quiz_id=quiz_id))
+        try:
+            report = grade_sheets(quiz, io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''))
+        except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+            flash(f'⚠️ Could not grade the file: {exc}')
+            return redirect(url_for('admin.grade_sheets_route', quiz_id=quiz_id))
+    return render_template('grade_sheets.html', quiz=quiz, report=report,
+                           counts=summarize(report) if report is not None else None)
+
+
+@admin.route('/provision_students', methods=['GET', 'POST'])
+@admin_required
+def provision_students_route():
+    report = summary = None
+    if request.method == 'POST':
+        upload = request.files.get('accounts')
+        if not upload or not upload.filename:
+            flash('⚠️ Choose a CSV file of student accounts.')
+            return redirect(url_for('admin.provision_students_route'))
+        try:
+            report, summary = provision_students(io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''),
+                                                 method=current_app.config['PASSWORD_HASH_METHOD'],
+                                                 hasher=current_app.extensions['password_hasher'],
+                                                 max_new=current_app.config['PROVISION_WEB_MAX_ACCOUNTS'])
+        except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+            flash(f'⚠️ Could not read the file: {exc}')
+            return redirect(url_for('admin.provision_students_route'))
+    return render_template('provision_students.html', report=report, summary=summary)
+
+
+@admin.route('/<int:quiz_id>/add_question', methods=['GET', 'POST'])
+@admin_required
+def add_question_route(quiz_id):
+    quiz = Quiz.query.get_or_404(quiz_id)
+    if request.method == 'POST':
+        question = add_question(
+            quiz_id,
+            request.form.get('text'),
+            request.form.get('choice_a'),
+            request.form.get('choice_b'),
+            request.form.get('choice_c'),
+            request.form.get('choice_d'),
+            request.form.get('correct')
+        )
+        if question:
+            flash('Question added successfully!')
+            return redirect(url_for('admin.update_quiz_route', quiz_id=quiz_id))
+        else:
+            flash('Failed to add question.')
+    return render_template('add_question.html', quiz=quiz)
+
+
+@admin.route('/update_question/<int:question_id>', methods=['GET', 'POST'])
+@admin_required
+def update_question_route(question_id):
+    question = Question.query.get_or_404(question_id)
+    if request.method == 'POST':
+        update_question(
+            question_id,
+            new_text=request.form.get('text'),
+            choice_a=request.form.get('choice_a'),
+            choice_b=request.form.get('choice_b'),
+            choice_c=request.form.get('choice_c'),
+            choice_d=request.form.get('choice_d'),
+            correct=request.form.get('correct')
+        )
+        flash('Question updated successfully!')
+        return redirect(url_for('admin.update_quiz_route', quiz_id=question.quiz_id))
+    return render_template('update_question.html', question=question)
+
+
+@admin.route('/delete_question/<int:question_id>', methods=['POST'])
+@admin_required
+def delete_question_route(question_id):
+    question = Question.query.get_or_404(question_id)
+    quiz_id = question.quiz_id
+    delete_question(question_id)
+    flash('Question deleted successfully!')
+    return redirect(url_for('admin.update_quiz_route', quiz_id=quiz_id))
+
+@admin.route('/update_user/<int:user_id>', methods=['POST'])
+@admin_required
+def update_user_route(user_id):
+    user = User.query.get_or_404(user_id)
+    user.role = request.form.get('role')
+    user.is_active = request.form.get('is_active') == '1'
+    db.session.commit()
+    flash('✅ User updated successfully!')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@admin.route('/analysis')
+@admin_required
+@read_replica
+def analysis():
+    # The results table is filled page by page from analysis_results()
+    # --- Prepare chart data: average score per quiz (aggregated in SQL) ---
+    quiz_averages = quiz_average_scores()
+    quizzes = [q for q, _ in quiz_averages]
+    chart_labels = [q.title for q in quizzes]
+    chart_data = [avg for _, avg in quiz_averages]
+
+    total_quizzes = len(quizzes)
+    total_students = User.query.filter_by(role='student').count()
+    total_questions = Question.query.count()
+
+    # --- Performance summary (counts and average computed in SQL) ---
+    summary = performance_summary()
+
+    return render_template('analysis.html',
+                           chart_labels=chart_labels,
+                           chart_data=chart_data,
+                           total_quizzes=total_quizzes,
+                           total_students=total_students,
+                           total_questions=total_questions,
+                           quiz_list=quizzes,
+                           **summary)
+
+
+@admin.route('/analysis/results')
+@admin_required
+@read_replica
+def analysis_results():
+    try:
+        rows, next_cursor = results_page(
+            after=request.args.get('after') or None,
+            limit=request.args.get('limit', RESULTS_PAGE_SIZE, type=int),
+            **results_filters(request.args)
+        )
+    except ValueError:
+        return jsonify(error='Invalid filter or cursor.'), 400
+
+    return jsonify(
+        results=[{
+            'id': r.id,
+            'quiz_id': r.quiz_id,
+            'quiz': r.quiz_title,
+            'student': r.username,
+            'score': r.score,
+            'total': r.total,
+            'percentage': round(r.score / r.total * 100, 1) if r.total else 0,
+            'timestamp': r.timestamp.strftime("%Y-%m-%d %H:%M") if r.timestamp else '',
+        } for r in rows],
+        next=next_cursor,
+    )
+
+
+@admin.route('/analysis/items/<int:quiz_id>')
+@admin_required
+@read_replica
+def item_analysis_route(quiz_id):
+    from item_analysis import analyze_quiz, CHOICE_LABELS  # NumPy, only needed here
+
+    quiz = Quiz.query.get_or_404(quiz_id)
+    analysis = analyze_quiz(quiz)
+    texts = dict(db.session.query(Question.id, Question.text).filter(Question.quiz_id == quiz_id))
+
+    def number(value):
+        return None if value != value else round(float(value), 3)  # NaN -> null
+
+    return jsonify(
+        quiz_id=quiz.id,
+        attempts=analysis.attempts,
+        kr20=number(analysis.kr20),
+        items=[{
+            'question_id': qid,
+            'text': texts.get(qid, ''),
+            'correct': analysis.correct[j],
+            'seen': int(analysis.seen[j]),
+            'p_value': number(analysis.p_value[j]),
+            'discrimination': number(analysis.discrimination[j]),
+            'choice_rates': {label: number(rate) for label, rate in zip(CHOICE_LABELS, analysis.choice_rates[j])},
+        } for j, qid in enumerate(analysis.question_ids)],
+    )
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d') if value else None
+
+
+def results_filters(args):
+    # Shared by the results table and the export; raises ValueError on bad dates
+    date_to = parse_date(args.get('to'))
+    return {
+        'quiz_id': args.get('quiz_id', type=int),
+        'student': args.get('student', '').strip() or None,
+        'date_from': parse_date(args.get('from')),
+        'date_to': date_to + timedelta(days=1) if date_to else None,  # inclusive end date
+    }
+
+
+@admin.route('/export/results')
+@admin_required
+@read_replica
+def export_results():
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify(error=f'Unknown format {fmt!r}.'), 400
+    try:
+        filters = results_filters(request.args)
+    except ValueError:
+        return jsonify(error='Invalid filter.'), 400
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    chunks = encode(export_rows(**filters), fmt)
+    headers = {'Content-Disposition': f'attachment; filename=results.{extension}',
+               'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('Accept-Encoding', '') and request.args.get('gzip') != '0':
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    # stream_with_context keeps the session (and its cursor) open while the body is sent
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+
+@admin.route('/metrics')
+def metrics_route():
+    # Prometheus can't log in, so the text format also accepts METRICS_TOKEN as a bearer token
+    token = current_app.config.get('METRICS_TOKEN')
+    scraper = bool(token) and hmac.compare_digest(request.headers.get('Authorization', '').encode(),
+                                                  f'Bearer {token}'.encode())
+    if not scraper and session.get('role') != 'admin':
+        flash('Access denied!')
+        return redirect(url_for('auth.login'))
+
+    if request.args.get('format') == 'prometheus' or scraper:
+        caches = cache_stats()
+        gauges = [('quiz_cache_entries', 'Entries in in-process caches.', {'cache': name}, stats['size'])
+                  for name, stats in caches.items()]
+        counters = [
+            ('quiz_cache_hits_total', 'Cache hits since start.', {'cache': name}, stats['hits'])
+            for name, stats in caches.items()
+        ] + [
+            ('quiz_cache_misses_total', 'Cache misses since start.', {'cache': name}, stats['misses'])
+            for name, stats in caches.items()
+        ]
+        result_writer = current_app.extensions.get('result_writer')
+        if result_writer is not None:
+            writer_stats = result_writer.stats()
+            gauges.append(('quiz_result_writer_queued', 'Submissions waiting for the result writer.', {},
+                           writer_stats.pop('queued')))
+            counters += [(f'quiz_result_writer_{name}_total', 'Group-commit result writer counter.', {}, value)
+                         for name, value in writer_stats.items()]
+        hasher = current_app.extensions['password_hasher']
+        hasher_stats = hasher.stats()
+        gauges += [(f'quiz_password_hasher_{name}', 'Password hashing pool slots.', {}, hasher_stats.pop(name))
+                   for name in ('in_flight', 'capacity')]
+        counters += [(f'quiz_password_hasher_{name}_total', 'Password hashing pool counter.', {}, value)
+                     for name, value in hasher_stats.items()]
+        histograms = [('quiz_password_hash_seconds', 'Password hashing latency, including the wait for a worker.',
+                       'operation', hasher.latency())]
+        return Response(prometheus_text(gauges, histograms, counters), mimetype='text/plain; version=0.0.4')
+
+    hasher = current_app.extensions['password_hasher']
+    return render_template('metrics.html',
+                           routes=metrics.snapshot(),
+                           caches=cache_stats(),
+                           hasher=hasher.stats(),
+                           hash_latency=hasher.latency(),
+                           slow_query_ms=current_app.config['SLOW_QUERY_MS'])
+
+
+@admin.route('/cache_stats')
+@admin_required
+def cache_stats_route():
+    return jsonify(cache_stats())
@@ -0,0 +1,204 @@
+from datetime import datetime
+from sqlalchemy import func, case, cast, Float, and_, or_
+from models import db, User, Quiz, Question, Result, QuizStats, StudentQuizStats
+
+
+# --- Expressions ---
+def score_pct():
+    # Percentage of a single attempt, 0 when the quiz had no questions
+    return case(
+        (Result.total > 0, cast(Result.score, Float) * 100 / Result.total),
+        else_=0.0
+    )
+
+
+def count_where(cond):
+    return func.coalesce(func.sum(case((cond, 1), else_=0)), 0)
+
+
+# --- Admin analysis (reads the QuizStats rollup) ---
+def quiz_average_scores():
+    """Return [(quiz, avg_pct)] for every quiz, 0 for quizzes without attempts."""
+    rows = (
+        db.session.query(Quiz, QuizStats)
+        .outerjoin(QuizStats, QuizStats.quiz_id == Quiz.id)
+        .filter(Quiz.archived_at.is_(None))
+        .order_by(Quiz.id)
+        .all()
+    )
+    return [
+        (quiz, round(stats.pct_sum / stats.attempts, 2) if stats and stats.attempts else 0)
+        for quiz, stats in rows
+    ]
+
+
+def performance_summary():
+    """Return overall attempt count, bucket counts and average (0-1) in one query."""
+    row = db.session.query(
+        func.coalesce(func.sum(QuizStats.attempts), 0),
+        func.coalesce(func.sum(QuizStats.excellent_count), 0),
+        func.coalesce(func.sum(QuizStats.good_count + QuizStats.fair_count), 0),
+        func.coalesce(func.sum(QuizStats.poor_count), 0),
+        func.coalesce(func.sum(QuizStats.pct_sum), 0),
+    ).one()
+    total, excellent_count, good_count, poor_count, pct_sum = row
+    return {
+        'total_results': int(total),
+        'excellent_count': int(excellent_count),  # 80-100%
+        'good_count': int(good_count),  # 50-79%
+        'poor_count': int(poor_count),  # 0-49%
+        'average_score': float(pct_sum) / total / 100 if total else 0,  # normalized 0-1 for template
+    }
+
+
+# --- Admin results table (keyset pagination on timestamp, id) ---
+RESULTS_PAGE_SIZE = 50
+RESULTS_PAGE_MAX = 200
+
+
+def encode_cursor(timestamp, result_id):
+    return f"{timestamp.isoformat() if timestamp else ''}|{result_id}"
+
+
+def decode_cursor(cursor):
+    """Return (timestamp or None, id); raises ValueError on a malformed cursor."""
+    timestamp, _, result_id = cursor.partition('|')
+    return (datetime.fromisoformat(timestamp) if timestamp else None), int(result_id)
+
+
+def results_page(after=None, quiz_id=None, student=None, date_from=None, date_to=None,
+                 limit=RESULTS_PAGE_SIZE):
+    """Return (rows, next_cursor) for the newest results older than the after cursor.
+
+    student filters by username prefix; date_from/date_to bound the timestamp. Rows are
+    (id, timestamp, score, total, quiz_id, quiz_title, username) joined in one query.
+    """
+    limit = max(1, min(limit, RESULTS_PAGE_MAX))
+    query = (
+        db.session.query(Result.id, Result.timestamp, Result.score, Result.total,
+                         Quiz.id.label('quiz_id'), Quiz.title.label('quiz_title'), User.username)
+        .join(Quiz, Quiz.id == Result.quiz_id)
+        .outerjoin(User, User.id == Result.student_id)
+        .filter(Quiz.archived_at.is_(None))
+    )
+    if quiz_id:
+        query = query.filter(Result.quiz_id == quiz_id)
+    if student:
+        query = query.filter(User.username.startswith(student, autoescape=True))
+    if date_from:
+        query = query.filter(Result.timestamp >= date_from)
+    if date_to:
+        query = query.filter(Result.timestamp < date_to)
+    if after:
+        timestamp, result_id = decode_cursor(after)
+        if timestamp is None:
+            # Legacy rows without a timestamp sort last
+            query = query.filter(Result.timestamp.is_(None), Result.id < result_id)
+        else:
+            query = query.filter(or_(
+                Result.timestamp < timestamp,
+                and_(Result.timestamp == timestamp, Result.id < result_id),
+                Result.timestamp.is_(None),
+            ))
+    rows = (query.order_by(Result.timestamp.desc(), Result.id.desc())
+            .limit(limit + 1)
+            .all())
+    next_cursor = encode_cursor(rows[limit - 1].timestamp, rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+# --- Student views (read the StudentQuizStats rollup) ---
+def student_quiz_stats(student_id):
+    """Return {quiz_id: StudentQuizStats} for one student."""
+    rows = StudentQuizStats.query.filter_by(student_id=student_id).all()
+    return {row.quiz_id: row for row in rows}
+
+
+def _question_counts():
+    return (
+        db.session.query(Question.quiz_id.label('quiz_id'), func.count(Question.id).label('n'))
+        .group_by(Question.quiz_id)
+        .subquery()
+    )
+
+
+def active_quizzes_with_question_counts():
+    """Return [(quiz, question_count)] for quizzes that are not archived, in one query."""
+    question_counts = _question_counts()
+    rows = (
+        db.session.query(Quiz, func.coalesce(question_counts.c.n, 0))
+        .outerjoin(question_counts, question_counts.c.quiz_id == Quiz.id)
+        .filter(Quiz.archived_at.is_(None))
+        .order_by(Quiz.id)
+        .all()
+    )
+    return [(quiz, int(n)) for quiz, n in rows]
+
+
+def student_dashboard_rows(student_id):
+    """Return [(quiz, question_count, StudentQuizStats or None)] in a single query."""
+    question_counts = _question_counts()
+    rows = (
+        db.session.query(Quiz, func.coalesce(question_counts.c.n, 0), StudentQuizStats)
+        .outerjoin(question_counts, question_counts.c.quiz_id == Quiz.id)
+        .outerjoin(StudentQuizStats, and_(StudentQuizStats.quiz_id == Quiz.id,
+                                          StudentQuizStats.student_id == student_id))
+        .filter(Quiz.archived_at.is_(None))
+        .order_by(Quiz.id)
+        .all()
+    )
+    return [(quiz, int(n), stats) for quiz, n, stats in rows]
+
+
+def student_summary(stats):
+    """Summarize a student's rollup rows the way the results page buckets them."""
+    total = sum(s.attempts for s in stats)
+    pct_sum = sum(s.pct_sum for s in stats)
+    return {
+        'total_results': total,
+        'excellent_count': sum(s.excellent_count for s in stats),  # 80-100%
+        'good_count': sum(s.good_count for s in stats),  # 60-79%
+        'poor_count': sum(s.fair_count + s.poor_count for s in stats),  # 0-59%
+        'average_score': pct_sum / total / 100 if total else 0,  # normalized 0-1
+        'unique_quizzes': sum(1 for s in stats if s.attempts > 0),
+    }
+
+
+def score_ratio(score_sum, total_sum):
+    # Aggregate percentage (sum of scores over sum of totals), rounded for display
+    return round(score_sum / total_sum * 100, 1) if total_sum else 0
+
+
+# --- Data versions (for HTTP ETags) ---
+def _scalar(column, condition):
+    return db.select(column).where(condition).scalar_subquery()
+
+
+def student_pages_version(student_id):
+    """Fingerprint of everything the student dashboard and results pages show, in one query.
+
+    Active quizzes are covered by their count, highest id and version sum (every edit
+    bumps a version); the student's attempts by the rollup totals and the newest result.
+    """
+    active = Quiz.archived_at.is_(None)
+    mine = StudentQuizStats.student_id == student_id
+    return tuple(db.session.execute(db.select(
+        _scalar(func.count(Quiz.id), active),
+        _scalar(func.max(Quiz.id), active),
+        _scalar(func.sum(Quiz.version), active),
+        _scalar(func.sum(StudentQuizStats.attempts), mine),
+        _scalar(func.sum(StudentQuizStats.score_sum), mine),
+        _scalar(func.max(Result.timestamp), Result.student_id == student_id),
+    )).one())
+
+
+def quiz_page_version(quiz_id):
+    """(id, version, archived) of a quiz, or None if it doesn't exist.
+
+    Versions start over for every quiz; the id, which is never reused (see models.Quiz),
+    keeps a quiz recreated after a delete from matching the deleted quiz's ETag.
+    """
+    row = db.session.execute(
+        db.select(Quiz.id, Quiz.version, Quiz.archived_at.is_not(None)).where(Quiz.id == quiz_id)
+    ).first()
+    return tuple(row) if row else None
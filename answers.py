@@ -0,0 +1,72 @@
+"""Packed per-attempt answers.
+
+An attempt's answers are stored in Result.answers as one character per question,
+'A'-'D' for the chosen option and '-' for none, in the question order of the quiz
+version it was graded against (Result.quiz_version). A 40-question attempt costs
+40 bytes on the result row instead of 40 rows in an answer table. The order of
+each version is stored once, in QuizLayout, the first time the version is graded.
+
+    packed = pack_answers(answer_key, {question_id: 'b', ...})    # 'B-C...'
+    decode_answers(result)                                       # {question_id: 'B', ...}
+"""
+from sqlalchemy.exc import IntegrityError
+from models import db, QuizLayout
+from quiz_cache import question_orders
+
+CHOICES = 'ABCD'
+BLANK = '-'
+
+
+def pack_answers(key, student_answers):
+    """Pack {question_id: submitted value} into one character per question of key."""
+    packed = []
+    for qid in key.question_ids:
+        answer = (student_answers.get(qid) or '').strip().upper()
+        packed.append(answer if len(answer) == 1 and answer in CHOICES else BLANK)
+    return ''.join(packed)
+
+
+def unpack_answers(packed):
+    """Return the letters of a packed string, None for unanswered questions."""
+    return [None if letter == BLANK else letter for letter in packed or '']
+
+
+# --- Question orders ---
+def record_question_order(quiz, key):
+    """Store the question order of quiz's current version if it is not stored yet.
+
+    Commits on the first call per version, so run it before staging other changes.
+    """
+    cache_key = (quiz.id, quiz.version)
+    if question_orders.get(cache_key) is not None:
+        return
+    if db.session.get(QuizLayout, cache_key) is None:
+        db.session.add(QuizLayout(quiz_id=quiz.id, version=quiz.version,
+                                  question_ids=','.join(map(str, key.question_ids))))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # another worker stored the same version first
+    question_orders.put(cache_key, key.question_ids)
+
+
+def question_order(quiz_id, version):
+    """Return the question ids of a quiz version in packed order, or None if unknown."""
+    order = question_orders.get((quiz_id, version))
+    if order is None:
+        layout = db.session.get(QuizLayout, (quiz_id, version))
+        if layout is None:
+            return None
+        order = tuple(int(qid) for qid in layout.question_ids.split(',') if qid)
+        question_orders.put((quiz_id, version), order)
+    return order
+
+
+def decode_answers(result):
+    """Return {question_id: letter or None} for a stored attempt, None if it has no answers."""
+    if result.answers is None or result.quiz_version is None:
+        return None
+    order = question_order(result.quiz_id, result.quiz_version)
+    if order is None:
+        return None
+    return dict(zip(order, unpack_answers(result.answers)))
@@ -0,0 +1,198 @@
+"""Fingerprinted static assets and vendored front-end libraries.
+
+At start-up every file under static/ gets a content hash, and asset_url('css/app.css')
+returns /assets/css/app.<hash>.css. Hashed URLs never change content, so they are
+served with a one-year "immutable" Cache-Control and a repeat page view only
+downloads the HTML. Relative url(...) references inside CSS are rewritten to the
+hashed names as well. Text assets are kept in memory with their gzip/brotli
+encodings, compressed once.
+
+Bootstrap, Font Awesome, Chart.js and the Nunito font are served from
+static/vendor/ once they have been downloaded there with
+
+    flask --app app vendor-assets
+
+as a deploy step; until then vendor_url() points at the CDNs and start-up logs a
+warning. 'vendor-assets --check' exits non-zero while any file is missing, so a
+build can refuse to ship an image that still depends on the CDNs.
+"""
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.request import Request, urlopen
+from flask import abort, current_app, request, url_for
+from compression import compress, choose_encoding
+
+ONE_YEAR = 365 * 24 * 3600
+TEXT_TYPES = ('text/css', 'text/javascript', 'application/javascript', 'image/svg+xml')
+CSS_URL_RE = re.compile(r'url\((["\']?)([^)"\']+)\1\)')
+
+# name -> (pinned CDN URL, file under static/)
+VENDOR = {
+    'bootstrap.css': ('https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+                      'vendor/bootstrap/bootstrap.min.css'),
+    'bootstrap.js': ('https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+                     'vendor/bootstrap/bootstrap.bundle.min.js'),
+    'fontawesome.css': ('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+                        'vendor/fontawesome/css/all.min.css'),
+    'chart.js': ('https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.js', 'vendor/chartjs/chart.umd.js'),
+    'nunito.css': ('https://fonts.googleapis.com/css2?family=Nunito:wght@300;400;600;700;800&display=swap',
+                   'vendor/nunito/nunito.css'),
+}
+# Font files referenced relatively (../webfonts/...) by the Font Awesome stylesheet
+FONTAWESOME_FONTS = [f'{face}.{ext}' for face in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900',
+                                                  'fa-v4compatibility') for ext in ('woff2', 'ttf')]
+
+
+class Asset:
+    __slots__ = ('path', 'hashed', 'data', 'mimetype', 'encoded')
+
+    def __init__(self, path, hashed, data, mimetype):
+        self.path = path
+        self.hashed = hashed
+        self.data = data
+        self.mimetype = mimetype
+        self.encoded = {}  # encoding -> compressed bytes, filled on first request
+
+
+class AssetManifest:
+    def __init__(self, static_folder):
+        self.by_path = {}
+        self.by_hashed = {}
+        if not os.path.isdir(static_folder):
+            return
+        paths = []
+        for folder, _, files in os.walk(static_folder):
+            for name in files:
+                full = os.path.join(folder, name)
+                paths.append(os.path.relpath(full, static_folder).replace(os.sep, '/'))
+        # Stylesheets last: their url(...) references are rewritten to hashed names first
+        for path in sorted(paths, key=lambda p: (p.endswith('.css'), p)):
+            with open(os.path.join(static_folder, path), 'rb') as fh:
+                data = fh.read()
+            if path.endswith('.css'):
+                data = self._rewrite_css(path, data)
+            self._add(path, data)
+
+    def _add(self, path, data):
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        root, ext = posixpath.splitext(path)
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        asset = Asset(path, f'{root}.{digest}{ext}', data, mimetype)
+        self.by_path[path] = asset
+        self.by_hashed[asset.hashed] = asset
+
+    def _rewrite_css(self, path, data):
+        folder = posixpath.dirname(path)
+
+        def hashed(match):
+            quote, target = match.groups()
+            clean = target.split('?')[0].split('#')[0]
+            resolved = posixpath.normpath(posixpath.join(folder, clean))
+            asset = self.by_path.get(resolved)
+            if target.startswith(('data:', 'http:', 'https:', '/')) or asset is None:
+                return match.group(0)
+            relative = posixpath.relpath(asset.hashed, folder) + target[len(clean):]
+            return f'url({quote}{relative}{quote})'
+
+        return CSS_URL_RE.sub(hashed, data.decode('utf-8')).encode('utf-8')
+
+    def url(self, path):
+        asset = self.by_path.get(path)
+        return url_for('asset', filename=asset.hashed if asset else path)
+
+
+def serve_asset(filename):
+    manifest = current_app.extensions['assets']
+    asset = manifest.by_hashed.get(filename)
+    immutable = asset is not None
+    if asset is None:
+        asset = manifest.by_path.get(filename)  # plain name, e.g. a file a library loads by itself
+    if asset is None:
+        abort(404)
+
+    data = asset.data
+    response = current_app.response_class(mimetype=asset.mimetype)
+    encoding = choose_encoding(request) if asset.mimetype.startswith(TEXT_TYPES) else None
+    if encoding:
+        if encoding not in asset.encoded:
+            asset.encoded[encoding] = compress(data, encoding, best=True)
+        data = asset.encoded[encoding]
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+    response.set_data(data)
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.max_age = ONE_YEAR
+        response.cache_control.immutable = True
+    else:
+        response.set_etag(asset.hashed, weak=True)
+        response.cache_control.no_cache = True
+        response = response.make_conditional(request)
+    return response
+
+
+def init_assets(app):
+    manifest = AssetManifest(app.static_folder)
+    app.extensions['assets'] = manifest
+    app.add_url_rule('/assets/<path:filename>', 'asset', serve_asset)
+
+    def vendor_url(name):
+        cdn_url, path = VENDOR[name]
+        return manifest.url(path) if path in manifest.by_path else cdn_url
+
+    app.jinja_env.globals.update(asset_url=manifest.url, vendor_url=vendor_url)
+
+    missing = missing_vendor_assets(app.static_folder)
+    if missing:
+        app.logger.warning("%d vendored files missing, pages load them from CDNs; run 'flask vendor-assets'",
+                           len(missing))
+
+
+# --- Vendoring ---
+def _fetch(url):
+    # Google Fonts only serves woff2 to browsers it recognizes
+    req = Request(url, headers={'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) Chrome/120.0 Safari/537.36'})
+    with urlopen(req, timeout=60) as response:
+        return response.read()
+
+
+def _save(static_folder, path, data):
+    full = os.path.join(static_folder, *path.split('/'))
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, 'wb') as fh:
+        fh.write(data)
+    return len(data)
+
+
+def vendor_paths():
+    """Files vendor_assets() saves (the Nunito font faces are named by Google and not listed)."""
+    return ([path for _, path in VENDOR.values()]
+            + [f'vendor/fontawesome/webfonts/{font}' for font in FONTAWESOME_FONTS])
+
+
+def missing_vendor_assets(static_folder):
+    return [path for path in vendor_paths()
+            if not os.path.isfile(os.path.join(static_folder, *path.split('/')))]
+
+
+def vendor_assets(static_folder, log=print):
+    """Download the pinned CDN files (and the fonts they load) into static/vendor/."""
+    for name, (url, path) in VENDOR.items():
+        data = _fetch(url)
+        if name == 'nunito.css':
+            # Download every font face and point the stylesheet at the local copies
+            css = data.decode('utf-8')
+            for font_url in sorted(set(re.findall(r'url\((https://[^)]+)\)', css))):
+                font_name = font_url.rsplit('/', 1)[-1]
+                _save(static_folder, posixpath.join(posixpath.dirname(path), font_name), _fetch(font_url))
+                css = css.replace(font_url, font_name)
+            data = css.encode('utf-8')
+        log(f"{path}: {_save(static_folder, path, data)} bytes")
+
+    fonts_url = VENDOR['fontawesome.css'][0].rsplit('/css/', 1)[0] + '/webfonts/'
+    for font in FONTAWESOME_FONTS:
+        size = _save(static_folder, f'vendor/fontawesome/webfonts/{font}', _fetch(fonts_url + font))
+        log(f"vendor/fontawesome/webfonts/{font}: {size} bytes")
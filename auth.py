@@ -0,0 +1,136 @@
+"""Public pages: home, registration, login and logout, plus the role checks."""
+from functools import wraps
+from flask import Blueprint, request, render_template, redirect, url_for, flash, session
+from models import db, User
+from passwords import HasherBusy, hash_password, password_hasher
+
+auth = Blueprint('auth', __name__)
+
+
+def admin_required(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if 'role' not in session or session['role'] != 'admin':
+            flash('Access denied!')
+            return redirect(url_for('auth.login'))
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def student_required(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if 'role' not in session or session['role'] != 'student':
+            flash('Access denied!')
+            return redirect(url_for('auth.login'))
+        return func(*args, **kwargs)
+    return wrapper
+
+
+# --- Home Route ---
+@auth.route('/')
+def home():
+    if 'role' in session:
+        if session['role'] == 'admin':
+            return redirect(url_for('admin.admin_dashboard'))
+        elif session['role'] == 'student':
+            return redirect(url_for('student.student_dashboard'))
+    return render_template('home.html')
+
+
+# --- Register Route ---
+@auth.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        role = request.form.get('role', 'student')
+
+        if not username or not password:
+            flash('⚠️ Username and password are required!')
+            return redirect(url_for('auth.register'))
+
+        if User.query.filter_by(username=username).first():
+            flash('⚠️ User already exists!')
+            return redirect(url_for('auth.register'))
+
+        hashed_pw = hash_password(password)
+        new_user = User(username=username, password=hashed_pw, role="student", is_active=True)
+        db.session.add(new_user)
+        db.session.commit()
+        flash(f'✅ User {username} created successfully as {role}!')
+        return redirect(url_for('auth.login'))
+
+    return render_template('register.html')
+
+
+# --- Login Route ---
+@auth.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+
+        user = User.query.filter_by(username=username).first()
+        # Hand the connection back to the pool while the hash is checked
+        db.session.close()
+        hasher = password_hasher()
+
+        if user and hasher.verify(user.password, password):
+            if not user.is_active:
+                flash("⚠️ Your account is inactive. Contact the admin.")
+                return redirect(url_for('auth.login'))
+
+            if hasher.needs_rehash(user.password):
+                _upgrade_hash(hasher, user, password)
+
+            session['user_id'] = user.id
+            session['username'] = user.username
+            session['role'] = user.role
+
+            flash(f'✅ Login successful! Welcome {user.username} ({user.role})')
+
+            if user.role == 'admin':
+                return redirect(url_for('admin.admin_dashboard'))
+            else:
+                return redirect(url_for('student.student_dashboard'))
+
+        else:
+            flash('❌ Invalid username or password')
+            return redirect(url_for('auth.login'))
+
+    return render_template('login.html')
+
+
+def _upgrade_hash(hasher, user, password):
+    try:
+        new_hash = hasher.hash(password)
+    except HasherBusy:
+        return  # try again on a later login
+    # Matching the old hash too keeps a concurrent password change from being overwritten
+    User.query.filter_by(id=user.id, password=user.password).update({'password': new_hash})
+    db.session.commit()
+    hasher.record_rehash()
+
+
+# --- Logout Route ---
+@auth.route('/logout')
+def logout():
+    session.clear()
+    flash('✅ Logged out successfully.')
+    return redirect(url_for('auth.login'))
+
+
+@auth.route('/dashboard')
+def dashboard():
+    if 'role' not in session:
+        flash('Please login first!')
+        return redirect(url_for('auth.login'))
+
+    if session['role'] == 'admin':
+        return redirect(url_for('admin.admin_dashboard'))
+    elif session['role'] == 'student':
+        return redirect(url_for('student.student_dashboard'))
+    else:
+        flash('Unknown role!')
+        return redirect(url_for('auth.login'))
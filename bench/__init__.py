@@ -0,0 +1 @@
+"""Benchmarks and load tools; run modules with ``python -m bench.<name>``."""
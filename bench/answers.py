@@ -0,0 +1,105 @@
+"""Storage cost of per-attempt answers: packed string vs. one row per answer.
+
+Stores the same synthetic attempts three ways in fresh SQLite files and reports the
+database size after VACUUM:
+
+  * scores only (the Result row as it was before answers were kept);
+  * packed, one character per question in Result.answers (answers.py);
+  * normalized, a result_answer(result_id, question_id, answer) row per question.
+
+    python -m bench.answers --attempts 20000 --questions 40 --json bench_answers.json
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, text
+
+from bench.indexes import make_app
+from models import db, Result
+
+STUDENTS = 500
+
+# Only created for the normalized layout
+answer_table = Table(
+    'result_answer', MetaData(),
+    Column('result_id', Integer, primary_key=True),
+    Column('question_id', Integer, primary_key=True),
+    Column('answer', String(1)),
+)
+
+
+def attempts(count, questions, seed=1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng.randint(1, STUDENTS), ''.join(rng.choice('ABCD-') for _ in range(questions))
+
+
+def store(layout, count, questions, batch=1000):
+    """Insert count attempts in the given layout; return the insert time in seconds."""
+    question_ids = list(range(1, questions + 1))
+    rows = []
+    started = time.perf_counter()
+    for result_id, (student_id, packed) in enumerate(attempts(count, questions), start=1):
+        row = {'id': result_id, 'student_id': student_id, 'quiz_id': 1,
+               'score': packed.count('A'), 'total': questions}
+        if layout == 'packed':
+            row.update(quiz_version=1, answers=packed)
+        rows.append(row)
+        if layout == 'normalized':
+            db.session.execute(insert(answer_table), [
+                {'result_id': result_id, 'question_id': qid, 'answer': letter}
+                for qid, letter in zip(question_ids, packed) if letter != '-'])
+        if len(rows) >= batch:
+            db.session.execute(insert(Result), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Result), rows)
+    db.session.commit()
+    return time.perf_counter() - started
+
+
+def database_bytes():
+    with db.engine.connect() as conn:
+        conn.execute(text('VACUUM'))
+        pages = conn.execute(text('PRAGMA page_count')).scalar()
+        return pages * conn.execute(text('PRAGMA page_size')).scalar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--attempts', type=int, default=20000)
+    parser.add_argument('--questions', type=int, default=40)
+    parser.add_argument('--json', help="write measurements to this file")
+    args = parser.parse_args(argv)
+
+    measurements = []
+    for layout in ('scores only', 'packed', 'normalized'):
+        uri = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_answers.db')
+        app = make_app(uri)
+        with app.app_context():
+            db.create_all()
+            if layout == 'normalized':
+                answer_table.create(db.engine)
+            seconds = store(layout, args.attempts, args.questions)
+            size = database_bytes()
+            db.engine.dispose()
+        measurements.append({'layout': layout, 'bytes': size, 'insert_seconds': round(seconds, 3)})
+
+    baseline = measurements[0]['bytes']
+    for m in measurements:
+        m['bytes_per_attempt'] = round(m['bytes'] / args.attempts, 1)
+        m['answer_bytes_per_attempt'] = round((m['bytes'] - baseline) / args.attempts, 1)
+        print(f"{m['layout']:<14}{m['bytes'] / 1e6:>9.2f} MB{m['bytes_per_attempt']:>9.1f} B/attempt"
+              f"{m['answer_bytes_per_attempt']:>9.1f} B for answers{m['insert_seconds']:>8.2f}s to insert")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'args': vars(args), 'measurements': measurements}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
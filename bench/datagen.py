@@ -0,0 +1,105 @@
+"""Populate an empty database with synthetic students, quizzes, questions and results.
+
+Rows go in with bulk INSERT ... executemany statements and the statistics
+rollups are rebuilt once at the end:
+
+    python -m bench.datagen --database-url sqlite:///bench.db \
+        --students 2000 --quizzes 50 --questions 20 --results 200000
+
+Every generated account (student0..N-1 and admin0..A-1) uses --password, so
+bench.load can log them in.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, func
+from werkzeug.security import generate_password_hash
+
+from bench.indexes import make_app
+from migrations import upgrade_schema
+from models import db, User, Quiz, Question, Result
+from stats import rebuild_stats
+
+CHUNK = 10_000
+
+
+def _insert_chunks(model, rows):
+    buffer = []
+    for row in rows:
+        buffer.append(row)
+        if len(buffer) == CHUNK:
+            db.session.execute(insert(model), buffer)
+            buffer = []
+    if buffer:
+        db.session.execute(insert(model), buffer)
+
+
+def _max_id(model):
+    return db.session.scalar(select(func.max(model.id))) or 0
+
+
+def generate(students, quizzes, questions, results, admins=1, password='bench', seed=1):
+    """Insert the synthetic data set; must run in an app context. Returns row counts."""
+    rng = random.Random(seed)
+    # One hash shared by every account: hashing per user would dominate the run
+    hashed = generate_password_hash(password)
+
+    first_user = _max_id(User) + 1
+    _insert_chunks(User, ({'username': f'student{i}', 'password': hashed, 'role': 'student', 'is_active': True}
+                          for i in range(students)))
+    _insert_chunks(User, ({'username': f'admin{i}', 'password': hashed, 'role': 'admin', 'is_active': True}
+                          for i in range(admins)))
+
+    first_quiz = _max_id(Quiz) + 1
+    _insert_chunks(Quiz, ({'title': f'Bench quiz {first_quiz + i}', 'description': 'Synthetic benchmark quiz',
+                           'version': 1} for i in range(quizzes)))
+    quiz_ids = range(first_quiz, first_quiz + quizzes)
+
+    _insert_chunks(Question, ({'quiz_id': quiz_id, 'text': f'Question {n + 1} of quiz {quiz_id}?',
+                               'choice_a': 'Alpha', 'choice_b': 'Bravo', 'choice_c': 'Charlie',
+                               'choice_d': 'Delta', 'correct': rng.choice('ABCD')}
+                              for quiz_id in quiz_ids for n in range(questions)))
+
+    start = datetime.utcnow() - timedelta(days=180)
+
+    def result_rows():
+        for _ in range(results):
+            yield {'student_id': first_user + rng.randrange(students), 'quiz_id': rng.choice(quiz_ids),
+                   'score': min(questions, max(0, round(rng.gauss(questions * 0.65, questions * 0.2)))),
+                   'total': questions,
+                   'timestamp': start + timedelta(seconds=rng.randrange(180 * 86400))}
+
+    if students and quizzes:
+        _insert_chunks(Result, result_rows())
+    db.session.commit()
+    rebuild_stats()
+    return {'students': students, 'admins': admins, 'quizzes': quizzes,
+            'questions': quizzes * questions, 'results': results if students and quizzes else 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', help="target database (default: the app's DATABASE_URL)")
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--admins', type=int, default=1)
+    parser.add_argument('--quizzes', type=int, default=20)
+    parser.add_argument('--questions', type=int, default=20, help="questions per quiz")
+    parser.add_argument('--results', type=int, default=100_000)
+    parser.add_argument('--password', default='bench')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    app = make_app(args.database_url)
+    with app.app_context():
+        upgrade_schema()
+        started = time.perf_counter()
+        counts = generate(args.students, args.quizzes, args.questions, args.results,
+                          admins=args.admins, password=args.password, seed=args.seed)
+        elapsed = time.perf_counter() - started
+    print(', '.join(f"{n} {name}" for name, n in counts.items()) + f" generated in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Query plans and timings for the hot lookups, before and after upgrade_schema().
+
+Builds a synthetic SQLite database (1M results by default), drops the indexes
+declared in models.py, measures, applies migrations.upgrade_schema() and
+measures again:
+
+    python -m bench.indexes --results 1000000 --json bench_indexes.json
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import text, insert
+
+from config import Config
+from database import init_database
+from migrations import upgrade_schema
+from models import db, User, Quiz, Result
+
+CHUNK = 50_000
+
+
+def make_app(uri=None, **config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if uri:
+        app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config.update(config)
+    init_database(app)
+    return app
+
+
+def populate(students, quizzes, results, seed=1):
+    rng = random.Random(seed)
+    db.session.execute(insert(User), [
+        {'username': f'student{i}', 'password': 'x', 'role': 'student', 'is_active': True}
+        for i in range(students)
+    ])
+    db.session.execute(insert(Quiz), [
+        {'title': f'Quiz {i}', 'description': 'synthetic', 'version': 1} for i in range(quizzes)
+    ])
+    start = datetime(2024, 1, 1)
+    for offset in range(0, results, CHUNK):
+        rows = []
+        for _ in range(min(CHUNK, results - offset)):
+            total = rng.choice((10, 20, 40))
+            rows.append({
+                'student_id': rng.randint(1, students),
+                'quiz_id': rng.randint(1, quizzes),
+                'score': rng.randint(0, total),
+                'total': total,
+                'timestamp': start + timedelta(seconds=rng.randint(0, 365 * 86400)),
+            })
+        db.session.execute(insert(Result), rows)
+    db.session.commit()
+
+
+def drop_model_indexes():
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+def hot_queries(students, quizzes):
+    student_id = students // 2
+    quiz_id = quizzes // 2
+    return [
+        ('student results', Result.query.filter_by(student_id=student_id)),
+        ('student attempts of one quiz', Result.query.filter_by(student_id=student_id, quiz_id=quiz_id)
+         .order_by(Result.timestamp.desc())),
+        ('latest results of one quiz', Result.query.filter_by(quiz_id=quiz_id)
+         .order_by(Result.timestamp.desc()).limit(50)),
+        ('latest results (analysis page)', Result.query.order_by(Result.timestamp.desc(), Result.id.desc())
+         .limit(50)),
+        ('quiz by title (add_quiz)', Quiz.query.filter_by(title=f'Quiz {quiz_id}')),
+    ]
+
+
+def measure(queries, repeat):
+    # Fresh connections, so no cached statement outlives a schema change
+    db.session.remove()
+    db.engine.dispose()
+    measurements = []
+    with db.engine.connect() as conn:
+        for name, query in queries:
+            statement = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+            plan = []
+            if db.engine.dialect.name == 'sqlite':
+                plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {statement}"))]
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                rows = conn.execute(text(statement)).fetchall()
+                timings.append(time.perf_counter() - started)
+            measurements.append({'query': name, 'rows': len(rows), 'best_ms': round(min(timings) * 1000, 3),
+                                 'plan': plan})
+    return measurements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--quizzes', type=int, default=200)
+    parser.add_argument('--results', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="write measurements to this file")
+    args = parser.parse_args(argv)
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_indexes.db')
+    app = make_app(f'sqlite:///{path}')
+    with app.app_context():
+        db.create_all()
+        drop_model_indexes()
+        started = time.perf_counter()
+        populate(args.students, args.quizzes, args.results)
+        print(f"Generated {args.results} results in {time.perf_counter() - started:.1f}s ({path})")
+
+        queries = hot_queries(args.students, args.quizzes)
+        before = measure(queries, args.repeat)
+        started = time.perf_counter()
+        applied = upgrade_schema()
+        print(f"upgrade_schema(): {len(applied)} changes in {time.perf_counter() - started:.1f}s")
+        after = measure(queries, args.repeat)
+
+    print(f"\n{'query':<34}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for b, a in zip(before, after):
+        speedup = b['best_ms'] / a['best_ms'] if a['best_ms'] else float('inf')
+        print(f"{b['query']:<34}{b['best_ms']:>12.2f}{a['best_ms']:>12.2f}{speedup:>9.1f}x")
+        print(f"{'':<4}before: {'; '.join(b['plan'])}")
+        print(f"{'':<4}after:  {'; '.join(a['plan'])}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'args': vars(args), 'applied': applied, 'before': before, 'after': after}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
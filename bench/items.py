@@ -0,0 +1,63 @@
+"""Item analysis speed on a synthetic response matrix.
+
+Simulates attempts from a one-parameter logistic model (student ability vs.
+question difficulty), packs them the way Result.answers stores them, and times
+decoding plus item_statistics():
+
+    python -m bench.items --attempts 100000 --questions 200 --json bench_items.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from item_analysis import decode_block, item_statistics
+
+
+def simulate(attempts, questions, seed=1):
+    """Return (packed answer strings, correct letters)."""
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(size=(attempts, 1))
+    difficulty = rng.normal(size=questions)
+    key = rng.integers(0, 4, size=questions)
+    right = rng.random((attempts, questions)) < 1 / (1 + np.exp(difficulty - ability))
+    wrong = (key + rng.integers(1, 4, size=(attempts, questions))) % 4
+    letters = np.frombuffer(b'ABCD', dtype=np.uint8)[np.where(right, key, wrong)]
+    letters[rng.random((attempts, questions)) < 0.03] = ord('-')
+    packed = [row.tobytes().decode('ascii') for row in letters]
+    return packed, ''.join('ABCD'[k] for k in key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--attempts', type=int, default=100000)
+    parser.add_argument('--questions', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5, help="report the best of this many runs")
+    parser.add_argument('--json', help="write measurements to this file")
+    args = parser.parse_args(argv)
+
+    packed, correct = simulate(args.attempts, args.questions)
+    decode_seconds = stats_seconds = float('inf')
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        matrix = decode_block(packed, args.questions)
+        decoded = time.perf_counter()
+        analysis = item_statistics(matrix, correct)
+        decode_seconds = min(decode_seconds, decoded - started)
+        stats_seconds = min(stats_seconds, time.perf_counter() - decoded)
+
+    measurement = {'attempts': args.attempts, 'questions': args.questions,
+                   'decode_seconds': round(decode_seconds, 3), 'statistics_seconds': round(stats_seconds, 3),
+                   'kr20': round(float(analysis.kr20), 3),
+                   'mean_p_value': round(float(np.nanmean(analysis.p_value)), 3),
+                   'mean_discrimination': round(float(np.nanmean(analysis.discrimination)), 3)}
+    print(f"{args.attempts} attempts x {args.questions} questions: decode {decode_seconds:.3f}s, "
+          f"statistics {stats_seconds:.3f}s, KR-20 {measurement['kr20']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'args': vars(args), 'measurement': measurement}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Replay an exam against a running server and report latency per route.
+
+The scenario uses accounts made by bench.datagen and runs in phases, each
+with a pool of --concurrency threads sharing nothing but the server:
+
+  1. login storm: every student (and admin) logs in at once;
+  2. quiz open: every student GETs the exam's take_quiz page;
+  3. submit burst: every student POSTs answers while the admins keep
+     refreshing the analysis page and its results feed.
+
+    flask --app app run --port 5000 --with-threads
+    python -m bench.load --base-url http://127.0.0.1:5000 --students 500 \
+        --json runs/$(git rev-parse --short HEAD).json --compare runs/base.json
+
+The JSON report holds throughput and p50/p95/p99 per route together with the
+commit it was measured on, so runs can be compared across commits.
+"""
+import argparse
+import json
+import random
+import re
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, build_opener
+
+QUIZ_LINK_RE = re.compile(r'/student/take_quiz/(\d+)')
+QUESTION_RE = re.compile(r'type="radio" name="(\d+)"')
+
+# status 0 means the request failed before an HTTP response arrived
+Sample = namedtuple('Sample', 'route status started seconds')
+
+
+class _NoRedirect(HTTPRedirectHandler):
+    # Time each request on its own; a redirect is a successful response here
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class VirtualUser:
+    """One browser: its own cookie jar, recording a Sample per request."""
+
+    def __init__(self, base_url, samples, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.samples = samples
+        self.timeout = timeout
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()), _NoRedirect)
+
+    def request(self, route, path, data=None):
+        body = urlencode(data).encode() if data is not None else None
+        started = time.perf_counter()
+        try:
+            with self.opener.open(self.base_url + path, body, timeout=self.timeout) as response:
+                status, text = response.status, response.read().decode('utf-8', 'replace')
+        except HTTPError as exc:
+            status, text = exc.code, ''
+        except (URLError, OSError):
+            status, text = 0, ''
+        self.samples.append(Sample(route, status, started, time.perf_counter() - started))
+        return status, text
+
+    def login(self, username, password):
+        status, _ = self.request('login', '/login', {'username': username, 'password': password})
+        return status == 302
+
+
+# --- Scenario ---
+def run_phase(pool, func, items):
+    started = time.perf_counter()
+    results = list(pool.map(func, items))
+    return results, time.perf_counter() - started
+
+
+def run_scenario(base_url, students, admins=1, password='bench', concurrency=50, quiz_id=None,
+                 refresh_pause=0.2, seed=1):
+    """Run the exam scenario; return (samples, {phase: seconds})."""
+    rng = random.Random(seed)
+    samples = []
+    phases = {}
+    learners = [(f'student{i}', VirtualUser(base_url, samples)) for i in range(students)]
+    staff = [(f'admin{i}', VirtualUser(base_url, samples)) for i in range(admins)]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        logged_in, phases['login storm'] = run_phase(
+            pool, lambda account: account[1].login(account[0], password), learners + staff)
+        if not any(logged_in):
+            raise SystemExit("No account could log in; generate them with bench.datagen first")
+        learners = [user for (_, user), ok in zip(learners, logged_in[:len(learners)]) if ok]
+        staff = [user for (_, user), ok in zip(staff, logged_in[len(learners):]) if ok]
+
+        if quiz_id is None:
+            _, dashboard = learners[0].request('student_dashboard', '/student/dashboard')
+            links = QUIZ_LINK_RE.findall(dashboard)
+            if not links:
+                raise SystemExit("The student dashboard lists no quizzes")
+            quiz_id = int(links[0])
+        quiz_path = f'/student/take_quiz/{quiz_id}'
+
+        pages, phases['quiz open'] = run_phase(pool, lambda user: user.request('take_quiz GET', quiz_path), learners)
+        question_ids = next((list(dict.fromkeys(QUESTION_RE.findall(text))) for status, text in pages
+                             if status == 200), [])
+        answers = [{qid: rng.choice('abcd') for qid in question_ids} for _ in learners]
+
+        # Admins refresh the analysis page for as long as the submissions keep coming
+        done = threading.Event()
+
+        def refresh(user):
+            while not done.is_set():
+                user.request('analysis', '/admin/analysis')
+                user.request('analysis_results', '/admin/analysis/results')
+                done.wait(refresh_pause)
+
+        refreshers = [threading.Thread(target=refresh, args=(user,), daemon=True) for user in staff]
+        for thread in refreshers:
+            thread.start()
+        _, phases['submit burst'] = run_phase(
+            pool, lambda item: item[0].request('take_quiz POST', quiz_path, item[1]), list(zip(learners, answers)))
+        done.set()
+        for thread in refreshers:
+            thread.join()
+
+    return samples, {name: round(seconds, 3) for name, seconds in phases.items()}
+
+
+# --- Reports ---
+def percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, round(q / 100 * len(ordered) + 0.5))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples):
+    routes = {}
+    for route in sorted({s.route for s in samples}):
+        mine = [s for s in samples if s.route == route]
+        latencies = sorted(s.seconds for s in mine)
+        span = max(s.started + s.seconds for s in mine) - min(s.started for s in mine)
+        routes[route] = {
+            'requests': len(mine),
+            'errors': sum(1 for s in mine if s.status == 0 or s.status >= 400),
+            'throughput_rps': round(len(mine) / span, 1) if span else None,
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2),
+        }
+    return routes
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, base=None):
+    base_routes = (base or {}).get('routes', {})
+    print(f"\n{'route':<20}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for route, r in report['routes'].items():
+        print(f"{route:<20}{r['requests']:>9}{r['errors']:>8}{r['throughput_rps'] or 0:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+        if route in base_routes and base_routes[route]['p95_ms']:
+            b = base_routes[route]
+            print(f"{'':<4}vs {base.get('commit') or 'base'}: p95 {r['p95_ms'] / b['p95_ms'] - 1:+.0%}, "
+                  f"req/s {b['throughput_rps'] or 0:.1f} -> {r['throughput_rps'] or 0:.1f}")
+    print("phases: " + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in report['phases'].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--students', type=int, default=200, help="students taking the exam")
+    parser.add_argument('--admins', type=int, default=1, help="admins refreshing the analysis page")
+    parser.add_argument('--password', default='bench')
+    parser.add_argument('--concurrency', type=int, default=50, help="client threads")
+    parser.add_argument('--quiz-id', type=int, help="exam quiz (default: first quiz on the dashboard)")
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--compare', help="earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    samples, phases = run_scenario(args.base_url, args.students, admins=args.admins, password=args.password,
+                                   concurrency=args.concurrency, quiz_id=args.quiz_id)
+    report = {'commit': current_commit(), 'started_at': datetime.now().isoformat(timespec='seconds'),
+              'args': vars(args), 'phases': phases, 'routes': summarize(samples)}
+
+    base = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            base = json.load(fh)
+    print_report(report, base)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
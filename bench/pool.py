@@ -0,0 +1,112 @@
+"""Concurrent submit throughput per database setting.
+
+Each setting gets a fresh SQLite file populated by bench.datagen; --threads
+workers then store graded attempts with db_utils.add_result() (the write path
+of a synchronous quiz submission) as fast as they can:
+
+    python -m bench.pool --threads 16 --submits 200 --json bench_pool.json
+
+Pass --database-url to measure a server database instead; it is used as is,
+so point it at a scratch database that bench.datagen has populated.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from bench.datagen import generate
+from bench.indexes import make_app
+from db_utils import add_result
+from models import db
+
+# name -> config overrides
+SQLITE_SETTINGS = {
+    'rollback journal, synchronous=FULL, no busy timeout': {
+        'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_BUSY_TIMEOUT_MS': 0},
+    'rollback journal, synchronous=FULL, busy_timeout=5s': {
+        'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL'},
+    'WAL, synchronous=NORMAL, busy_timeout=5s (default)': {},
+    'WAL, synchronous=NORMAL, pool_size=2': {'DB_POOL_SIZE': 2, 'DB_MAX_OVERFLOW': 0},
+}
+SERVER_SETTINGS = {
+    'pool_size=5, max_overflow=0': {'DB_POOL_SIZE': 5, 'DB_MAX_OVERFLOW': 0},
+    'pool_size=10, max_overflow=20 (default)': {},
+    'pool_size=10, max_overflow=20, no pre-ping': {'DB_POOL_PRE_PING': False},
+}
+
+STUDENTS = 200
+QUIZZES = 10
+QUESTIONS = 20
+
+
+def run(app, threads, submits):
+    """Store threads * submits attempts concurrently; return the measurement."""
+    errors = []
+    barrier = threading.Barrier(threads)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        with app.app_context():
+            barrier.wait()
+            for _ in range(submits):
+                try:
+                    add_result(rng.randint(1, STUDENTS), rng.randint(1, QUIZZES), rng.randint(0, QUESTIONS),
+                               QUESTIONS)
+                except OperationalError as exc:
+                    db.session.rollback()
+                    errors.append(str(exc.orig))
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stored = threads * submits - len(errors)
+    return {'stored': stored, 'errors': len(errors), 'seconds': round(elapsed, 3),
+            'submits_per_second': round(stored / elapsed, 1),
+            'first_error': errors[0] if errors else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--submits', type=int, default=200, help="attempts stored per thread")
+    parser.add_argument('--database-url', help="server database to measure instead of SQLite files")
+    parser.add_argument('--json', help="write measurements to this file")
+    args = parser.parse_args(argv)
+
+    measurements = []
+    settings = SERVER_SETTINGS if args.database_url else SQLITE_SETTINGS
+    for name, overrides in settings.items():
+        if args.database_url:
+            uri = args.database_url
+        else:
+            uri = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_pool.db')
+        app = make_app(uri, **overrides)
+        with app.app_context():
+            if not args.database_url:
+                db.create_all()
+                generate(STUDENTS, QUIZZES, QUESTIONS, results=0)
+            db.session.remove()
+        measurement = dict(run(app, args.threads, args.submits), setting=name)
+        with app.app_context():
+            db.engine.dispose()
+        measurements.append(measurement)
+        print(f"{name:<56}{measurement['submits_per_second']:>9.1f}/s{measurement['errors']:>7} errors")
+        if measurement['first_error']:
+            print(f"{'':<4}{measurement['first_error']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'args': vars(args), 'measurements': measurements}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Cold start time of the web worker and the command line tools.
+
+Every case runs in a fresh interpreter --repeat times and the median wall time
+is reported. Template rendering is measured with an empty, a warm and a
+disabled Jinja bytecode cache:
+
+    python -m bench.startup --repeat 7 --json bench_startup.json
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Serves the public pages, then loads every other template a worker will need
+FIRST_REQUESTS = (
+    "from app import create_app; from models import db\n"
+    "app = create_app()\n"
+    "with app.app_context(): db.create_all()\n"
+    "client = app.test_client()\n"
+    "for path in ('/', '/login', '/register'): assert client.get(path).status_code == 200\n"
+    "for name in app.jinja_env.list_templates(): app.jinja_env.get_template(name)\n"
+)
+
+CASES = [
+    ('import app (no app built)', [sys.executable, '-c', 'import app']),
+    ('web worker: import wsgi', [sys.executable, '-c', 'import wsgi']),
+    ('web worker: first requests', [sys.executable, '-c', FIRST_REQUESTS]),
+    ('cli: flask --app app --help', [sys.executable, '-m', 'flask', '--app', 'app', '--help']),
+    ('cli: word_import.py --help', [sys.executable, 'word_import.py', '--help']),
+    ('cli: import create_from_word', [sys.executable, '-c', 'import create_from_word']),
+    ('cli: import seed', [sys.executable, '-c', 'import seed']),
+]
+
+
+def timed(command, env, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings) * 1000, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="write measurements to this file")
+    args = parser.parse_args(argv)
+
+    cache_dir = tempfile.mkdtemp()
+    env = dict(os.environ, DATABASE_URL=os.environ.get('DATABASE_URL', 'sqlite://'),
+               JINJA_BYTECODE_CACHE_DIR=cache_dir)
+    measurements = {}
+    for name, command in CASES:
+        measurements[name] = timed(command, env, args.repeat)
+
+    # The first-request case above ran with a warm cache after its first repetition
+    shutil.rmtree(cache_dir)
+    os.makedirs(cache_dir)
+    measurements['templates: empty bytecode cache'] = timed([sys.executable, '-c', FIRST_REQUESTS], env, 1)
+    measurements['templates: warm bytecode cache'] = timed([sys.executable, '-c', FIRST_REQUESTS], env,
+                                                           args.repeat)
+    measurements['templates: bytecode cache disabled'] = timed([sys.executable, '-c', FIRST_REQUESTS],
+                                                               dict(env, JINJA_BYTECODE_CACHE_DIR=''), args.repeat)
+    shutil.rmtree(cache_dir)
+
+    for name, ms in measurements.items():
+        print(f"{name:<40}{ms:>9.1f} ms")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'args': vars(args), 'python': sys.version.split()[0], 'milliseconds': measurements},
+                      fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Maintenance commands, available as ``flask --app app <command>``."""
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from assets import vendor_assets, missing_vendor_assets
+from db_utils import purge_archived_quizzes, PURGE_CHUNK_SIZE
+from export import export_rows, encode, gzip_chunks, FORMATS as EXPORT_FORMATS
+from migrations import upgrade_schema
+from models import db, Quiz
+from provisioning import provision_students, BATCH_SIZE as PROVISION_BATCH_SIZE, write_report as write_accounts
+from stats import rebuild_stats
+
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """Backfill the quiz/student statistics rollups from the Result table."""
+    count = rebuild_stats()
+    print(f"✅ Rebuilt statistics for {count} quizzes.")
+
+
+@click.command('export-results')
+@with_appcontext
+@click.option('--format', 'fmt', type=click.Choice(sorted(EXPORT_FORMATS)), default='csv', show_default=True)
+@click.option('--output', '-o', type=click.Path(dir_okay=False), required=True,
+              help='File to write; a .gz suffix compresses it.')
+@click.option('--quiz-id', type=int, default=None)
+def export_results_command(fmt, output, quiz_id):
+    """Stream every result to a CSV or JSON Lines file."""
+    chunks = encode(export_rows(quiz_id=quiz_id), fmt)
+    if output.endswith('.gz'):
+        chunks = gzip_chunks(chunks)
+    written = 0
+    with open(output, 'wb') as fh:
+        for chunk in chunks:
+            fh.write(chunk)
+            written += len(chunk)
+    print(f"✅ Wrote {written} bytes to {output}.")
+
+
+@click.command('purge-quizzes')
+@with_appcontext
+@click.option('--chunk-size', default=PURGE_CHUNK_SIZE, show_default=True, help='Rows deleted per transaction.')
+def purge_quizzes_command(chunk_size):
+    """Delete archived quizzes and their results in small transactions."""
+    purged = purge_archived_quizzes(chunk_size)
+    for quiz_id, results in purged.items():
+        print(f"Quiz {quiz_id}: {results} results deleted")
+    print(f"✅ Purged {len(purged)} archived quizzes.")
+
+
+@click.command('upgrade-db')
+@with_appcontext
+def upgrade_db_command():
+    """Create missing tables, columns and indexes."""
+    applied = upgrade_schema()
+    for action, name, note in applied:
+        print(f"{action:>13}  {name}  {note}")
+    print(f"✅ Schema up to date ({len(applied)} changes).")
+
+
+@click.command('grade-sheets')
+@with_appcontext
+@click.argument('quiz_id', type=int)
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--report', type=click.Path(dir_okay=False), help='Write the per-sheet report to this CSV file.')
+@click.option('--batch-size', default=500, show_default=True, help='Results inserted per transaction.')
+def grade_sheets_command(quiz_id, path, report, batch_size):
+    """Grade a CSV of scanned answer sheets (username, A-D per question)."""
+    from omr import grade_sheets, summarize, write_report  # pulls in NumPy, only needed here
+
+    quiz = db.session.get(Quiz, quiz_id)
+    if quiz is None or quiz.archived_at is not None:
+        raise click.ClickException(f"quiz {quiz_id} not found")
+    with open(path, newline='', encoding='utf-8-sig') as fh:
+        try:
+            entries = grade_sheets(quiz, fh, batch_size=batch_size)
+        except ValueError as exc:
+            raise click.ClickException(str(exc))
+    for entry in entries:
+        if entry['status'] != 'graded':
+            print(f"line {entry['line']:>6}  {entry['status']:<13} {entry['username']}: {entry['error']}")
+    if report:
+        with open(report, 'w', newline='', encoding='utf-8') as fh:
+            write_report(entries, fh)
+    counts = summarize(entries)
+    print(f"✅ Graded {counts['graded']} of {len(entries)} sheets.")
+
+
+@click.command('provision-students')
+@with_appcontext
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--workers', type=int, default=None, help='Password hashing processes (default: CPU count).')
+@click.option('--batch-size', default=PROVISION_BATCH_SIZE, show_default=True,
+              help='Accounts inserted per transaction.')
+@click.option('--report', type=click.Path(dir_okay=False), help='Write the per-row report to this CSV file.')
+def provision_students_command(path, workers, batch_size, report):
+    """Create student accounts from a CSV of usernames and initial passwords."""
+    with open(path, newline='', encoding='utf-8-sig') as fh:
+        entries, summary = provision_students(fh, workers=workers, batch_size=batch_size)
+    for entry in entries:
+        if entry['status'] != 'created':
+            print(f"line {entry['line']:>6}  {entry['status']:<10} {entry['username']}: {entry['error']}")
+    if report:
+        with open(report, 'w', newline='', encoding='utf-8') as fh:
+            write_accounts(entries, fh)
+    print(f"hashing {summary['hash_seconds']:.2f}s ({summary['hashes_per_second'] or 0:.1f}/s), "
+          f"inserts {summary['db_seconds']:.2f}s")
+    print(f"✅ Created {summary['created']} of {summary['rows']} accounts in {summary['elapsed_seconds']:.2f}s "
+          f"({summary['users_per_second'] or 0:.1f}/s).")
+
+
+@click.command('vendor-assets')
+@click.option('--check', is_flag=True, help="Only verify that every vendored file is present.")
+@with_appcontext
+def vendor_assets_command(check):
+    """Download Bootstrap, Font Awesome, Chart.js and Nunito into static/vendor/."""
+    if not check:
+        vendor_assets(current_app.static_folder)
+    missing = missing_vendor_assets(current_app.static_folder)
+    if missing:
+        raise click.ClickException("missing vendored files (run 'flask vendor-assets'): " + ', '.join(missing))
+    print("✅ Vendored assets present." if check else "✅ Vendored assets saved; restart the app to fingerprint them.")
+
+
+def register_commands(app):
+    for command in (rebuild_stats_command, export_results_command, purge_quizzes_command, upgrade_db_command,
+                    grade_sheets_command, provision_students_command, vendor_assets_command):
+        app.cli.add_command(command)
@@ -0,0 +1,53 @@
+"""gzip/brotli compression of dynamic text responses.
+
+Brotli is used when the optional ``brotli`` package is installed and the client
+accepts it, gzip otherwise. Streamed responses (exports compress themselves),
+small bodies and anything already encoded are left alone.
+"""
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIBLE = ('text/html', 'text/plain', 'text/css', 'text/javascript', 'application/javascript',
+                'application/json', 'image/svg+xml')
+
+
+def choose_encoding(request):
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, best=False):
+    """Compress bytes; best=True trades CPU for size (for assets compressed once)."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+
+def init_compression(app):
+    @app.after_request
+    def compress_response(response):
+        if (not app.config['COMPRESS_RESPONSES'] or response.status_code != 200
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or not response.mimetype.startswith(COMPRESSIBLE)):
+            return response
+        encoding = choose_encoding(request)
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if encoding is None or len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)  # same content, different bytes
+        return response
@@ -1,4 +1,64 @@
+import os
+
 class Config:
-    SECRET_KEY =  'change-this-secret'
-    SQLALCHEMY_DATABASE_URI ="mssql+pyodbc://localhost/QuizDB?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes"
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'change-this-secret')
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        'DATABASE_URL',
+        "mssql+pyodbc://localhost/QuizDB?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes"
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Compiled templates are cached here (default: instance/jinja_cache); '' disables it
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+
+    # Connection pool (see database.py); size it to the number of server threads
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') == '1'
+    DB_FAST_EXECUTEMANY = os.environ.get('DB_FAST_EXECUTEMANY', '1') == '1'
+
+    # Applied to every connection when DATABASE_URL is a SQLite file
+    # (e.g. sqlite:///quiz.db, which lives in instance/)
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+    # Optional read replica for the read-only pages (see replica.py); after a write
+    # the user reads from the primary for READ_YOUR_WRITES_SECONDS
+    READ_REPLICA_URL = os.environ.get('READ_REPLICA_URL')
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 10))
+
+    # 'sync' commits each submission in the request; 'batched' group-commits them
+    # from a background writer thread (see result_writer.py)
+    RESULT_WRITER = os.environ.get('RESULT_WRITER', 'sync')
+    RESULT_WRITER_BATCH_SIZE = int(os.environ.get('RESULT_WRITER_BATCH_SIZE', 200))
+    RESULT_WRITER_MAX_DELAY_MS = int(os.environ.get('RESULT_WRITER_MAX_DELAY_MS', 50))
+    RESULT_WRITER_QUEUE_SIZE = int(os.environ.get('RESULT_WRITER_QUEUE_SIZE', 5000))
+
+    # Deleting a quiz with more results than this archives it; 'flask purge-quizzes'
+    # then removes the rows in chunks
+    QUIZ_ARCHIVE_THRESHOLD = int(os.environ.get('QUIZ_ARCHIVE_THRESHOLD', 10000))
+
+    # Request/SQL instrumentation (see metrics.py); METRICS_TOKEN lets a Prometheus
+    # scraper read /admin/metrics with "Authorization: Bearer <token>"
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 200))
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # gzip (or brotli, when installed) for HTML/JSON responses of at least
+    # COMPRESS_MIN_SIZE bytes; static assets are compressed once in assets.py
+    COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', '1') == '1'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+
+    # Password hashing (see passwords.py): hashes run on PASSWORD_HASH_WORKERS threads
+    # with at most PASSWORD_HASH_QUEUE more waiting; beyond that login answers 503 with
+    # Retry-After. Stored hashes made with another method are upgraded at login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:260000')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 16))
+    PASSWORD_HASH_RETRY_AFTER = int(os.environ.get('PASSWORD_HASH_RETRY_AFTER', 2))
+    # Uploads on the admin page hash inside the request, one password at a time;
+    # files with more new accounts are refused in favour of `flask provision-students`
+    PROVISION_WEB_MAX_ACCOUNTS = int(os.environ.get('PROVISION_WEB_MAX_ACCOUNTS', 200))
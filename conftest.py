@@ -0,0 +1,103 @@
+import os
+
+import pytest
+from sqlalchemy import event
+
+# test_db.py is a standalone script against the SQL Server database, not a pytest module
+collect_ignore = ["test_db.py"]
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+@pytest.fixture
+def app():
+    from app import create_app
+    from config import Config
+    from models import db
+    from quiz_cache import answer_keys, quiz_pages, question_orders
+    from item_analysis import analyses
+
+    class TestConfig(Config):
+        TESTING = True
+        JINJA_BYTECODE_CACHE_DIR = ''
+        PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+
+    flask_app = create_app(TestConfig)
+    # Cached keys/pages are keyed by (quiz id, version), which repeat across fresh databases
+    answer_keys.clear()
+    quiz_pages.clear()
+    question_orders.clear()
+    analyses.clear()
+    with flask_app.app_context():
+        db.create_all(bind_key=None)
+        yield flask_app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SQL statements executed while the fixture is active."""
+    from models import db
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def make_user(app):
+    """Factory for committed users: make_user("bob"), make_user("root", role="admin")."""
+    from models import db, User
+
+    def make(username, role="student", is_active=True, password="x"):
+        user = User(username=username, password=password, role=role, is_active=is_active)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user("admin", role="admin")
+
+
+@pytest.fixture
+def student(make_user):
+    return make_user("alice")
+
+
+@pytest.fixture
+def quiz(app):
+    """The "Algebra" quiz with two questions: "1 + 1?" (answer B) and "2 + 2?" (answer C)."""
+    from db_utils import add_quiz, add_question
+
+    quiz = add_quiz("Algebra", "Basics")
+    add_question(quiz.id, "1 + 1?", "1", "2", "3", "4", "b")
+    add_question(quiz.id, "2 + 2?", "2", "3", "4", "5", "c")
+    return quiz
+
+
+@pytest.fixture
+def questions(quiz):
+    from models import Question
+
+    return Question.query.filter_by(quiz_id=quiz.id).order_by(Question.id).all()
+
+
+def login_as(client, user):
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+        sess["username"] = user.username
+        sess["role"] = user.role
@@ -1,8 +1,6 @@
-from docx import Document
-from db_utils import add_quiz, add_question
-from app import app  # your Flask app
+from word_import import parse_document, store_quiz
 
-# Correct answers in order
+# Correct answers in order, for the Lec 4 document that has no answer key of its own
 correct_answers = ['b','b','b','b','a',
                    'b','c','b','b','d',
                    'b','c','a','b','a',
@@ -12,55 +10,26 @@ correct_answers = ['b','b','b','b','a',
                    'b','b','b','a','b',
                    'c','b','a','b','b']
 
-def import_quiz_from_word(file_path):
-    doc = Document(file_path)
-    lines = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+def import_quiz_from_word(file_path, fallback_answers=None, description="Auto-imported quiz Lec 4."):
+    from app import create_app
 
-    quiz_title = lines[0]
-    quiz_description = "Auto-imported quiz Lec 4."
+    app = create_app()
 
-    with app.app_context():
-        quiz = add_quiz(quiz_title, quiz_description)
-
-        q_number = 0
-        i = 1
-        while i < len(lines):
-            line = lines[i]
-            # Detect question line (starts with number + dot)
-            if line[0].isdigit() and '.' in line:
-                question_text = line.split('.', 1)[1].strip()
-                choices = {}
-                choice_count = 0
-                j = i + 1
-                # Collect 4 choices dynamically
-                while choice_count < 4 and j < len(lines):
-                    cline = lines[j]
-                    if cline and cline[0].lower() in ['a','b','c','d']:
-                        choice_key = cline[0].upper()
-                        choice_text = cline[2:].strip() if len(cline) > 2 else ""
-                        choices[choice_key] = choice_text
-                        choice_count += 1
-                    j += 1
-
-                # Add question to DB
-                correct = correct_answers[q_number].upper()
-                add_question(
-                    quiz.id,
-                    question_text,
-                    choices.get("A"),
-                    choices.get("B"),
-                    choices.get("C"),
-                    choices.get("D"),
-                    correct
-                )
+    # The answer key is read from the document; fallback_answers fills any gaps
+    parsed = parse_document(file_path, fallback_answers=fallback_answers)
 
-                q_number += 1
-                i = j  # move to next question
-            else:
-                i += 1
-
-        print(f"Quiz '{quiz_title}' imported successfully with {q_number} questions!")
-
-# ✅ Run inside Flask app context
-with app.app_context():
-    import_quiz_from_word("Linear_Regression_MLR_40MCQs final - Copy.docx")
+    with app.app_context():
+        # One transaction for the whole document instead of a commit per question
+        quiz, report = store_quiz(parsed, batch_size=500, description=description)
+        if quiz is None:
+            print(f"⚠️ Quiz '{parsed.title}' already exists, nothing imported.")
+            return None
+        for row_index, error in report.errors:
+            print(f"⚠️ Question {row_index + 1} skipped: {error}")
+
+        print(f"Quiz '{parsed.title}' imported successfully with {report.inserted} questions!")
+        return quiz
+
+# For whole directories of documents use word_import.py instead
+if __name__ == "__main__":
+    import_quiz_from_word("Linear_Regression_MLR_40MCQs final - Copy.docx", fallback_answers=correct_answers)
@@ -0,0 +1,74 @@
+"""Engine options and per-connection setup driven by Config.
+
+init_database(app) replaces db.init_app(app): it turns the DB_* settings into
+SQLAlchemy pool options for server databases (plus fast_executemany for
+pyodbc), and sets the SQLITE_* pragmas on every new connection to a SQLite
+file, so local deployments get WAL journaling and wait on locks instead of
+failing with "database is locked". READ_REPLICA_URL adds the replica bind
+used by replica.py, configured the same way.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from models import db
+from replica import REPLICA_BIND, init_replica
+
+
+def _is_sqlite_memory(url):
+    return url.database in (None, '', ':memory:')
+
+
+def engine_options(config, uri=None):
+    """Build engine options for uri (default: SQLALCHEMY_DATABASE_URI)."""
+    url = make_url(uri or config['SQLALCHEMY_DATABASE_URI'])
+    options = {} if uri else dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    if url.get_backend_name() == 'sqlite':
+        # In-memory databases get a StaticPool from Flask-SQLAlchemy; pool sizes don't apply
+        if not _is_sqlite_memory(url):
+            options.setdefault('pool_size', config['DB_POOL_SIZE'])
+            options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+            options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+        return options
+
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+    if url.get_driver_name() == 'pyodbc':
+        options.setdefault('fast_executemany', config['DB_FAST_EXECUTEMANY'])
+    return options
+
+
+def sqlite_pragmas(config, memory=False):
+    pragmas = [f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT_MS'])}"]
+    if config['SQLITE_SYNCHRONOUS']:
+        pragmas.append(f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}")
+    if config['SQLITE_JOURNAL_MODE'] and not memory:
+        pragmas.append(f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+    return pragmas
+
+
+def _listen_for_pragmas(engine, pragmas):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    event.listen(engine, 'connect', set_pragmas)
+
+
+def init_database(app):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    replica_url = app.config.get('READ_REPLICA_URL')
+    if replica_url:
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds[REPLICA_BIND] = {'url': replica_url, **engine_options(app.config, replica_url)}
+        init_replica(app)
+    db.init_app(app)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.url.get_backend_name() == 'sqlite':
+                _listen_for_pragmas(engine, sqlite_pragmas(app.config, memory=_is_sqlite_memory(engine.url)))
@@ -1,5 +1,10 @@
+from collections import namedtuple
+from collections.abc import Mapping
 from datetime import datetime
-from models import db, User, Quiz, Question, Result
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from models import db, User, Quiz, Question, Result, QuizLayout
+from stats import record_result, record_results_bulk, create_quiz_stats, forget_quiz
 
 # --- User Operations ---
 def create_user(username, password, role):
@@ -33,11 +38,23 @@ def update_user(username, new_username=None, new_password=None, new_role=None):
 
 
 # --- Quiz Operations ---
+def bump_quiz_version(quiz_id):
+    # Invalidates cached answer keys for the quiz; caller commits
+    Quiz.query.filter_by(id=quiz_id).update({Quiz.version: Quiz.version + 1},
+                                            synchronize_session=False)
+
 def add_quiz(title, description):
     if not Quiz.query.filter_by(title=title).first():
         quiz = Quiz(title=title, description=description)
         db.session.add(quiz)
-        db.session.commit()
+        try:
+            db.session.flush()
+            create_quiz_stats(quiz.id)
+            db.session.commit()
+        except IntegrityError:
+            # Lost a race with another request creating the same title (uq_quiz_title)
+            db.session.rollback()
+            return None
         return quiz
     return None
 
@@ -48,22 +65,62 @@ def update_quiz(quiz_id, new_title=None, new_description=None):
             quiz.title = new_title
         if new_description:
             quiz.description = new_description
-        db.session.commit()
+        try:
+            bump_quiz_version(quiz_id)
+            db.session.commit()
+        except IntegrityError:
+            # Renamed to a title another quiz already has (uq_quiz_title)
+            db.session.rollback()
+            return None
         return quiz
     return None
 
-def delete_quiz(quiz_id):
+PURGE_CHUNK_SIZE = 5000
+
+def delete_quiz(quiz_id, archive=False):
+    """Delete a quiz with its questions, results and statistics.
+
+    Runs as a few set-based DELETE statements in one transaction. With archive=True the
+    quiz is only hidden (archived_at is set) and purge_archived_quizzes() removes the
+    rows later in small chunks.
+    """
     quiz = Quiz.query.get(quiz_id)
     if quiz:
-        # Optional: delete related questions and results
-        for q in quiz.questions:
-            db.session.delete(q)
-        for r in quiz.results:
-            db.session.delete(r)
-        db.session.delete(quiz)
+        forget_quiz(quiz_id)
+        if archive:
+            quiz.archived_at = datetime.utcnow()
+        else:
+            Result.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+            Question.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+            QuizLayout.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+            Quiz.query.filter_by(id=quiz_id).delete(synchronize_session=False)
         db.session.commit()
         return True
     return False
+
+def _delete_in_chunks(model, quiz_id, chunk_size):
+    deleted = 0
+    while True:
+        ids = [row.id for row in db.session.query(model.id)
+               .filter(model.quiz_id == quiz_id)
+               .limit(chunk_size)]
+        if not ids:
+            return deleted
+        model.query.filter(model.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()  # short transactions, so the table is never locked for long
+        deleted += len(ids)
+
+def purge_archived_quizzes(chunk_size=PURGE_CHUNK_SIZE):
+    """Delete archived quizzes and their rows chunk by chunk; return {quiz_id: results deleted}."""
+    purged = {}
+    for (quiz_id,) in db.session.query(Quiz.id).filter(Quiz.archived_at.isnot(None)).all():
+        purged[quiz_id] = _delete_in_chunks(Result, quiz_id, chunk_size)
+        _delete_in_chunks(Question, quiz_id, chunk_size)
+        forget_quiz(quiz_id)
+        QuizLayout.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+        Quiz.query.filter_by(id=quiz_id).delete(synchronize_session=False)
+        db.session.commit()
+    return purged
 # --- Question Operations ---
 def add_question(quiz_id, text, choice_a, choice_b, choice_c, choice_d, correct):
     quiz = Quiz.query.get(quiz_id)
@@ -78,6 +135,7 @@ def add_question(quiz_id, text, choice_a, choice_b, choice_c, choice_d, correct)
             correct=correct.upper()  # Ensure correct is uppercase
         )
         db.session.add(question)
+        bump_quiz_version(quiz_id)
         db.session.commit()
         return question
     return None
@@ -97,6 +155,7 @@ def update_question(question_id, new_text=None, choice_a=None, choice_b=None, ch
             question.choice_d = choice_d
         if correct:
             question.correct = correct.upper()
+        bump_quiz_version(question.quiz_id)
         db.session.commit()
         return question
     return None
@@ -105,41 +164,166 @@ def delete_question(question_id):
     question = Question.query.get(question_id)
     if question:
         db.session.delete(question)
+        bump_quiz_version(question.quiz_id)
         db.session.commit()
         return True
     return False
+
+# --- Bulk Question Import ---
+QUESTION_FIELDS = ('text', 'choice_a', 'choice_b', 'choice_c', 'choice_d', 'correct')
+BULK_BATCH_SIZE = 500
+
+# errors is a list of (row_index, message); next_row is where a resumed import should start
+BulkReport = namedtuple('BulkReport', 'inserted errors next_row')
+
+def question_values(quiz_id, row):
+    """Validate one question row (mapping or sequence in QUESTION_FIELDS order).
+
+    Returns (values, None) or (None, error message).
+    """
+    if isinstance(row, Mapping):
+        values = {field: row.get(field) for field in QUESTION_FIELDS}
+    else:
+        row = tuple(row)
+        if len(row) != len(QUESTION_FIELDS):
+            return None, f"expected {len(QUESTION_FIELDS)} fields, got {len(row)}"
+        values = dict(zip(QUESTION_FIELDS, row))
+
+    values = {k: v.strip() if isinstance(v, str) else v for k, v in values.items()}
+    if not values['text']:
+        return None, "question text is empty"
+    correct = (values['correct'] or '').upper()
+    if correct not in ('A', 'B', 'C', 'D'):
+        return None, f"correct answer must be one of A-D, got {values['correct']!r}"
+    if not values['choice_' + correct.lower()]:
+        return None, f"choice {correct} is marked correct but is empty"
+    values['correct'] = correct
+    values['quiz_id'] = quiz_id
+    return values, None
+
+def add_questions_bulk(quiz_id, rows, batch_size=BULK_BATCH_SIZE, commit_per_batch=False, start=0):
+    """Insert many questions with executemany batches.
+
+    Invalid rows are reported and skipped. By default everything is committed once at the
+    end; with commit_per_batch each batch is committed and a failed import can be resumed
+    by passing start=report.next_row. Returns None if the quiz does not exist.
+    """
+    if not Quiz.query.get(quiz_id):
+        return None
+
+    errors = []
+    inserted = 0
+    committed = 0      # rows durably committed so far (commit_per_batch only)
+    next_row = start   # first row that is not committed yet
+    index = start - 1
+    batch = []
+    try:
+        for index, row in enumerate(rows):
+            if index < start:
+                continue
+            values, error = question_values(quiz_id, row)
+            if error:
+                errors.append((index, error))
+            else:
+                batch.append(values)
+            if len(batch) >= batch_size:
+                db.session.execute(insert(Question), batch)
+                inserted += len(batch)
+                batch = []
+                if commit_per_batch:
+                    bump_quiz_version(quiz_id)
+                    db.session.commit()
+                    committed, next_row = inserted, index + 1
+        if batch:
+            db.session.execute(insert(Question), batch)
+            inserted += len(batch)
+        bump_quiz_version(quiz_id)
+        db.session.commit()
+        return BulkReport(inserted, errors, max(index + 1, start))
+    except SQLAlchemyError as exc:
+        db.session.rollback()
+        errors.append((next_row, f"batch failed: {exc}"))
+        return BulkReport(committed, errors, next_row)
+
 # --- Result Operations ---
-def add_result(student_id, quiz_id, score, total):
-    result = Result(
-        student_id=student_id,
-        quiz_id=quiz_id,
-        score=score,
-        total=total,
-        timestamp=datetime.utcnow()  # ← explicitly set timestamp
-    )
-    db.session.add(result)
-    db.session.commit()
-    return result
+def commit_with_rollups(write):
+    """Run write() and commit; run it once more if the commit lost a rollup-row race.
+
+    stats inserts a student's rollup row on their first attempt at a quiz. When another
+    transaction inserts the same row first, the commit fails on its primary key; after
+    the rollback the row exists and the second run increments it instead.
+    """
+    try:
+        value = write()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        value = write()
+        db.session.commit()
+    return value
+
+def add_result(student_id, quiz_id, score, total, timestamp=None, quiz_version=None, answers=None):
+    timestamp = timestamp or datetime.utcnow()  # ← explicitly set timestamp
+
+    def write():
+        result = Result(
+            student_id=student_id,
+            quiz_id=quiz_id,
+            score=score,
+            total=total,
+            timestamp=timestamp,
+            quiz_version=quiz_version,
+            answers=answers  # packed by answers.pack_answers()
+        )
+        db.session.add(result)
+        record_result(student_id, quiz_id, score, total)
+        return result
+
+    return commit_with_rollups(write)
+
+def add_results_bulk(rows):
+    """Insert many (student_id, quiz_id, score, total, timestamp[, quiz_version, answers])
+    rows with one commit; return the number of rows."""
+    results = []
+    for student_id, quiz_id, score, total, timestamp, *attempt in rows:
+        quiz_version, answers = attempt or (None, None)
+        results.append({'student_id': student_id, 'quiz_id': quiz_id, 'score': score, 'total': total,
+                        'timestamp': timestamp or datetime.utcnow(),
+                        'quiz_version': quiz_version, 'answers': answers})
+
+    def write():
+        if results:
+            # One executemany: the new ids are not needed, so nothing is fetched back
+            db.session.execute(insert(Result), results)
+            record_results_bulk([(r['student_id'], r['quiz_id'], r['score'], r['total']) for r in results])
+
+    commit_with_rollups(write)
+    return len(results)
 
 
 def update_result(result_id, score=None, total=None):
-    result = Result.query.get(result_id)
-    if result:
-        if score is not None:
-            result.score = score
-        if total is not None:
-            result.total = total
-        db.session.commit()
+    def write():
+        result = Result.query.get(result_id)
+        if result:
+            record_result(result.student_id, result.quiz_id, result.score, result.total, sign=-1)
+            if score is not None:
+                result.score = score
+            if total is not None:
+                result.total = total
+            record_result(result.student_id, result.quiz_id, result.score, result.total)
         return result
-    return None
+
+    return commit_with_rollups(write)
 
 def delete_result(result_id):
-    result = Result.query.get(result_id)
-    if result:
-        db.session.delete(result)
-        db.session.commit()
-        return True
-    return False
+    def write():
+        result = Result.query.get(result_id)
+        if result:
+            record_result(result.student_id, result.quiz_id, result.score, result.total, sign=-1)
+            db.session.delete(result)
+        return result is not None
+
+    return commit_with_rollups(write)
 
 def get_student_results(student_id):
     student = User.query.get(student_id)
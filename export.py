@@ -0,0 +1,103 @@
+"""Streaming export of results as CSV or JSON Lines.
+
+Rows come from a server-side cursor (yield_per) and are encoded into fixed-size
+chunks, optionally gzip-compressed on the fly, so memory stays flat no matter
+how many results are exported.
+
+Each row carries the attempt's packed answers (see answers.py) with the question
+ids of its quiz version in the same order, so answer i belongs to question i.
+Attempts stored before answers were kept have both columns empty.
+"""
+import csv
+import io
+import json
+import zlib
+from sqlalchemy import select
+from models import db, User, Quiz, Result, QuizLayout
+
+FETCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+COLUMNS = ('result_id', 'timestamp', 'student_id', 'username', 'quiz_id', 'quiz_title',
+           'score', 'total', 'percentage', 'quiz_version', 'question_ids', 'answers')
+
+
+def export_rows(quiz_id=None, student=None, date_from=None, date_to=None):
+    """Yield one tuple in COLUMNS order per result, streamed from the database."""
+    query = (
+        select(Result.id, Result.timestamp, Result.student_id, User.username,
+               Result.quiz_id, Quiz.title, Result.score, Result.total,
+               Result.quiz_version, QuizLayout.question_ids, Result.answers)
+        .join(Quiz, Quiz.id == Result.quiz_id)
+        .outerjoin(User, User.id == Result.student_id)
+        .outerjoin(QuizLayout, (QuizLayout.quiz_id == Result.quiz_id)
+                   & (QuizLayout.version == Result.quiz_version))
+        .where(Quiz.archived_at.is_(None))
+        .order_by(Result.id)
+    )
+    if quiz_id:
+        query = query.where(Result.quiz_id == quiz_id)
+    if student:
+        query = query.where(User.username.startswith(student, autoescape=True))
+    if date_from:
+        query = query.where(Result.timestamp >= date_from)
+    if date_to:
+        query = query.where(Result.timestamp < date_to)
+
+    rows = db.session.execute(query.execution_options(yield_per=FETCH_SIZE))
+    for (result_id, timestamp, student_id, username, qid, title, score, total,
+         version, question_ids, answers) in rows:
+        percentage = round(score / total * 100, 1) if total else 0
+        yield (result_id, timestamp.isoformat(sep=' ') if timestamp else '', student_id, username,
+               qid, title, score, total, percentage, version, question_ids, answers)
+
+
+def _buffered(lines):
+    # Join small pieces into CHUNK_SIZE byte chunks to keep the number of writes low
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def csv_lines(rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+    yield out.getvalue()
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + '\n'
+
+
+def encode(rows, fmt):
+    """Return an iterator of byte chunks for rows in fmt ('csv' or 'jsonl')."""
+    lines = csv_lines(rows) if fmt == 'csv' else jsonl_lines(rows)
+    return _buffered(lines)
+
+
+def gzip_chunks(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
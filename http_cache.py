@@ -0,0 +1,81 @@
+"""Conditional GETs for pages whose content follows a cheap data version.
+
+@conditional(version_func) computes an ETag from version_func(**view_args), the
+logged-in user and a fingerprint of the templates and views. A request whose
+If-None-Match matches gets a 304 before the view runs, so neither the template
+nor the page's aggregate queries are touched. Pages of logged-in users are
+only ever stored by the browser: conditional pages are "private, no-cache"
+(revalidate every time), everything else "private, no-store".
+"""
+import hashlib
+import os
+from functools import wraps
+from flask import current_app, request, session, make_response
+
+
+def build_fingerprint(app):
+    """Hash of the templates, view modules and static assets, so a deploy invalidates every ETag."""
+    digest = hashlib.sha1()
+    sources = [os.path.join(app.root_path, name) for name in sorted(os.listdir(app.root_path))
+               if name.endswith('.py')]
+    template_dir = os.path.join(app.root_path, app.template_folder)
+    for folder, _, files in sorted(os.walk(template_dir)):
+        sources.extend(os.path.join(folder, name) for name in sorted(files))
+    for path in sources:
+        with open(path, 'rb') as fh:
+            digest.update(fh.read())
+    # Pages link hashed asset names; a CSS/JS-only deploy must not revalidate old HTML
+    manifest = app.extensions.get('assets')
+    if manifest is not None:
+        digest.update(' '.join(sorted(manifest.by_hashed)).encode())
+    return digest.hexdigest()
+
+
+def page_etag(version):
+    key = repr((current_app.extensions['page_fingerprint'], session.get('user_id'),
+                session.get('username'), session.get('role'), version))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def conditional(version_func):
+    """Serve 304 Not Modified while version_func(**view_args) is unchanged.
+
+    version_func returns None when it can't vouch for the page (e.g. a missing
+    quiz); the view then runs normally.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Pending flash messages would be lost on a 304
+            if request.method not in ('GET', 'HEAD') or session.get('_flashes'):
+                return view(*args, **kwargs)
+            version = version_func(*args, **kwargs)
+            if version is None:
+                return view(*args, **kwargs)
+
+            etag = page_etag(version)
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            # Weak: the same page may be sent gzip-compressed or not
+            response.set_etag(etag, weak=True)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def init_http_cache(app):
+    app.extensions['page_fingerprint'] = build_fingerprint(app)
+
+    @app.after_request
+    def private_cache_headers(response):
+        # Logged-in pages must never land in a shared cache or outlive the session
+        if 'user_id' in session and 'Cache-Control' not in response.headers:
+            response.cache_control.private = True
+            response.cache_control.no_store = True
+        return response
@@ -0,0 +1,161 @@
+"""Item analysis of a quiz from stored answers.
+
+response_matrix() turns a quiz's packed Result.answers (see answers.py) into an
+attempts x questions uint8 array: 0 for blank, 1-4 for A-D, and NOT_PRESENTED for a
+question the attempt's quiz version did not have. Each quiz version is decoded with
+one np.frombuffer() call instead of a Python loop per answer.
+
+item_statistics() computes, for every question of the current version:
+
+  * p_value: share of the attempts that saw the question and answered it correctly;
+  * discrimination: point-biserial correlation between answering the question
+    correctly and the score on the other questions (corrected item-total);
+  * choice_rates: share of attempts that chose A, B, C, D or left it blank;
+
+and KR-20 reliability for the whole quiz. Answers are scored against the current
+answer key. Rows are reduced in chunks to column sums, so memory stays flat.
+"""
+from collections import namedtuple
+
+import numpy as np
+from sqlalchemy import func
+
+from answers import question_order
+from models import db, Result
+from quiz_cache import LRUCache, get_answer_key
+
+NOT_PRESENTED = 255
+CHUNK_ROWS = 16384
+CHOICE_LABELS = ('blank', 'A', 'B', 'C', 'D')  # column order of choice_rates
+ANALYSIS_CACHE_SIZE = 64
+
+# ASCII byte -> answer code
+CODES = np.zeros(256, dtype=np.uint8)
+for _code, _letter in enumerate('ABCD', start=1):
+    CODES[ord(_letter)] = _code
+
+ItemAnalysis = namedtuple('ItemAnalysis', 'attempts question_ids correct seen p_value discrimination '
+                                          'choice_rates kr20')
+
+
+# --- Response matrix ---
+def key_codes(correct):
+    """Codes of the correct letters; a question without a valid key matches no answer."""
+    return np.array(['ABCD'.find(letter) + 1 if letter in 'ABCD' else NOT_PRESENTED - 1
+                     for letter in correct], dtype=np.uint8)
+
+
+def decode_block(packed, width):
+    """Decode packed strings of one quiz version into a len(packed) x width array of codes."""
+    raw = ''.join(packed).encode('ascii')
+    if len(raw) != len(packed) * width:
+        packed = [p for p in packed if len(p) == width]  # drop malformed rows
+        raw = ''.join(packed).encode('ascii')
+    return CODES[np.frombuffer(raw, dtype=np.uint8)].reshape(len(packed), width)
+
+
+def response_matrix(quiz_id, question_ids):
+    """Stored attempts of a quiz as an attempts x len(question_ids) array of codes."""
+    rows = db.session.execute(
+        db.select(Result.quiz_version, Result.answers)
+        .where(Result.quiz_id == quiz_id, Result.answers.is_not(None), Result.quiz_version.is_not(None))
+        .order_by(Result.quiz_version)
+    ).all()
+    if not rows:
+        return np.empty((0, len(question_ids)), dtype=np.uint8)
+
+    # Rows are sorted by version; split them where the version changes
+    versions, packed = zip(*rows)
+    versions = np.array(versions)
+    bounds = [0, *(np.flatnonzero(np.diff(versions)) + 1), len(versions)]
+
+    column = {qid: j for j, qid in enumerate(question_ids)}
+    blocks = []
+    for start, end in zip(bounds, bounds[1:]):
+        order = question_order(quiz_id, int(versions[start]))
+        if not order:
+            continue
+        codes = decode_block(packed[start:end], len(order))
+        src = [i for i, qid in enumerate(order) if qid in column]
+        if src == list(range(len(question_ids))) and len(order) == len(question_ids):
+            blocks.append(codes)  # same questions in the same order: use as is
+            continue
+        block = np.full((len(codes), len(question_ids)), NOT_PRESENTED, dtype=np.uint8)
+        if src:
+            block[:, [column[order[i]] for i in src]] = codes[:, src]
+        blocks.append(block)
+    if not blocks:
+        return np.empty((0, len(question_ids)), dtype=np.uint8)
+    return np.concatenate(blocks)
+
+
+# --- Statistics ---
+def item_statistics(matrix, correct, question_ids=(), chunk_rows=CHUNK_ROWS):
+    """Compute an ItemAnalysis for a response matrix and the correct letters ('B', 'C', ...)."""
+    attempts, items = matrix.shape
+    key = key_codes(correct)
+
+    seen = np.zeros(items)
+    right = np.zeros(items)
+    choices = np.zeros((len(CHOICE_LABELS), items))
+    xy = np.zeros(items)  # sum of total score over attempts answering correctly
+    xm = np.zeros(items)  # sum of total score over attempts that saw the question
+    xxm = np.zeros(items)  # sum of squared total score over attempts that saw it
+    score_sum = score_sq = 0.0
+    for start in range(0, attempts, chunk_rows):
+        block = matrix[start:start + chunk_rows]
+        y = (block == key).astype(np.float64)
+        m = (block != NOT_PRESENTED).astype(np.float64)
+        x = y.sum(axis=1)
+        seen += m.sum(axis=0)
+        right += y.sum(axis=0)
+        xy += x @ y
+        xm += x @ m
+        xxm += (x * x) @ m
+        score_sum += x.sum()
+        score_sq += (x * x).sum()
+        for code in range(len(CHOICE_LABELS)):
+            choices[code] += (block == code).sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = right / seen
+        # Rest score r = x - y: sum(y*r) = xy - right, sum(m*r) = xm - right,
+        # sum(m*r*r) = xxm - 2*xy + right
+        mean_r = (xm - right) / seen
+        cov = (xy - right) / seen - p * mean_r
+        var_r = (xxm - 2 * xy + right) / seen - mean_r ** 2
+        discrimination = cov / np.sqrt(p * (1 - p) * var_r)
+        choice_rates = (choices / seen).T
+
+    discrimination[~np.isfinite(discrimination)] = np.nan
+    kr20 = float('nan')
+    if attempts and items > 1:
+        variance = score_sq / attempts - (score_sum / attempts) ** 2
+        if variance > 0:
+            kr20 = items / (items - 1) * (1 - np.nansum(p * (1 - p)) / variance)
+    return ItemAnalysis(attempts, tuple(question_ids), correct, seen.astype(int), p, discrimination,
+                        choice_rates, kr20)
+
+
+# --- Cached per quiz ---
+analyses = LRUCache(ANALYSIS_CACHE_SIZE)
+
+
+def attempts_version(quiz_id):
+    """(count, highest id) of the quiz's attempts with stored answers."""
+    return tuple(db.session.execute(
+        db.select(func.count(Result.id), func.max(Result.id))
+        .where(Result.quiz_id == quiz_id, Result.answers.is_not(None))
+    ).one())
+
+
+def analyze_quiz(quiz):
+    """ItemAnalysis of quiz's current version, recomputed only when attempts or the quiz change."""
+    stamp = (quiz.version,) + attempts_version(quiz.id)
+    cached = analyses.get(quiz.id)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    key = get_answer_key(quiz)
+    analysis = item_statistics(response_matrix(quiz.id, key.question_ids), key.correct, key.question_ids)
+    analyses.put(quiz.id, (stamp, analysis))
+    return analysis
@@ -0,0 +1,189 @@
+"""Per-request SQL instrumentation and route latency histograms.
+
+init_metrics(app) hooks SQLAlchemy's cursor events to count statements and database
+time for the current request, records per-endpoint latency histograms, and logs
+statements slower than SLOW_QUERY_MS together with the route that ran them. The
+hot path is a couple of perf_counter() calls and dict updates under a lock.
+"""
+import time
+from bisect import bisect_left
+from threading import Lock
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds of the latency buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RouteStats:
+    __slots__ = ('requests', 'seconds', 'buckets', 'statements', 'max_statements', 'db_seconds', 'slow_queries')
+
+    def __init__(self):
+        self.requests = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.statements = 0
+        self.max_statements = 0
+        self.db_seconds = 0.0
+        self.slow_queries = 0
+
+    def observe(self, seconds):
+        self.requests += 1
+        self.seconds += seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def copy(self):
+        copy = RouteStats()
+        for name in RouteStats.__slots__:
+            value = getattr(self, name)
+            setattr(copy, name, list(value) if isinstance(value, list) else value)
+        return copy
+
+    def quantile(self, q):
+        """Estimate a latency quantile (seconds) by interpolating inside its bucket."""
+        if not self.requests:
+            return 0.0
+        rank = q * self.requests
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                low = BUCKETS[i - 1] if i > 0 else 0.0
+                high = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return low + (high - low) * (rank - seen) / count
+            seen += count
+        return BUCKETS[-1]
+
+
+class Metrics:
+    def __init__(self):
+        self.routes = {}
+        self._lock = Lock()
+
+    def _route(self, endpoint):
+        stats = self.routes.get(endpoint)
+        if stats is None:
+            stats = self.routes[endpoint] = RouteStats()
+        return stats
+
+    def record_request(self, endpoint, seconds, statements, db_seconds, slow_queries):
+        with self._lock:
+            stats = self._route(endpoint)
+            stats.observe(seconds)
+            stats.statements += statements
+            stats.max_statements = max(stats.max_statements, statements)
+            stats.db_seconds += db_seconds
+            stats.slow_queries += slow_queries
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: stats.copy() for endpoint, stats in sorted(self.routes.items())}
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+
+
+metrics = Metrics()
+
+
+# --- Hooks ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g._sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context() or getattr(g, '_sql_started', None) is None:
+        return
+    elapsed = time.perf_counter() - g._sql_started
+    g._sql_started = None
+    g.sql_statements = getattr(g, 'sql_statements', 0) + 1
+    g.sql_seconds = getattr(g, 'sql_seconds', 0.0) + elapsed
+    threshold = g.get('_slow_query_seconds')
+    if threshold is not None and elapsed >= threshold:
+        g.sql_slow = getattr(g, 'sql_slow', 0) + 1
+        from flask import current_app
+        current_app.logger.warning("Slow query (%.1f ms) in %s: %s",
+                                   elapsed * 1000, request.endpoint, ' '.join(statement.split())[:500])
+
+
+def init_metrics(app):
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    slow_query_seconds = app.config.get('SLOW_QUERY_MS', 200) / 1000
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_timer():
+        g._request_started = time.perf_counter()
+        g._slow_query_seconds = slow_query_seconds
+        g.sql_statements = 0
+        g.sql_seconds = 0.0
+        g.sql_slow = 0
+
+    @app.teardown_request
+    def record_request(exc=None):
+        started = g.pop('_request_started', None)
+        if started is None:
+            return
+        endpoint = request.endpoint or 'unmatched'
+        metrics.record_request(endpoint, time.perf_counter() - started,
+                               g.get('sql_statements', 0), g.get('sql_seconds', 0.0), g.get('sql_slow', 0))
+
+
+# --- Exposition ---
+def _histogram_lines(name, help_text, label, series):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for value, stats in series.items():
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), stats.buckets):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{label}="{value}"}} {stats.seconds:.6f}')
+        lines.append(f'{name}_count{{{label}="{value}"}} {stats.requests}')
+    return lines
+
+
+def _sample_lines(kind, samples):
+    lines = []
+    seen = set()
+    for name, help_text, labels, value in samples:
+        if name not in seen:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            seen.add(name)
+        label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+        lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+    return lines
+
+
+def prometheus_text(extra_gauges=(), extra_histograms=(), extra_counters=()):
+    """Render the aggregates in the Prometheus text exposition format.
+
+    extra_gauges and extra_counters are iterables of (name, help, {labels}, value)
+    tuples, extra_histograms of (name, help, label, {label value: RouteStats}) tuples.
+    """
+    snapshot = metrics.snapshot()
+    lines = _histogram_lines('quiz_http_request_duration_seconds', 'Request latency by endpoint.',
+                             'endpoint', snapshot)
+    for name, help_text, label, series in extra_histograms:
+        lines += _histogram_lines(name, help_text, label, series)
+
+    counters = (
+        ('quiz_db_statements_total', 'SQL statements executed by endpoint.', 'statements', '{}'),
+        ('quiz_db_seconds_total', 'Time spent in SQL statements by endpoint.', 'db_seconds', '{:.6f}'),
+        ('quiz_db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS by endpoint.', 'slow_queries', '{}'),
+    )
+    for name, help_text, attr, fmt in counters:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for endpoint, stats in snapshot.items():
+            lines.append(f'{name}{{endpoint="{endpoint}"}} ' + fmt.format(getattr(stats, attr)))
+
+    lines += _sample_lines('counter', extra_counters)
+    lines += _sample_lines('gauge', extra_gauges)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,80 @@
+"""Create-if-missing schema upgrades.
+
+The app has no migration framework; upgrade_schema() brings an existing database
+in line with models.py by creating missing tables, adding missing columns that
+are nullable or have a server default, and creating missing indexes. Every step
+is idempotent, so it is safe to run on every deploy:
+
+    flask --app app upgrade-db
+"""
+from sqlalchemy import inspect, func, text
+from sqlalchemy.schema import CreateColumn
+from models import db, Quiz
+
+
+def _duplicate_titles(engine):
+    query = (db.select(Quiz.title)
+             .group_by(Quiz.title)
+             .having(func.count(Quiz.id) > 1))
+    with engine.connect() as conn:
+        return conn.execute(query).all()
+
+
+def _reuses_ids(engine, table):
+    """True for an existing SQLite table that models.py wants AUTOINCREMENT on but lacks it."""
+    if engine.dialect.name != 'sqlite' or not table.kwargs.get('sqlite_autoincrement'):
+        return False
+    with engine.connect() as conn:
+        sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                           {'name': table.name}).scalar()
+    return 'AUTOINCREMENT' not in (sql or '').upper()
+
+
+def upgrade_schema():
+    """Apply missing schema objects; return a list of (action, name, note) tuples."""
+    engine = db.engine
+    applied = []
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    db.create_all(bind_key=None)  # new tables come with their indexes
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            applied.append(('create table', table.name, ''))
+
+    inspector = inspect(engine)
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        if _reuses_ids(engine, table):
+            applied.append(('skip autoincrement', table.name,
+                            'SQLite reuses deleted ids in this table, rebuild it by hand'))
+
+        columns = {c['name'] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            if not column.nullable and column.server_default is None:
+                applied.append(('skip column', f"{table.name}.{column.name}",
+                                'NOT NULL without a server default, add it by hand'))
+                continue
+            ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {engine.dialect.identifier_preparer.quote(table.name)} ADD {ddl}"))
+            applied.append(('add column', f"{table.name}.{column.name}", ''))
+
+        indexes = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in indexes:
+                continue
+            if index.name == 'uq_quiz_title':
+                duplicates = _duplicate_titles(engine)
+                if duplicates:
+                    applied.append(('skip index', index.name,
+                                    'duplicate titles: ' + ', '.join(repr(t) for t, in duplicates)))
+                    continue
+            index.create(bind=engine)
+            applied.append(('create index', index.name, ''))
+
+    return applied
@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-db = SQLAlchemy()
+from replica import RoutingSession
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # --- Models ---
 class User(db.Model):
@@ -14,8 +15,16 @@ class Quiz(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.Unicode(200))
     description = db.Column(db.UnicodeText)
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)  # bumped on every edit
+    archived_at = db.Column(db.DateTime, nullable=True)  # set by delete_quiz(archive=True) until purged
     questions = db.relationship('Question', backref='quiz', lazy=True)
 
+    __table_args__ = (
+        db.Index('uq_quiz_title', 'title', unique=True),  # add_quiz looks quizzes up by title
+        # Caches are keyed by (quiz id, version); SQLite would hand a deleted quiz's id to the next one
+        {'sqlite_autoincrement': True},
+    )
+
 class Question(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'))
@@ -26,6 +35,11 @@ class Question(db.Model):
     choice_d = db.Column(db.Unicode(300))
     correct = db.Column(db.String(1))
 
+    __table_args__ = (
+        db.Index('ix_question_quiz', 'quiz_id'),
+        {'sqlite_autoincrement': True},  # stored answer orders refer to question ids
+    )
+
 class Result(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('user.id'))
@@ -33,6 +47,40 @@ class Result(db.Model):
     score = db.Column(db.Integer)
     total = db.Column(db.Integer)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)  # ← new column with default
+    # Submitted answers, one letter per question in QuizLayout order (see answers.py)
+    quiz_version = db.Column(db.Integer, nullable=True)
+    answers = db.Column(db.Text, nullable=True)
 
     student = db.relationship('User', backref='results')
-    quiz = db.relationship('Quiz', backref='results')
\ No newline at end of file
+    quiz = db.relationship('Quiz', backref='results')
+
+    # Dashboards filter by student/quiz, the analysis page orders by timestamp
+    __table_args__ = (
+        db.Index('ix_result_student_quiz_time', 'student_id', 'quiz_id', 'timestamp'),
+        db.Index('ix_result_quiz_time', 'quiz_id', 'timestamp'),
+        db.Index('ix_result_time', 'timestamp', 'id'),
+    )
+
+class QuizLayout(db.Model):
+    """Question order of one quiz version, stored the first time that version is graded."""
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), primary_key=True)
+    version = db.Column(db.Integer, primary_key=True)
+    question_ids = db.Column(db.Text, nullable=False)  # comma-separated Question ids
+
+# --- Statistics rollups (maintained by stats.py) ---
+class StatsColumns:
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    score_sum = db.Column(db.Integer, default=0, nullable=False)
+    total_sum = db.Column(db.Integer, default=0, nullable=False)
+    pct_sum = db.Column(db.Float, default=0.0, nullable=False)  # sum of per-attempt percentages
+    excellent_count = db.Column(db.Integer, default=0, nullable=False)  # 80-100%
+    good_count = db.Column(db.Integer, default=0, nullable=False)  # 60-79%
+    fair_count = db.Column(db.Integer, default=0, nullable=False)  # 50-59%
+    poor_count = db.Column(db.Integer, default=0, nullable=False)  # 0-49%
+
+class QuizStats(StatsColumns, db.Model):
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), primary_key=True)
+
+class StudentQuizStats(StatsColumns, db.Model):
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), primary_key=True)
@@ -0,0 +1,135 @@
+"""Batch grading of scanned (OMR) answer sheets.
+
+A sheet file is a CSV with one row per student: the username, then one column per
+question in the quiz's question order holding A-D, or nothing when the question
+was left unanswered. A first row starting with "username" is a header.
+
+    flask --app app grade-sheets 12 scans/exam.csv --report exam_report.csv
+
+Valid rows are packed like web submissions (answers.py) and graded with a single
+NumPy comparison against the cached answer key. Usernames are resolved with one
+IN query per IN_CHUNK sheets and results are stored with add_results_bulk() in
+batches. Every row gets a line in the report, saying it was graded or why not.
+"""
+import csv
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from answers import BLANK, record_question_order
+from db_utils import add_results_bulk
+from item_analysis import decode_block, key_codes
+from models import db, User
+from quiz_cache import get_answer_key
+
+BATCH_SIZE = 500
+IN_CHUNK = 2000  # stays below SQL Server's 2100 parameters per statement
+VALID_ANSWERS = {'', 'A', 'B', 'C', 'D'}
+REPORT_COLUMNS = ('line', 'username', 'status', 'score', 'total', 'error')
+
+
+def _report(line, username, status, error='', score=None, total=None):
+    return {'line': line, 'username': username, 'status': status, 'score': score, 'total': total,
+            'error': error}
+
+
+# --- Parsing ---
+def parse_sheets(stream, questions):
+    """Read CSV rows; return ([(line, username, packed answers)], [report rows of rejected lines])."""
+    sheets = []
+    rejected = []
+    seen = set()
+    for line, row in enumerate(csv.reader(stream), start=1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        username, answers = cells[0], [cell.upper() for cell in cells[1:]]
+        if line == 1 and username.lower() == 'username':
+            continue
+        while len(answers) > questions and not answers[-1]:
+            answers.pop()  # trailing empty cells from spreadsheet exports
+
+        if not username:
+            rejected.append(_report(line, username, 'malformed', 'missing username'))
+        elif len(answers) != questions:
+            rejected.append(_report(line, username, 'malformed',
+                                    f'expected {questions} answers, found {len(answers)}'))
+        elif not VALID_ANSWERS.issuperset(answers):
+            bad = [f'Q{i}' for i, answer in enumerate(answers, start=1) if answer not in VALID_ANSWERS]
+            rejected.append(_report(line, username, 'malformed', 'invalid answer in ' + ', '.join(bad)))
+        elif username in seen:
+            rejected.append(_report(line, username, 'duplicate', 'another sheet for this student'))
+        else:
+            seen.add(username)
+            sheets.append((line, username, ''.join(answer or BLANK for answer in answers)))
+    return sheets, rejected
+
+
+def resolve_students(usernames):
+    """Map usernames to (id, role, is_active), one query per IN_CHUNK names."""
+    users = {}
+    for start in range(0, len(usernames), IN_CHUNK):
+        chunk = usernames[start:start + IN_CHUNK]
+        rows = db.session.execute(
+            db.select(User.username, User.id, User.role, User.is_active).where(User.username.in_(chunk))
+        )
+        users.update((username, (user_id, role, active)) for username, user_id, role, active in rows)
+    return users
+
+
+# --- Grading ---
+def grade_sheets(quiz, stream, batch_size=BATCH_SIZE):
+    """Grade every sheet in stream against quiz and store the results.
+
+    Must run in an app context. Returns one report dict per non-empty row, in
+    file order.
+    """
+    key = get_answer_key(quiz)
+    total = len(key.question_ids)
+    if not total:
+        raise ValueError("the quiz has no questions")
+    quiz_id, quiz_version = quiz.id, quiz.version
+
+    sheets, report = parse_sheets(stream, total)
+    scores = []
+    if sheets:
+        answers = decode_block([packed for _, _, packed in sheets], total)
+        scores = (answers == key_codes(key.correct)).sum(axis=1).tolist()
+    users = resolve_students([username for _, username, _ in sheets])
+    record_question_order(quiz, key)
+
+    graded = []  # (report row, result row)
+    for (line, username, packed), score in zip(sheets, scores):
+        user = users.get(username)
+        if user is None:
+            report.append(_report(line, username, 'unknown_user', 'no such user'))
+        elif user[1] != 'student' or not user[2]:
+            report.append(_report(line, username, 'not_a_student', 'not an active student account'))
+        else:
+            graded.append((_report(line, username, 'graded', score=score, total=total),
+                           (user[0], quiz_id, score, total, datetime.utcnow(), quiz_version, packed)))
+
+    for start in range(0, len(graded), batch_size):
+        batch = graded[start:start + batch_size]
+        try:
+            add_results_bulk([row for _, row in batch])
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            for entry, _ in batch:
+                entry.update(status='failed', score=None, total=None, error=f'batch failed: {exc}')
+        report.extend(entry for entry, _ in batch)
+
+    report.sort(key=lambda entry: entry['line'])
+    return report
+
+
+def summarize(report):
+    """Count report rows by status."""
+    return Counter(entry['status'] for entry in report)
+
+
+def write_report(report, fh):
+    writer = csv.DictWriter(fh, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(report)
@@ -0,0 +1,117 @@
+"""Password hashing on a bounded worker pool.
+
+A PBKDF2 check is the most expensive thing a request does (about 150 ms at
+werkzeug's default 260,000 iterations), so a burst of logins can occupy every
+server thread. PasswordHasher runs hashes on PASSWORD_HASH_WORKERS threads
+(hashlib releases the GIL while it hashes) and lets at most PASSWORD_HASH_QUEUE
+more requests wait for one; past that it raises HasherBusy, a 503 with
+Retry-After, instead of letting requests pile up.
+
+Hashes made with an older PASSWORD_HASH_METHOD are upgraded on the user's next
+successful login (see needs_rehash).
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import check_password_hash, generate_password_hash, DEFAULT_PBKDF2_ITERATIONS
+from metrics import RouteStats
+
+
+class HasherBusy(ServiceUnavailable):
+    description = "Too many sign-ins at once. Please try again in a few seconds."
+
+
+def normalize_method(method):
+    """Spell out werkzeug's defaults ('pbkdf2' -> 'pbkdf2:sha256:260000')."""
+    parts = method.split(':')
+    if parts[0] == 'pbkdf2':
+        parts += ['sha256', str(DEFAULT_PBKDF2_ITERATIONS)][len(parts) - 1:]
+    return ':'.join(parts)
+
+
+class PasswordHasher:
+    def __init__(self, method='pbkdf2', workers=1, queue_size=16, retry_after=2):
+        self.method = normalize_method(method)
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+        self.retry_after = retry_after
+        self.rejected = 0
+        self.rehashed = 0
+        self._in_flight = 0
+        self._slots = BoundedSemaphore(self.capacity)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        self._latency = {}  # 'verify' / 'hash' / 'queue_wait' -> RouteStats
+        self._lock = Lock()
+
+    def run(self, operation, func, *args):
+        """Run func on the pool and wait for it; raise HasherBusy when the pool is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusy(retry_after=self.retry_after)
+        queued = time.perf_counter()
+        started = []
+
+        def task():
+            started.append(time.perf_counter())
+            return func(*args)
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            finished = time.perf_counter()
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+                self._observe(operation, finished - queued)
+                if started:
+                    self._observe('queue_wait', started[0] - queued)
+
+    def verify(self, stored, password):
+        return self.run('verify', check_password_hash, stored, password)
+
+    def hash(self, password):
+        return self.run('hash', generate_password_hash, password, self.method)
+
+    def needs_rehash(self, stored):
+        """True when stored was hashed with a method other than the configured one."""
+        return normalize_method(stored.split('$', 1)[0]) != self.method
+
+    def record_rehash(self):
+        with self._lock:
+            self.rehashed += 1
+
+    def _observe(self, operation, seconds):
+        stats = self._latency.get(operation)
+        if stats is None:
+            stats = self._latency[operation] = RouteStats()
+        stats.observe(seconds)
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': self._in_flight, 'capacity': self.capacity,
+                    'rejected': self.rejected, 'rehashed': self.rehashed}
+
+    def latency(self):
+        with self._lock:
+            return {operation: stats.copy() for operation, stats in sorted(self._latency.items())}
+
+
+def init_passwords(app):
+    app.extensions['password_hasher'] = PasswordHasher(app.config['PASSWORD_HASH_METHOD'],
+                                                       workers=app.config['PASSWORD_HASH_WORKERS'],
+                                                       queue_size=app.config['PASSWORD_HASH_QUEUE'],
+                                                       retry_after=app.config['PASSWORD_HASH_RETRY_AFTER'])
+
+
+def password_hasher():
+    return current_app.extensions['password_hasher']
+
+
+def hash_password(password):
+    """Hash with the configured method on the hashing pool (may raise HasherBusy)."""
+    return password_hasher().hash(password)
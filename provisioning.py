@@ -0,0 +1,165 @@
+"""Bulk creation of student accounts from CSV.
+
+Each row holds a username and an initial password; a first row starting with
+"username" is a header:
+
+    flask --app app provision-students students.csv --workers 8 --report created.csv
+
+Usernames already taken are found with one IN query per IN_CHUNK rows, passwords
+are hashed in a process pool by the CLI, and the accounts are inserted in batches
+with one commit each. Uploads through the admin page hash on the app's bounded
+PasswordHasher instead: forking a web worker that runs threads is unsafe. They
+are limited to PROVISION_WEB_MAX_ACCOUNTS new accounts so a request never hashes
+for minutes. The summary reports hashing and insert throughput.
+"""
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from flask import current_app
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from werkzeug.security import generate_password_hash
+
+from models import db, User
+
+BATCH_SIZE = 500
+IN_CHUNK = 2000  # stays below SQL Server's 2100 parameters per statement
+REPORT_COLUMNS = ('line', 'username', 'status', 'error')
+
+
+def _report(line, username, status, error=''):
+    return {'line': line, 'username': username, 'status': status, 'error': error}
+
+
+def parse_accounts(stream):
+    """Read CSV rows; return ([(line, username, password)], [report rows of rejected lines])."""
+    accounts = []
+    rejected = []
+    seen = set()
+    for line, row in enumerate(csv.reader(stream), start=1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        username = cells[0]
+        password = row[1] if len(row) > 1 else ''  # passwords keep their spaces
+        if line == 1 and username.lower() == 'username':
+            continue
+        if not username or not password:
+            rejected.append(_report(line, username, 'malformed', 'username and password are required'))
+        elif len(username) > 100:
+            rejected.append(_report(line, username, 'malformed', 'username is longer than 100 characters'))
+        elif username in seen:
+            rejected.append(_report(line, username, 'duplicate', 'listed more than once in the file'))
+        else:
+            seen.add(username)
+            accounts.append((line, username, password))
+    return accounts, rejected
+
+
+def existing_usernames(usernames):
+    """Return the subset of usernames that already have an account."""
+    taken = set()
+    for start in range(0, len(usernames), IN_CHUNK):
+        chunk = usernames[start:start + IN_CHUNK]
+        taken.update(db.session.scalars(db.select(User.username).where(User.username.in_(chunk))))
+    return taken
+
+
+def hash_passwords(passwords, workers=None, method=None, hasher=None):
+    """Hash passwords in order, in a process pool or one at a time on hasher.
+
+    hasher is a passwords.PasswordHasher; it hashes with its own method and may
+    raise HasherBusy.
+    """
+    if hasher is not None:
+        # One pool slot at a time, so the other workers stay free for logins
+        return [hasher.hash(password) for password in passwords]
+    hash_one = partial(generate_password_hash, method=method) if method else generate_password_hash
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < 2:
+        return [hash_one(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A few chunks per worker keeps pickling overhead low and the workers evenly loaded
+        return list(pool.map(hash_one, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def _insert(batch):
+    """Insert (report row, username, hash) tuples with one commit; one by one if the batch fails."""
+    try:
+        db.session.execute(insert(User), [{'username': username, 'password': hashed, 'role': 'student',
+                                           'is_active': True} for _, username, hashed in batch])
+        db.session.commit()
+        return
+    except SQLAlchemyError:
+        db.session.rollback()
+    # Someone created one of these usernames meanwhile: keep the rest of the batch
+    for entry, username, hashed in batch:
+        try:
+            db.session.add(User(username=username, password=hashed, role='student', is_active=True))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            entry.update(status='exists', error='username is already taken')
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            entry.update(status='failed', error=str(exc))
+
+
+def provision_students(stream, workers=None, batch_size=BATCH_SIZE, method=None, hasher=None, max_new=None):
+    """Create a student account for every new row in stream.
+
+    Must run in an app context. Returns (report rows in file order, summary dict);
+    method overrides the password hash method (PASSWORD_HASH_METHOD otherwise) and
+    hasher, when given, hashes instead of the process pool (see hash_passwords).
+    Raises ValueError before hashing anything if more than max_new accounts are new.
+    """
+    method = method or current_app.config['PASSWORD_HASH_METHOD']
+    started = time.perf_counter()
+    accounts, report = parse_accounts(stream)
+
+    taken = existing_usernames([username for _, username, _ in accounts])
+    new = []
+    for line, username, password in accounts:
+        if username in taken:
+            report.append(_report(line, username, 'exists', 'username is already taken'))
+        else:
+            new.append((line, username, password))
+    if max_new is not None and len(new) > max_new:
+        raise ValueError(f"{len(new)} new accounts, at most {max_new} per upload; "
+                         "create larger lists with 'flask provision-students'")
+
+    hash_started = time.perf_counter()
+    hashes = hash_passwords([password for _, _, password in new], workers=workers, method=method, hasher=hasher)
+    hash_seconds = time.perf_counter() - hash_started
+
+    db_started = time.perf_counter()
+    created = [(_report(line, username, 'created'), username, hashed)
+               for (line, username, _), hashed in zip(new, hashes)]
+    for start in range(0, len(created), batch_size):
+        _insert(created[start:start + batch_size])
+    db_seconds = time.perf_counter() - db_started
+
+    report.extend(entry for entry, _, _ in created)
+    report.sort(key=lambda entry: entry['line'])
+    elapsed = time.perf_counter() - started
+    count = sum(1 for entry in report if entry['status'] == 'created')
+    summary = {
+        'rows': len(report),
+        'created': count,
+        'rejected': len(report) - count,
+        'hash_seconds': round(hash_seconds, 3),
+        'hashes_per_second': round(len(hashes) / hash_seconds, 1) if hash_seconds else None,
+        'db_seconds': round(db_seconds, 3),
+        'elapsed_seconds': round(elapsed, 3),
+        'users_per_second': round(count / elapsed, 1) if elapsed else None,
+    }
+    return report, summary
+
+
+def write_report(report, fh):
+    writer = csv.DictWriter(fh, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(report)
@@ -0,0 +1,121 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from models import db, Question
+
+ANSWER_KEY_CACHE_SIZE = 256
+QUIZ_PAGE_CACHE_SIZE = 64
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'maxsize': self.maxsize,
+                    'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._data)
+
+
+# --- Answer keys ---
+# Entries are keyed by (quiz_id, quiz.version), so any edit to the quiz makes old entries
+# unreachable and the LRU ages them out.
+
+# question_ids and correct are aligned: correct[i] is the letter for question_ids[i]
+AnswerKey = namedtuple('AnswerKey', 'question_ids correct')
+
+answer_keys = LRUCache(ANSWER_KEY_CACHE_SIZE)
+
+
+def compile_answer_key(quiz_id):
+    rows = (db.session.query(Question.id, Question.correct)
+            .filter(Question.quiz_id == quiz_id)
+            .order_by(Question.id)
+            .all())
+    return AnswerKey(
+        question_ids=tuple(qid for qid, _ in rows),
+        correct=''.join((correct or '').strip().upper()[:1] or '-' for _, correct in rows)
+    )
+
+
+def get_answer_key(quiz):
+    """Return the compiled answer key for the current version of quiz."""
+    cache_key = (quiz.id, quiz.version)
+    key = answer_keys.get(cache_key)
+    if key is None:
+        key = compile_answer_key(quiz.id)
+        answer_keys.put(cache_key, key)
+    return key
+
+
+def grade_answers(key, form):
+    """Grade submitted form values against key; return (score, {question_id: answer})."""
+    score = 0
+    student_answers = {}
+    for qid, correct in zip(key.question_ids, key.correct):
+        answer = form.get(str(qid))
+        student_answers[qid] = answer  # keep user's answer for review
+        if answer and answer.strip().upper() == correct:
+            score += 1
+    return score, student_answers
+
+
+# --- Rendered quiz pages ---
+# Only the shared question body is cached; the layout around it (session, flashes)
+# is still rendered per request.
+quiz_pages = LRUCache(QUIZ_PAGE_CACHE_SIZE)
+
+
+def get_quiz_page(quiz, render):
+    """Return the rendered quiz body for the current version of quiz, calling render(quiz) on a miss."""
+    cache_key = (quiz.id, quiz.version)
+    html = quiz_pages.get(cache_key)
+    if html is None:
+        html = render(quiz)
+        quiz_pages.put(cache_key, html)
+    return html
+
+
+# --- Question orders ---
+# (quiz_id, version) -> tuple of question ids, the order packed answers are stored in
+# (see answers.py). A version's order never changes, so entries never go stale.
+question_orders = LRUCache(ANSWER_KEY_CACHE_SIZE)
+
+
+def cache_stats():
+    return {'answer_keys': answer_keys.stats(), 'quiz_pages': quiz_pages.stats(),
+            'question_orders': question_orders.stats()}
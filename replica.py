@@ -0,0 +1,76 @@
+"""Read/write splitting between the primary database and an optional replica.
+
+When READ_REPLICA_URL is set it becomes the 'replica' bind. Routes decorated
+with @read_replica send their SELECTs there; everything else, and every write,
+goes to the primary. A request stays on the primary when
+
+  * the user wrote something in the last READ_YOUR_WRITES_SECONDS, so e.g.
+    the results page right after a submission shows the new attempt;
+  * it carries ?primary=1 or an "X-Read-Primary: 1" header;
+  * the view called use_primary() before querying.
+"""
+import time
+from functools import wraps
+from flask import g, request, session, has_request_context, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = 'replica'
+
+
+def read_replica(func):
+    """Mark a read-only view whose queries may be served by the replica."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        g.read_replica = True
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def use_primary():
+    """Pin the rest of the current request to the primary."""
+    g.read_replica = False
+
+
+def remember_write():
+    """Record that this request wrote, so the user reads from the primary for a while."""
+    if has_request_context():
+        g.wrote_primary = True
+
+
+def reads_from_replica():
+    if not has_request_context() or not g.get('read_replica'):
+        return False
+    if REPLICA_BIND not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return False
+    if request.args.get('primary') == '1' or request.headers.get('X-Read-Primary') == '1':
+        return False
+    return session.get('primary_until', 0) <= time.time()
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and isinstance(clause, Select) and reads_from_replica():
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    remember_write()
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _after_execute(orm_execute_state):
+    # Bulk inserts and SQL updates (e.g. the stats rollups) don't go through a flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        remember_write()
+
+
+def init_replica(app):
+    @app.after_request
+    def pin_to_primary_after_write(response):
+        if g.get('wrote_primary'):
+            session['primary_until'] = time.time() + app.config['READ_YOUR_WRITES_SECONDS']
+        return response
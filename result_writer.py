@@ -0,0 +1,136 @@
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+from db_utils import add_result, add_results_bulk
+from models import db
+
+_STOP = object()
+
+
+class ResultWriter:
+    """Group-commit writer for quiz submissions.
+
+    submit() enqueues a graded attempt and returns immediately; a background thread
+    inserts queued attempts in batches of up to batch_size rows, or whatever arrived
+    within max_delay_ms, and commits each batch once. When the queue is full or the
+    writer is stopped, submit() falls back to a synchronous add_result().
+    """
+
+    def __init__(self, app, batch_size=200, max_delay_ms=50, max_queue=5000):
+        self.app = app
+        self.batch_size = batch_size
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.written = 0
+        self.sync_writes = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self._start()
+
+    def _start(self):
+        # Caller holds _lock
+        if self._thread is None and not self._stopped:
+            # Started lazily so a pre-forking server doesn't fork a live thread
+            self._thread = threading.Thread(target=self._run, name='result-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def submit(self, student_id, quiz_id, score, total, quiz_version=None, answers=None):
+        row = (student_id, quiz_id, score, total, datetime.utcnow(), quiz_version, answers)
+        # Checked and enqueued under the lock, so a row is either queued ahead of
+        # stop()'s sentinel (and drained) or written synchronously below
+        with self._lock:
+            if not self._stopped:
+                self._start()
+                try:
+                    self._queue.put_nowait(row)
+                    return
+                except queue.Full:
+                    pass
+        # Overflow or shutdown: write it in the request like the synchronous mode does
+        self.sync_writes += 1
+        add_result(*row)
+
+    def flush(self):
+        """Block until every submitted row has been committed (used by tests)."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self):
+        """Drain the queue, commit what is left and stop the thread."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self):
+        return {'queued': self._queue.qsize(), 'batches': self.batches,
+                'written': self.written, 'sync_writes': self.sync_writes}
+
+    # --- Worker thread ---
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+        # Anything submitted while stopping is written before the thread exits
+        leftovers = []
+        while True:
+            try:
+                leftovers.append(self._queue.get_nowait())
+                self._queue.task_done()
+            except queue.Empty:
+                break
+        leftovers = [row for row in leftovers if row is not _STOP]
+        if leftovers:
+            self._write(leftovers)
+
+    def _write(self, batch):
+        with self.app.app_context():
+            try:
+                add_results_bulk(batch)
+                self.batches += 1
+                self.written += len(batch)
+                return
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception("Batched result write failed, retrying %d rows one by one", len(batch))
+            # One bad row must not lose the whole batch
+            for row in batch:
+                try:
+                    add_result(*row)
+                    self.written += 1
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Could not store result %r", row)
@@ -1,23 +1,32 @@
-from app import app
 from models import db
 from db_utils import create_user, add_quiz, Question
 
-with app.app_context():
-    # Create default users
-    create_user('admin', 'admin', 'admin')
-    create_user('student', 'student', 'student')
 
-    # Create sample quiz
-    quiz = add_quiz('Sample Quiz', 'This is a test quiz.')
-    if quiz:
-        q1 = Question(
-            quiz_id=quiz.id,
-            text="What is 2 + 2?",
-            choice_a="3",
-            choice_b="4",
-            choice_c="5",
-            choice_d="6",
-            correct="B"
-        )
-        db.session.add(q1)
-        db.session.commit()
+def seed(app):
+    from werkzeug.security import generate_password_hash
+
+    with app.app_context():
+        # Create default users (passwords are hashed, as the login route expects)
+        create_user('admin', generate_password_hash('admin'), 'admin')
+        create_user('student', generate_password_hash('student'), 'student')
+
+        # Create sample quiz
+        quiz = add_quiz('Sample Quiz', 'This is a test quiz.')
+        if quiz:
+            q1 = Question(
+                quiz_id=quiz.id,
+                text="What is 2 + 2?",
+                choice_a="3",
+                choice_b="4",
+                choice_c="5",
+                choice_d="6",
+                correct="B"
+            )
+            db.session.add(q1)
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    from app import create_app
+
+    seed(create_app())
@@ -0,0 +1,65 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Preview functionality
+    const previewBtn = document.getElementById('previewBtn');
+    const previewModal = new bootstrap.Modal(document.getElementById('previewModal'));
+    const revealCorrectBtn = document.getElementById('revealCorrectBtn');
+    const correctAnswerAlert = document.getElementById('correctAnswerAlert');
+
+    previewBtn.addEventListener('click', function () {
+        // Update preview with current form values
+        document.getElementById('previewQuestion').textContent =
+            document.getElementById('text').value || 'Question text will appear here';
+
+        document.getElementById('previewChoiceA').textContent =
+            document.getElementById('choice_a').value || 'Option A text';
+
+        document.getElementById('previewChoiceB').textContent =
+            document.getElementById('choice_b').value || 'Option B text';
+
+        document.getElementById('previewChoiceC').textContent =
+            document.getElementById('choice_c').value || 'Option C text';
+
+        document.getElementById('previewChoiceD').textContent =
+            document.getElementById('choice_d').value || 'Option D text';
+
+        // Reset correct answer display
+        correctAnswerAlert.classList.add('d-none');
+        document.querySelectorAll('input[name="previewAnswer"]').forEach(radio => {
+            radio.checked = false;
+        });
+
+        // Show modal
+        previewModal.show();
+    });
+
+    revealCorrectBtn.addEventListener('click', function () {
+        const correctAnswer = document.getElementById('correct').value;
+        if (correctAnswer) {
+            document.getElementById('correctAnswerText').textContent =
+                document.getElementById(`choice_${correctAnswer.toLowerCase()}`).value || `Option ${correctAnswer}`;
+            correctAnswerAlert.classList.remove('d-none');
+
+            // Check the correct radio button
+            document.getElementById(`preview${correctAnswer}`).checked = true;
+        } else {
+            alert('Please select a correct answer first');
+        }
+    });
+
+    // Form validation
+    const form = document.getElementById('questionForm');
+    form.addEventListener('submit', function (e) {
+        const correctAnswer = document.getElementById('correct').value;
+        if (!correctAnswer) {
+            e.preventDefault();
+            alert('Please select the correct answer');
+            document.getElementById('correct').focus();
+        }
+    });
+
+    // Add animation to form elements
+    const formElements = document.querySelectorAll('.form-control, .btn');
+    formElements.forEach((element, index) => {
+        element.style.animationDelay = `${index * 0.05}s`;
+    });
+});
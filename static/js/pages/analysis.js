@@ -0,0 +1,184 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Initialize performance chart
+    const canvas = document.getElementById('performanceChart');
+    const ctx = canvas.getContext('2d');
+    const performanceChart = new Chart(ctx, {
+        type: 'doughnut',
+        data: {
+            labels: ['Excellent', 'Good', 'Needs Improvement'],
+            datasets: [{
+                data: JSON.parse(canvas.dataset.counts),
+    backgroundColor: [
+    'rgba(40, 167, 69, 0.8)',
+    'rgba(255, 193, 7, 0.8)',
+    'rgba(220, 53, 69, 0.8)'
+],
+    borderColor: [
+    'rgba(40, 167, 69, 1)',
+    'rgba(255, 193, 7, 1)',
+    'rgba(220, 53, 69, 1)'
+],
+    borderWidth: 1
+            }]
+        },
+    options: {
+    cutout: '70%',
+    plugins: {
+        legend: {
+            position: 'bottom',
+            labels: {
+                usePointStyle: true,
+                padding: 20
+            }
+        }
+    },
+    animation: {
+        animateScale: true,
+        animateRotate: true
+    }
+}
+    });
+
+// Results table: keyset-paginated pages fetched from the server
+const searchInput = document.getElementById('searchInput');
+const quizFilter = document.getElementById('quizFilter');
+const dateFrom = document.getElementById('dateFrom');
+const dateTo = document.getElementById('dateTo');
+const tbody = document.getElementById('resultsTable').getElementsByTagName('tbody')[0];
+const loadMore = document.getElementById('loadMore');
+const shown = document.getElementById('resultsShown');
+let nextCursor = null;
+let request = 0;
+
+function badgeClass(pct) {
+    return pct >= 80 ? 'bg-success' : (pct >= 50 ? 'bg-warning' : 'bg-danger');
+}
+
+function cell(className, text) {
+    const td = document.createElement('td');
+    td.className = className;
+    if (text !== undefined) td.textContent = text;
+    return td;
+}
+
+function appendRow(r) {
+    const tr = document.createElement('tr');
+    const quiz = cell('ps-4 fw-bold', r.quiz);
+    quiz.setAttribute('data-quiz-id', r.quiz_id);
+    tr.appendChild(quiz);
+    tr.appendChild(cell('', r.student || ''));
+
+    const score = cell('');
+    const badge = document.createElement('span');
+    badge.className = 'badge ' + badgeClass(r.percentage) + ' rounded-pill';
+    badge.textContent = r.score + '/' + r.total;
+    score.appendChild(badge);
+    tr.appendChild(score);
+
+    const pct = cell('');
+    const progress = document.createElement('div');
+    progress.className = 'progress';
+    progress.style.height = '6px';
+    progress.style.width = '80px';
+    const bar = document.createElement('div');
+    bar.className = 'progress-bar ' + badgeClass(r.percentage);
+    bar.setAttribute('role', 'progressbar');
+    bar.style.width = r.percentage + '%';
+    progress.appendChild(bar);
+    const label = document.createElement('small');
+    label.className = 'text-muted';
+    label.textContent = r.percentage.toFixed(1) + '%';
+    pct.appendChild(progress);
+    pct.appendChild(label);
+    tr.appendChild(pct);
+
+    const date = cell('text-end pe-4');
+    const small = document.createElement('small');
+    small.className = 'text-muted';
+    small.textContent = r.timestamp;
+    date.appendChild(small);
+    tr.appendChild(date);
+    tbody.appendChild(tr);
+}
+
+function loadPage(reset) {
+    const params = new URLSearchParams();
+    if (searchInput.value.trim()) params.set('student', searchInput.value.trim());
+    if (quizFilter.value) params.set('quiz_id', quizFilter.value);
+    if (dateFrom.value) params.set('from', dateFrom.value);
+    if (dateTo.value) params.set('to', dateTo.value);
+    if (!reset && nextCursor) params.set('after', nextCursor);
+    const current = ++request;
+
+    fetch(tbody.dataset.url + '?' + params.toString(), { credentials: 'same-origin' })
+        .then(response => response.json())
+        .then(page => {
+            if (current !== request) return;  // a newer filter change superseded this page
+            if (reset) tbody.innerHTML = '';
+            (page.results || []).forEach(appendRow);
+            nextCursor = page.next;
+            loadMore.style.display = nextCursor ? '' : 'none';
+            shown.textContent = tbody.getElementsByTagName('tr').length;
+        });
+}
+
+let debounce = null;
+function filterResults() {
+    clearTimeout(debounce);
+    debounce = setTimeout(() => loadPage(true), 250);
+}
+
+searchInput.addEventListener('keyup', filterResults);
+quizFilter.addEventListener('change', filterResults);
+dateFrom.addEventListener('change', filterResults);
+dateTo.addEventListener('change', filterResults);
+loadMore.addEventListener('click', () => loadPage(false));
+loadPage(true);
+
+// Item analysis: difficulty, discrimination and choice rates of the chosen quiz
+const itemQuiz = document.getElementById('itemQuiz');
+const itemBody = document.getElementById('itemTable').getElementsByTagName('tbody')[0];
+const itemSummary = document.getElementById('itemSummary');
+
+function rate(value) {
+    return value === null ? '–' : (value * 100).toFixed(1) + '%';
+}
+
+function loadItems() {
+    itemBody.innerHTML = '';
+    itemSummary.textContent = '';
+    if (!itemQuiz.value) return;
+    fetch(itemQuiz.dataset.url.replace(/0$/, itemQuiz.value), { credentials: 'same-origin' })
+        .then(response => response.json())
+        .then(analysis => {
+            itemSummary.textContent = analysis.attempts + ' attempts · KR-20 ' +
+                (analysis.kr20 === null ? '–' : analysis.kr20.toFixed(2));
+            analysis.items.forEach((item, index) => {
+                const tr = document.createElement('tr');
+                tr.appendChild(cell('ps-4 fw-bold', index + 1));
+                tr.appendChild(cell('', item.text.length > 80 ? item.text.slice(0, 80) + '…' : item.text));
+                tr.appendChild(cell('', item.correct));
+                const p = item.p_value;
+                tr.appendChild(cell(p !== null && (p < 0.2 || p > 0.9) ? 'text-warning fw-bold' : '',
+                                    p === null ? '–' : p.toFixed(2)));
+                const d = item.discrimination;
+                tr.appendChild(cell(d !== null && d < 0.2 ? 'text-danger fw-bold' : '',
+                                    d === null ? '–' : d.toFixed(2)));
+                ['A', 'B', 'C', 'D'].forEach(letter => {
+                    tr.appendChild(cell(letter === item.correct ? 'text-success fw-bold' : '',
+                                        rate(item.choice_rates[letter])));
+                });
+                tr.appendChild(cell('pe-4', rate(item.choice_rates.blank)));
+                itemBody.appendChild(tr);
+            });
+        });
+}
+
+itemQuiz.addEventListener('change', loadItems);
+
+// Add animation to cards
+const cards = document.querySelectorAll('.card');
+cards.forEach((card, index) => {
+    card.style.animationDelay = `${index * 0.1}s`;
+});
+});
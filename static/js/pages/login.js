@@ -0,0 +1,23 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Toggle password visibility
+    const togglePassword = document.querySelector('.toggle-password');
+    const password = document.querySelector('#password');
+
+    if (togglePassword) {
+        togglePassword.addEventListener('click', function () {
+            const type = password.getAttribute('type') === 'password' ? 'text' : 'password';
+            password.setAttribute('type', type);
+
+            // Toggle eye icon
+            const icon = this.querySelector('i');
+            icon.classList.toggle('fa-eye');
+            icon.classList.toggle('fa-eye-slash');
+        });
+    }
+
+    // Add animation to form elements
+    const formElements = document.querySelectorAll('.form-control, .btn');
+    formElements.forEach((element, index) => {
+        element.style.animationDelay = `${index * 0.05}s`;
+    });
+});
@@ -0,0 +1,96 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Toggle password visibility
+    const togglePassword = document.querySelector('.toggle-password');
+    const toggleConfirmPassword = document.querySelector('.toggle-confirm-password');
+    const password = document.querySelector('#password');
+    const confirmPassword = document.querySelector('#confirmPassword');
+    const confirmMessage = document.querySelector('.confirm-message');
+    const progressBar = document.querySelector('.progress-bar');
+    const strengthText = document.querySelector('.password-strength-text');
+
+    // Toggle main password visibility
+    if (togglePassword) {
+        togglePassword.addEventListener('click', function () {
+            const type = password.getAttribute('type') === 'password' ? 'text' : 'password';
+            password.setAttribute('type', type);
+
+            // Toggle eye icon
+            const icon = this.querySelector('i');
+            icon.classList.toggle('fa-eye');
+            icon.classList.toggle('fa-eye-slash');
+        });
+    }
+
+    // Toggle confirm password visibility
+    if (toggleConfirmPassword) {
+        toggleConfirmPassword.addEventListener('click', function () {
+            const type = confirmPassword.getAttribute('type') === 'password' ? 'text' : 'password';
+            confirmPassword.setAttribute('type', type);
+
+            // Toggle eye icon
+            const icon = this.querySelector('i');
+            icon.classList.toggle('fa-eye');
+            icon.classList.toggle('fa-eye-slash');
+        });
+    }
+
+    // Password strength indicator
+    if (password) {
+        password.addEventListener('input', function () {
+            const val = password.value;
+            let strength = 0;
+
+            if (val.length > 0) {
+                // Length check
+                if (val.length > 6) strength += 20;
+                if (val.length > 10) strength += 20;
+
+                // Character variety checks
+                if (/[A-Z]/.test(val)) strength += 20;
+                if (/[0-9]/.test(val)) strength += 20;
+                if (/[^A-Za-z0-9]/.test(val)) strength += 20;
+
+                // Update progress bar
+                progressBar.style.width = strength + '%';
+
+                // Update color and text based on strength
+                if (strength < 40) {
+                    progressBar.className = 'progress-bar bg-danger';
+                    strengthText.textContent = 'Weak password';
+                    strengthText.className = 'password-strength-text text-danger';
+                } else if (strength < 80) {
+                    progressBar.className = 'progress-bar bg-warning';
+                    strengthText.textContent = 'Medium strength';
+                    strengthText.className = 'password-strength-text text-warning';
+                } else {
+                    progressBar.className = 'progress-bar bg-success';
+                    strengthText.textContent = 'Strong password';
+                    strengthText.className = 'password-strength-text text-success';
+                }
+            } else {
+                progressBar.style.width = '0%';
+                strengthText.textContent = 'Password strength';
+                strengthText.className = 'password-strength-text text-muted';
+            }
+        });
+    }
+
+    // Password confirmation check
+    if (confirmPassword) {
+        confirmPassword.addEventListener('input', function () {
+            if (password.value !== confirmPassword.value) {
+                confirmMessage.style.display = 'block';
+                confirmPassword.classList.add('is-invalid');
+            } else {
+                confirmMessage.style.display = 'none';
+                confirmPassword.classList.remove('is-invalid');
+            }
+        });
+    }
+
+    // Add animation to form elements
+    const formElements = document.querySelectorAll('.form-control, .btn');
+    formElements.forEach((element, index) => {
+        element.style.animationDelay = `${index * 0.05}s`;
+    });
+});
@@ -0,0 +1,7 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Add animation to questions
+    const questions = document.querySelectorAll('.question-review');
+    questions.forEach((question, index) => {
+        question.style.animationDelay = `${index * 0.1}s`;
+    });
+});
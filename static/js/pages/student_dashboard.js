@@ -0,0 +1,13 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Add animation to cards
+    const cards = document.querySelectorAll('.card');
+    cards.forEach((card, index) => {
+        card.style.animationDelay = `${index * 0.1}s`;
+    });
+
+    // Add animation to stats
+    const stats = document.querySelectorAll('.dashboard-stat');
+    stats.forEach((stat, index) => {
+        stat.style.animationDelay = `${index * 0.15}s`;
+    });
+});
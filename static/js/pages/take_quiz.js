@@ -0,0 +1,105 @@
+document.addEventListener('DOMContentLoaded', function () {
+    const questions = document.querySelectorAll('.question-card');
+    const prevBtn = document.getElementById('prevBtn');
+    const nextBtn = document.getElementById('nextBtn');
+    const submitBtn = document.getElementById('submitBtn');
+    const progressBar = document.getElementById('quizProgress');
+    const currentQuestionElement = document.getElementById('currentQuestion');
+    const progressText = document.getElementById('progressText');
+    const timerElement = document.getElementById('timer');
+
+    let currentQuestion = 1;
+    let startTime = new Date();
+    let timerInterval;
+
+    // Initialize timer
+    function startTimer() {
+        timerInterval = setInterval(function () {
+            const now = new Date();
+            const diff = Math.floor((now - startTime) / 1000);
+            const minutes = Math.floor(diff / 60).toString().padStart(2, '0');
+            const seconds = (diff % 60).toString().padStart(2, '0');
+            timerElement.textContent = `${minutes}:${seconds}`;
+        }, 1000);
+    }
+
+    // Update progress bar
+    function updateProgress() {
+        const progress = ((currentQuestion - 1) / questions.length) * 100;
+        progressBar.style.width = `${progress}%`;
+        currentQuestionElement.textContent = currentQuestion;
+    }
+
+    // Show specific question
+    function showQuestion(index) {
+        questions.forEach((question, i) => {
+            question.style.display = (i + 1 === index) ? 'block' : 'none';
+        });
+
+        // Update button visibility
+        prevBtn.style.display = (index > 1) ? 'block' : 'none';
+        nextBtn.style.display = (index < questions.length) ? 'block' : 'none';
+        submitBtn.style.display = (index === questions.length) ? 'block' : 'none';
+
+        updateProgress();
+    }
+
+    // Navigation handlers
+    nextBtn.addEventListener('click', function () {
+        // Validate current question has an answer
+        const currentQuestionInputs = questions[currentQuestion - 1].querySelectorAll('input[type="radio"]');
+        const isAnswered = Array.from(currentQuestionInputs).some(input => input.checked);
+
+        if (!isAnswered) {
+            alert('Please select an answer before proceeding to the next question.');
+            return;
+        }
+
+        if (currentQuestion < questions.length) {
+            currentQuestion++;
+            showQuestion(currentQuestion);
+        }
+    });
+
+    prevBtn.addEventListener('click', function () {
+        if (currentQuestion > 1) {
+            currentQuestion--;
+            showQuestion(currentQuestion);
+        }
+    });
+
+    // Keyboard navigation
+    document.addEventListener('keydown', function (e) {
+        if (e.key === 'ArrowRight') {
+            nextBtn.click();
+        } else if (e.key === 'ArrowLeft') {
+            prevBtn.click();
+        }
+    });
+
+    // Form submission confirmation
+    document.getElementById('quizForm').addEventListener('submit', function (e) {
+        const unanswered = Array.from(questions).some((question, index) => {
+            const inputs = question.querySelectorAll('input[type="radio"]');
+            return Array.from(inputs).every(input => !input.checked);
+        });
+
+        if (unanswered) {
+            if (!confirm('You have unanswered questions. Are you sure you want to submit?')) {
+                e.preventDefault();
+            }
+        }
+
+        // Stop timer on submit
+        clearInterval(timerInterval);
+    });
+
+    // Start timer and initialize
+    startTimer();
+    showQuestion(1);
+
+    // Add animation to questions
+    questions.forEach((question, index) => {
+        question.style.animationDelay = `${index * 0.1}s`;
+    });
+});
@@ -0,0 +1,58 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Preview functionality
+    const previewBtn = document.getElementById('previewBtn');
+    const previewModal = new bootstrap.Modal(document.getElementById('previewModal'));
+
+    previewBtn.addEventListener('click', function () {
+        // Update preview with current form values
+        document.getElementById('previewQuestion').textContent =
+            document.getElementById('text').value || 'Question text will appear here';
+
+        document.getElementById('previewChoiceA').textContent =
+            document.getElementById('choice_a').value || 'Option A text';
+
+        document.getElementById('previewChoiceB').textContent =
+            document.getElementById('choice_b').value || 'Option B text';
+
+        document.getElementById('previewChoiceC').textContent =
+            document.getElementById('choice_c').value || 'Option C text';
+
+        document.getElementById('previewChoiceD').textContent =
+            document.getElementById('choice_d').value || 'Option D text';
+
+        // Check the correct radio button based on selection
+        const correctAnswer = document.getElementById('correct').value;
+        document.querySelectorAll('input[name="previewAnswer"]').forEach(radio => {
+            radio.checked = (radio.value === correctAnswer);
+        });
+
+        // Update correct answer text
+        document.querySelector('.alert strong').textContent = correctAnswer;
+
+        // Show modal
+        previewModal.show();
+    });
+
+    // Add animation to form elements
+    const formElements = document.querySelectorAll('.form-control, .btn');
+    formElements.forEach((element, index) => {
+        element.style.animationDelay = `${index * 0.05}s`;
+    });
+
+    // Highlight the correct answer when the select changes
+    document.getElementById('correct').addEventListener('change', function () {
+        // Remove all correct badges
+        document.querySelectorAll('.answer-option .badge.bg-success').forEach(badge => {
+            badge.remove();
+        });
+
+        // Add correct badge to the selected option
+        const selectedOption = this.value;
+        const optionElement = document.querySelector(`.answer-option:nth-child(${selectedOption.charCodeAt(0) - 64})`);
+        if (optionElement) {
+            const label = optionElement.querySelector('label');
+            label.insertAdjacentHTML('afterend',
+                '<span class="badge bg-success ms-2"><i class="fas fa-check me-1"></i>Correct</span>');
+        }
+    });
+});
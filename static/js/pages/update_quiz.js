@@ -0,0 +1,35 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // Initialize tooltips
+    var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'))
+    var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+        return new bootstrap.Tooltip(tooltipTriggerEl)
+    });
+
+    // Add character counter for description
+    const description = document.getElementById('description');
+    if (description) {
+        const counter = document.createElement('div');
+        counter.className = 'form-text text-end';
+        counter.innerHTML = '<span id="char-count">0</span>/250 characters';
+        description.parentNode.parentNode.appendChild(counter);
+
+        description.addEventListener('input', function () {
+            document.getElementById('char-count').textContent = this.value.length;
+
+            if (this.value.length > 250) {
+                counter.classList.add('text-danger');
+            } else {
+                counter.classList.remove('text-danger');
+            }
+        });
+
+        // Trigger initial count
+        description.dispatchEvent(new Event('input'));
+    }
+
+    // Add animation to cards
+    const cards = document.querySelectorAll('.card');
+    cards.forEach((card, index) => {
+        card.style.animationDelay = `${index * 0.1}s`;
+    });
+});
@@ -0,0 +1,169 @@
+from collections import defaultdict
+from sqlalchemy import func, insert, update, bindparam, literal
+from sqlalchemy.sql import ClauseElement
+from models import db, Quiz, Result, QuizStats, StudentQuizStats
+from analytics import score_pct, count_where
+
+COUNTERS = ('attempts', 'score_sum', 'total_sum', 'pct_sum',
+            'excellent_count', 'good_count', 'fair_count', 'poor_count')
+
+
+def band_of(pct):
+    if pct >= 80:
+        return 'excellent_count'
+    elif pct >= 60:
+        return 'good_count'
+    elif pct >= 50:
+        return 'fair_count'
+    return 'poor_count'
+
+
+def result_deltas(score, total, sign=1):
+    # Contribution of one attempt to every rollup counter
+    score = score or 0
+    total = total or 0
+    pct = (score / total * 100) if total > 0 else 0
+    deltas = dict.fromkeys(COUNTERS, 0)
+    deltas.update(attempts=sign, score_sum=sign * score, total_sum=sign * total, pct_sum=sign * pct)
+    deltas[band_of(pct)] = sign
+    return deltas
+
+
+def _apply(model, key, deltas):
+    row = db.session.get(model, key)
+    if row is None:
+        # Two first attempts can both get here; the loser's commit fails on the primary
+        # key and db_utils runs its write again, which then takes the increment path
+        row = model(**key, **deltas)
+        db.session.add(row)
+        return row
+    pending = row in db.session.new
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        current = row.__dict__.get(name)
+        if pending or isinstance(current, ClauseElement):
+            # Stack onto a value that hasn't been flushed yet
+            setattr(row, name, current + delta)
+        else:
+            # Increment in SQL so concurrent writers don't lose updates
+            setattr(row, name, getattr(model, name) + delta)
+    return row
+
+
+# --- Write path (caller commits) ---
+def record_result(student_id, quiz_id, score, total, sign=1):
+    deltas = result_deltas(score, total, sign)
+    _apply(QuizStats, {'quiz_id': quiz_id}, deltas)
+    _apply(StudentQuizStats, {'student_id': student_id, 'quiz_id': quiz_id}, deltas)
+
+
+def record_results_bulk(rows):
+    """Add many (student_id, quiz_id, score, total) attempts to the rollups.
+
+    Deltas are summed per rollup row; missing rows are inserted and the others
+    incremented in SQL, one executemany each.
+    """
+    per_quiz = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    per_student = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for student_id, quiz_id, score, total in rows:
+        for name, delta in result_deltas(score, total).items():
+            per_quiz[quiz_id][name] += delta
+            per_student[(student_id, quiz_id)][name] += delta
+
+    db.session.flush()  # the statements below bypass the unit of work
+    _upsert(QuizStats, {(quiz_id,): deltas for quiz_id, deltas in per_quiz.items()})
+    _upsert(StudentQuizStats, per_student)
+
+
+# Keys per IN list, below SQL Server's 2100 parameters per statement
+UPSERT_CHUNK = 1000
+
+
+def _upsert(model, totals):
+    table = model.__table__
+    key_columns = [column.name for column in table.primary_key]
+    # Look keys up with IN on the most varied key column (student_id for one quiz),
+    # one query per value of the other columns
+    spread = max(range(len(key_columns)), key=lambda i: len({key[i] for key in totals}))
+    groups = defaultdict(list)
+    for key in totals:
+        groups[key[:spread] + key[spread + 1:]].append(key[spread])
+    other_columns = key_columns[:spread] + key_columns[spread + 1:]
+    existing = set()
+    for fixed, values in groups.items():
+        for start in range(0, len(values), UPSERT_CHUNK):
+            query = db.select(*[table.c[name] for name in key_columns]).where(
+                table.c[key_columns[spread]].in_(values[start:start + UPSERT_CHUNK]),
+                *[table.c[name] == value for name, value in zip(other_columns, fixed)])
+            existing.update(tuple(row) for row in db.session.execute(query))
+
+    new = [dict(zip(key_columns, key), **deltas) for key, deltas in totals.items() if key not in existing]
+    if new:
+        db.session.execute(insert(table), new)
+    changed = [{**{'k_' + name: value for name, value in zip(key_columns, key)},
+                **{'d_' + name: delta for name, delta in deltas.items()}}
+               for key, deltas in totals.items() if key in existing]
+    if changed:
+        db.session.execute(
+            update(table)
+            .where(*[table.c[name] == bindparam('k_' + name) for name in key_columns])
+            .values({name: table.c[name] + bindparam('d_' + name) for name in COUNTERS}),
+            changed
+        )
+
+
+def create_quiz_stats(quiz_id):
+    # Empty rollup row for a new quiz, so its first attempts only ever increment it
+    db.session.add(QuizStats(quiz_id=quiz_id, **dict.fromkeys(COUNTERS, 0)))
+
+
+def forget_quiz(quiz_id):
+    StudentQuizStats.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+    QuizStats.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+
+
+# --- Backfill ---
+def _rollup_select(*keys):
+    pct = score_pct()
+    return (
+        db.select(
+            *keys,
+            func.count(Result.id),
+            func.coalesce(func.sum(Result.score), 0),
+            func.coalesce(func.sum(Result.total), 0),
+            func.coalesce(func.sum(pct), 0),
+            count_where(pct >= 80),
+            count_where((pct >= 60) & (pct < 80)),
+            count_where((pct >= 50) & (pct < 60)),
+            count_where(pct < 50),
+        )
+        .join(Quiz, Quiz.id == Result.quiz_id)
+        .where(Quiz.archived_at.is_(None))
+        .group_by(*keys)
+    )
+
+
+def rebuild_stats():
+    """Recompute every rollup row from the Result table in one transaction."""
+    StudentQuizStats.query.delete(synchronize_session=False)
+    QuizStats.query.delete(synchronize_session=False)
+    db.session.execute(
+        insert(QuizStats).from_select(['quiz_id', *COUNTERS], _rollup_select(Result.quiz_id))
+    )
+    db.session.execute(
+        insert(StudentQuizStats).from_select(
+            ['student_id', 'quiz_id', *COUNTERS],
+            _rollup_select(Result.student_id, Result.quiz_id).where(Result.student_id.isnot(None))
+        )
+    )
+    # Quizzes without attempts keep the empty row add_quiz gives them
+    db.session.execute(
+        insert(QuizStats).from_select(
+            ['quiz_id', *COUNTERS],
+            db.select(Quiz.id, *[literal(0) for _ in COUNTERS])
+            .where(Quiz.archived_at.is_(None), Quiz.id.not_in(db.select(QuizStats.quiz_id)))
+        )
+    )
+    db.session.commit()
+    return QuizStats.query.count()
@@ -0,0 +1,179 @@
+"""Student pages: dashboard, taking a quiz, results and profile."""
+from flask import Blueprint, current_app, request, render_template, redirect, url_for, flash, session, abort
+from markupsafe import Markup
+from sqlalchemy.orm import joinedload
+from models import Result, db, User, Quiz, Question
+from db_utils import add_result
+from analytics import (
+    student_quiz_stats, student_summary, score_ratio, student_dashboard_rows, student_pages_version,
+    quiz_page_version
+)
+from auth import student_required
+from http_cache import conditional
+from replica import read_replica, remember_write
+from quiz_cache import get_answer_key, grade_answers, get_quiz_page
+from answers import pack_answers, record_question_order, decode_answers
+
+student = Blueprint('student', __name__, url_prefix='/student')
+
+
+@student.route('/dashboard')
+@student_required
+@read_replica
+@conditional(lambda: student_pages_version(session['user_id']))
+def student_dashboard():
+    # One grouped query: quizzes, their question counts and this student's rollup row
+    rows = student_dashboard_rows(session['user_id'])
+    quizzes = [quiz for quiz, _, _ in rows]
+    question_counts = {quiz.id: n for quiz, n, _ in rows}
+    attempts_per_quiz = {}
+    avg_score_per_quiz = {}
+
+    for quiz, _, row in rows:
+        attempts_per_quiz[quiz.id] = row.attempts if row else 0
+        avg_score_per_quiz[quiz.id] = score_ratio(row.score_sum, row.total_sum) if row else 0
+
+    # Overall average score across all attempts
+    stats = [row for _, _, row in rows if row]
+    overall_avg = score_ratio(sum(r.score_sum for r in stats), sum(r.total_sum for r in stats))
+    total_attempts = sum(attempts_per_quiz.values())
+    return render_template(
+        'student_dashboard.html',
+        quizzes=quizzes,
+        question_counts=question_counts,
+        attempts_per_quiz=attempts_per_quiz,
+        avg_score_per_quiz=avg_score_per_quiz,
+        overall_avg=overall_avg,
+        total_attempts = total_attempts
+    )
+
+
+
+@student.route('/take_quiz/<int:quiz_id>', methods=['GET', 'POST'])
+@student_required
+@conditional(quiz_page_version)
+def take_quiz(quiz_id):
+    quiz = Quiz.query.get_or_404(quiz_id)
+    if quiz.archived_at is not None:
+        abort(404)
+
+    if request.method == 'POST':
+        # Grade against the cached answer key; the Question table is only read on a cache miss
+        answer_key = get_answer_key(quiz)
+        score, student_answers = grade_answers(answer_key, request.form)
+        total = len(answer_key.question_ids)
+        quiz_version = quiz.version
+        answers = pack_answers(answer_key, student_answers)
+        record_question_order(quiz, answer_key)
+
+        # Save result in DB, or hand it to the group-commit writer during exam surges
+        result_writer = current_app.extensions.get('result_writer')
+        if result_writer is not None:
+            result_writer.submit(session['user_id'], quiz_id, score, total, quiz_version, answers)
+            remember_write()  # the writer commits later, outside this request
+        else:
+            add_result(session['user_id'], quiz_id, score, total, quiz_version=quiz_version, answers=answers)
+
+        flash(f'Quiz completed! Your score: {score}/{total}')
+        # Instead of redirecting, render review page immediately
+        return render_template(
+            'review_quiz.html',
+            quiz=quiz,
+            questions=quiz.questions,
+            student_answers=student_answers,
+            score=score,
+            total=total
+        )
+
+    # The question body is shared by every student, so render it once per quiz version
+    quiz_body = get_quiz_page(quiz, render_quiz_body)
+    return render_template('take_quiz.html', quiz=quiz, quiz_body=quiz_body)
+
+
+def render_quiz_body(quiz):
+    return Markup(render_template('_take_quiz_body.html', quiz=quiz))
+
+
+
+@student.route('/results')
+@student_required
+@read_replica
+@conditional(lambda: student_pages_version(session['user_id']))
+def student_results():
+    student_id = session['user_id']
+    results = (Result.query
+               .filter_by(student_id=student_id)
+               .join(Result.quiz)
+               .filter(Quiz.archived_at.is_(None))
+               .options(joinedload(Result.quiz))
+               .all())
+
+    # --- Summary cards come from the rollup, not from the rows above ---
+    summary = student_summary(list(student_quiz_stats(student_id).values()))
+
+    return render_template(
+        'student_results.html',
+        results=results,
+        **summary
+    )
+
+
+@student.route('/results/<int:result_id>/review')
+@student_required
+@read_replica
+def review_result(result_id):
+    result = (Result.query
+              .filter_by(id=result_id, student_id=session['user_id'])
+              .options(joinedload(Result.quiz))
+              .first_or_404())
+    if result.quiz.archived_at is not None:
+        abort(404)
+    student_answers = decode_answers(result)
+    if student_answers is None:
+        flash("⚠️ Answers were not recorded for this attempt.")
+        return redirect(url_for('student.student_results'))
+
+    # Questions deleted since the attempt are left out
+    questions = {q.id: q for q in Question.query.filter(Question.id.in_(list(student_answers)))}
+    return render_template(
+        'review_quiz.html',
+        quiz=result.quiz,
+        questions=[questions[qid] for qid in student_answers if qid in questions],
+        student_answers=student_answers,
+        score=result.score,
+        total=result.total
+    )
+
+
+@student.route('/update_profile', methods=['GET', 'POST'])
+@student_required
+def update_profile():
+    user = User.query.get_or_404(session['user_id'])
+
+    if request.method == 'POST':
+        new_username = request.form.get('username')
+        new_password = request.form.get('password')
+
+        if not new_username:
+            flash("⚠️ Username cannot be empty.")
+            return redirect(url_for('student.update_profile'))
+
+        # Check if username is taken by another user
+        existing_user = User.query.filter(User.username == new_username, User.id != user.id).first()
+        if existing_user:
+            flash("⚠️ Username already taken.")
+            return redirect(url_for('student.update_profile'))
+
+        user.username = new_username
+
+        # Update password only if provided
+        if new_password:
+            from passwords import hash_password
+
+            user.password = hash_password(new_password)
+
+        db.session.commit()
+        flash("✅ Profile updated successfully!")
+        return redirect(url_for('student.student_dashboard'))
+
+    return render_template('update_profile.html', user=user)
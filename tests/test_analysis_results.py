@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import login_as
+from db_utils import add_quiz, add_result
+
+
+@pytest.fixture
+def results(student, make_user):
+    """Seven results of alice and bob, five in Algebra and two in Physics; returns Algebra's id."""
+    alice, bob = student, make_user("bob")
+    algebra = add_quiz("Algebra", "")
+    physics = add_quiz("Physics", "")
+    start = datetime(2025, 3, 1, 9, 0)
+    same_time = start + timedelta(hours=5)
+    for i in range(7):
+        timestamp = same_time if i in (4, 5) else start + timedelta(hours=i)
+        add_result(alice.id if i % 2 else bob.id, algebra.id if i < 5 else physics.id, i, 10, timestamp=timestamp)
+    return algebra.id
+
+
+def fetch_all(client, **params):
+    seen, after = [], None
+    while True:
+        query = dict(params, limit=3, **({"after": after} if after else {}))
+        page = client.get("/admin/analysis/results", query_string=query).get_json()
+        seen.extend(page["results"])
+        after = page["next"]
+        if not after:
+            return seen
+
+
+def test_keyset_pages_cover_every_result_once_newest_first(app, client, admin, results):
+    login_as(client, admin)
+
+    rows = fetch_all(client)
+
+    assert len(rows) == 7
+    assert len({r["id"] for r in rows}) == 7
+    keys = [(r["timestamp"], r["id"]) for r in rows]
+    assert keys == sorted(keys, reverse=True)
+    assert {"quiz", "student", "percentage"} <= set(rows[0])
+
+
+def test_results_are_filtered_on_the_server(app, client, admin, results):
+    login_as(client, admin)
+
+    assert len(fetch_all(client, quiz_id=results)) == 5
+    assert {r["student"] for r in fetch_all(client, student="ali")} == {"alice"}
+    assert len(fetch_all(client, **{"from": "2025-03-01", "to": "2025-03-01"})) == 7
+    assert fetch_all(client, **{"from": "2025-03-02"}) == []
+    assert client.get("/admin/analysis/results?after=garbage").status_code == 400
+
+
+def test_analysis_page_no_longer_embeds_every_result(app, client, admin, results):
+    login_as(client, admin)
+
+    html = client.get("/admin/analysis").get_data(as_text=True)
+
+    assert "/admin/analysis/results" in html
+    assert "6/10" not in html
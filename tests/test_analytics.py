@@ -0,0 +1,66 @@
+import pytest
+
+from analytics import performance_summary, quiz_average_scores
+from db_utils import add_quiz, add_result
+from models import Quiz, Result
+
+# (score, total): an empty quiz, every band and its edges; 50-79% spans the good and fair rollup columns
+ATTEMPTS = [(0, 0), (10, 10), (8, 10), (79, 100), (60, 100), (59, 100), (50, 100), (49, 100), (0, 10)]
+
+
+def baseline_averages():
+    # The analysis page's original per-quiz loop over Quiz.results
+    averages = []
+    for q in Quiz.query.order_by(Quiz.id).all():
+        if q.results:
+            avg = sum((r.score / r.total * 100) for r in q.results if r.total > 0) / len(q.results)
+        else:
+            avg = 0
+        averages.append((q.title, round(avg, 2)))
+    return averages
+
+
+def baseline_summary():
+    # The analysis page's original loop over every Result
+    results = Result.query.all()
+    excellent_count = good_count = poor_count = 0
+    average_score = 0
+    if results:
+        total_percentage = 0
+        for r in results:
+            pct = (r.score / r.total * 100) if r.total > 0 else 0
+            total_percentage += pct
+            if pct >= 80:
+                excellent_count += 1
+            elif pct >= 50:
+                good_count += 1
+            else:
+                poor_count += 1
+        average_score = total_percentage / len(results) / 100
+    return {'total_results': len(results), 'excellent_count': excellent_count, 'good_count': good_count,
+            'poor_count': poor_count, 'average_score': average_score}
+
+
+def test_no_attempts_match_the_baseline(app, quiz):
+    assert [(q.title, avg) for q, avg in quiz_average_scores()] == baseline_averages() == [("Algebra", 0)]
+    assert performance_summary() == baseline_summary()
+
+
+def test_rollup_aggregates_match_the_baseline(app, make_user, student, quiz):
+    bob = make_user("bob")
+    other = add_quiz("Geometry", "Shapes")
+    add_quiz("Untaken", "")
+    for score, total in ATTEMPTS:
+        add_result(student.id, quiz.id, score, total)
+    for score, total in ATTEMPTS[::2]:
+        add_result(bob.id, other.id, score, total)
+    add_result(bob.id, other.id, 0, 0)  # a quiz with only empty attempts still counts them
+
+    averages = [(q.title, avg) for q, avg in quiz_average_scores()]
+    assert averages == [(title, pytest.approx(avg)) for title, avg in baseline_averages()]
+    assert averages[-1] == ("Untaken", 0)
+
+    summary = performance_summary()
+    expected = baseline_summary()
+    assert summary == dict(expected, average_score=pytest.approx(expected['average_score']))
+    assert (summary['excellent_count'], summary['good_count'], summary['poor_count']) == (3, 6, 6)
@@ -0,0 +1,62 @@
+import gzip
+import re
+
+from assets import AssetManifest, missing_vendor_assets, vendor_paths
+from http_cache import build_fingerprint
+
+
+def test_pages_link_fingerprinted_assets(client):
+    html = client.get("/login").get_data(as_text=True)
+
+    css = re.search(r'href="(/assets/css/app\.[0-9a-f]{12}\.css)"', html)
+    assert css is not None
+    assert re.search(r'src="/assets/js/pages/login\.[0-9a-f]{12}\.js"', html)
+
+    response = client.get(css.group(1))
+    assert response.status_code == 200
+    assert response.mimetype == "text/css"
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+
+def test_unhashed_asset_is_revalidated(client):
+    first = client.get("/assets/css/app.css")
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    second = client.get("/assets/css/app.css", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert client.get("/assets/css/missing.css").status_code == 404
+
+
+def test_html_is_gzipped_when_accepted(client):
+    plain = client.get("/login")
+    response = client.get("/login", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.headers.get("Content-Encoding") is None
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_static_changes_change_the_page_fingerprint(app, tmp_path):
+    (tmp_path / "app.css").write_text("body { color: red; }")
+    app.extensions["assets"] = AssetManifest(str(tmp_path))
+    before = build_fingerprint(app)
+    (tmp_path / "app.css").write_text("body { color: blue; }")
+    app.extensions["assets"] = AssetManifest(str(tmp_path))
+
+    assert build_fingerprint(app) != before
+
+
+def test_vendor_check_lists_missing_files(app, tmp_path):
+    assert missing_vendor_assets(str(tmp_path)) == vendor_paths()
+    for path in vendor_paths():
+        target = tmp_path.joinpath(*path.split("/"))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(b"/* vendored */")
+    assert missing_vendor_assets(str(tmp_path)) == []
+
+    app.static_folder = str(tmp_path)
+    assert "Vendored assets present" in app.test_cli_runner().invoke(args=["vendor-assets", "--check"]).output
+    (tmp_path / "vendor" / "chartjs" / "chart.umd.js").unlink()
+    result = app.test_cli_runner().invoke(args=["vendor-assets", "--check"])
+    assert result.exit_code == 1 and "vendor/chartjs/chart.umd.js" in result.output
@@ -0,0 +1,31 @@
+from db_utils import add_quiz, add_questions_bulk
+from models import Question
+
+
+def test_bulk_insert_reports_invalid_rows_and_keeps_the_rest(app):
+    quiz = add_quiz("Bank", "Imported")
+    rows = [(f"Question {i}", "a", "b", "c", "d", "b") for i in range(25)]
+    rows[3] = ("", "a", "b", "c", "d", "a")
+    rows[10] = {"text": "Mapping row", "choice_a": "x", "correct": "z"}
+
+    report = add_questions_bulk(quiz.id, rows, batch_size=10)
+
+    assert report.inserted == 23
+    assert [index for index, _ in report.errors] == [3, 10]
+    assert report.next_row == 25
+    assert Question.query.filter_by(quiz_id=quiz.id).count() == 23
+
+
+def test_bulk_insert_can_resume_from_next_row(app):
+    quiz = add_quiz("Bank", "Imported")
+    rows = [(f"Question {i}", "a", "b", "c", "d", "c") for i in range(12)]
+
+    first = add_questions_bulk(quiz.id, rows[:5], batch_size=2, commit_per_batch=True)
+    second = add_questions_bulk(quiz.id, rows, batch_size=2, commit_per_batch=True, start=first.next_row)
+
+    assert first.inserted + second.inserted == 12
+    assert Question.query.filter_by(quiz_id=quiz.id).count() == 12
+
+
+def test_bulk_insert_unknown_quiz(app):
+    assert add_questions_bulk(12345, [("Q", "a", "b", "c", "d", "a")]) is None
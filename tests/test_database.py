@@ -0,0 +1,38 @@
+from flask import Flask
+from sqlalchemy import text
+
+from config import Config
+from database import engine_options, init_database
+from models import db
+
+
+def config_for(uri, **overrides):
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    config.update(overrides, SQLALCHEMY_DATABASE_URI=uri)
+    return config
+
+
+def test_server_database_gets_pool_options():
+    options = engine_options(config_for("mssql+pyodbc://localhost/QuizDB?driver=ODBC+Driver+17+for+SQL+Server",
+                                        DB_POOL_SIZE=7))
+
+    assert options["pool_size"] == 7
+    assert options["pool_pre_ping"] is True
+    assert options["fast_executemany"] is True
+
+
+def test_in_memory_sqlite_gets_no_pool_options():
+    assert engine_options(config_for("sqlite://")) == {}
+
+
+def test_sqlite_file_connections_use_wal(tmp_path):
+    app = Flask(__name__)
+    app.config.update(config_for(f"sqlite:///{tmp_path / 'quiz.db'}", SQLITE_BUSY_TIMEOUT_MS=1234))
+    init_database(app)
+
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        db.engine.dispose()
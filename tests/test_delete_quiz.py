@@ -0,0 +1,59 @@
+from sqlalchemy import text
+
+from answers import record_question_order
+from db_utils import add_quiz, add_question, add_result, delete_quiz, purge_archived_quizzes
+from models import db, Quiz, Question, Result, QuizLayout, QuizStats, StudentQuizStats
+from quiz_cache import get_answer_key
+
+
+def make_quiz_with_results(student, title, attempts):
+    quiz = add_quiz(title, "")
+    add_question(quiz.id, "Q", "a", "b", "c", "d", "a")
+    record_question_order(quiz, get_answer_key(quiz))
+    for i in range(attempts):
+        add_result(student.id, quiz.id, i % 2, 1)
+    return quiz.id
+
+
+def enforce_foreign_keys():
+    # SQLite ignores REFERENCES unless asked to check them, like SQL Server always does
+    db.session.execute(text("PRAGMA foreign_keys = ON"))
+
+
+def test_delete_quiz_removes_dependent_rows(app, query_counter, student):
+    keep = make_quiz_with_results(student, "Keep", 3)
+    drop = make_quiz_with_results(student, "Drop", 30)
+
+    del query_counter[:]
+    assert delete_quiz(drop)
+
+    deletes = [s for s in query_counter if s.startswith("DELETE")]
+    assert len(deletes) <= 6  # one statement per table, not one per row
+    assert db.session.get(Quiz, drop) is None
+    assert Result.query.filter_by(quiz_id=drop).count() == 0
+    assert Question.query.filter_by(quiz_id=drop).count() == 0
+    assert db.session.get(QuizStats, drop) is None
+    assert Result.query.filter_by(quiz_id=keep).count() == 3
+
+
+def test_taken_quiz_is_deleted_with_foreign_keys_enforced(app, student):
+    enforce_foreign_keys()
+    drop = make_quiz_with_results(student, "Drop", 2)
+    archived = make_quiz_with_results(student, "Archived", 2)
+
+    assert delete_quiz(drop)
+    assert delete_quiz(archived, archive=True)
+    assert purge_archived_quizzes() == {archived: 2}
+    assert Quiz.query.count() == 0 and QuizLayout.query.count() == 0
+
+
+def test_archived_quiz_is_hidden_then_purged_in_chunks(app, student):
+    quiz_id = make_quiz_with_results(student, "Archive me", 12)
+
+    assert delete_quiz(quiz_id, archive=True)
+    assert db.session.get(Quiz, quiz_id).archived_at is not None
+    assert StudentQuizStats.query.filter_by(quiz_id=quiz_id).count() == 0
+
+    assert purge_archived_quizzes(chunk_size=5) == {quiz_id: 12}
+    assert db.session.get(Quiz, quiz_id) is None
+    assert Result.query.count() == 0
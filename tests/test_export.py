@@ -0,0 +1,54 @@
+import csv
+import gzip
+import io
+import json
+
+from conftest import login_as
+from db_utils import add_quiz, add_result
+from models import db, Quiz
+
+
+def add_attempts(student, quiz_id, count):
+    for i in range(count):
+        add_result(student.id, quiz_id, i % 5, 4)
+
+
+def test_csv_export_streams_every_result(app, client, admin, student):
+    quiz = add_quiz("Algebra, part 1", "")  # the comma must survive CSV quoting
+    add_attempts(student, quiz.id, 30)
+    login_as(client, admin)
+
+    response = client.get("/admin/export/results?format=csv")
+
+    assert response.is_streamed
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 30
+    assert rows[0]["quiz_title"] == "Algebra, part 1"
+    assert rows[0]["username"] == "alice"
+    assert "Accept-Encoding" in response.vary
+
+
+def test_jsonl_export_is_gzipped_when_accepted(app, client, admin, student, quiz):
+    add_attempts(student, quiz.id, 5)
+    login_as(client, admin)
+
+    response = client.get("/admin/export/results?format=jsonl", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(response.get_data()).decode().splitlines()
+    assert [json.loads(line)["score"] for line in lines] == [0, 1, 2, 3, 4]
+    assert "Accept-Encoding" in response.vary
+
+
+def test_export_includes_packed_answers(app, client, admin, student, quiz, questions):
+    first, second = questions
+    login_as(client, student)
+    client.post(f"/student/take_quiz/{quiz.id}", data={str(first.id): "B"})
+    login_as(client, admin)
+
+    response = client.get("/admin/export/results?format=jsonl")
+
+    row = json.loads(response.get_data(as_text=True))
+    assert row["question_ids"] == f"{first.id},{second.id}"
+    assert row["answers"] == "B-"
+    assert row["quiz_version"] == db.session.get(Quiz, quiz.id).version
@@ -0,0 +1,68 @@
+from conftest import login_as
+from db_utils import add_quiz, add_question, add_result, delete_quiz, update_question
+
+
+def test_unchanged_dashboard_is_not_rendered_again(app, client, query_counter, student, quiz):
+    login_as(client, student)
+    first = client.get("/student/dashboard")
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    del query_counter[:]
+    second = client.get("/student/dashboard", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.data == b""
+    assert len(query_counter) == 1  # only the version query, no aggregates
+
+
+def test_new_attempt_changes_the_etag(app, client, student, quiz):
+    login_as(client, student)
+    etag = client.get("/student/results").headers["ETag"]
+
+    add_result(student.id, quiz.id, 1, 1)
+    response = client.get("/student/results", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_quiz_edit_changes_the_etag(app, client, student, quiz, questions):
+    login_as(client, student)
+    etag = client.get(f"/student/take_quiz/{quiz.id}").headers["ETag"]
+    assert client.get(f"/student/take_quiz/{quiz.id}", headers={"If-None-Match": etag}).status_code == 304
+
+    update_question(questions[0].id, new_text="1 + 2?")
+
+    assert client.get(f"/student/take_quiz/{quiz.id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_recreated_quiz_does_not_match_the_deleted_quizs_etag(app, client, student, quiz, questions):
+    login_as(client, student)
+    url = f"/student/take_quiz/{quiz.id}"
+    etag = client.get(url).headers["ETag"]
+
+    delete_quiz(quiz.id)
+    other = add_quiz("Geometry", "Shapes")
+    add_question(other.id, "Sides of a triangle?", "2", "3", "4", "5", "b")
+    add_question(other.id, "Sides of a square?", "2", "3", "4", "5", "c")
+
+    # Same version as the deleted quiz, but a different quiz row
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 404
+    assert client.get(f"/student/take_quiz/{other.id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_etag_is_per_user(app, client, make_user, student, quiz):
+    other = make_user("bob")
+    login_as(client, student)
+    etag = client.get("/student/dashboard").headers["ETag"]
+
+    login_as(client, other)
+
+    assert client.get("/student/dashboard", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_other_logged_in_pages_are_not_stored(app, client, admin):
+    login_as(client, admin)
+
+    assert client.get("/admin").headers["Cache-Control"] == "private, no-store"
+    assert "Cache-Control" not in app.test_client().get("/login").headers  # nobody logged in
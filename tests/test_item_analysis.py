@@ -0,0 +1,64 @@
+import math
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from conftest import login_as
+from item_analysis import NOT_PRESENTED, analyses, item_statistics
+
+
+def test_statistics_match_the_textbook_formulas():
+    rng = np.random.default_rng(7)
+    matrix = rng.integers(0, 5, size=(300, 6), dtype=np.uint8)
+    matrix[:40, 2] = NOT_PRESENTED  # an older quiz version without this question
+    correct = "ABCDAB"
+
+    analysis = item_statistics(matrix, correct, chunk_rows=64)
+
+    key = np.array([1, 2, 3, 4, 1, 2])
+    right = (matrix == key).astype(float)
+    scores = right.sum(axis=1)
+    for j in range(6):
+        seen = matrix[:, j] != NOT_PRESENTED
+        item, rest = right[seen, j], scores[seen] - right[seen, j]
+        assert math.isclose(analysis.p_value[j], item.mean())
+        assert math.isclose(analysis.discrimination[j], np.corrcoef(item, rest)[0, 1])
+        assert math.isclose(analysis.choice_rates[j].sum(), 1.0)
+    p = analysis.p_value
+    assert math.isclose(analysis.kr20, 6 / 5 * (1 - (p * (1 - p)).sum() / scores.var()))
+
+
+def test_item_analysis_is_cached_until_new_attempts(app, client, make_user, admin, quiz, questions):
+    students = [make_user(f"s{i}") for i in range(3)]
+    q1, q2 = (q.id for q in questions)
+
+    for student, answers in zip(students, [("b", "c"), ("b", "a"), ("a", "")]):
+        login_as(client, student)
+        client.post(f"/student/take_quiz/{quiz.id}", data={str(q1): answers[0], str(q2): answers[1]})
+
+    login_as(client, admin)
+    report = client.get(f"/admin/analysis/items/{quiz.id}").get_json()
+    assert report["attempts"] == 3
+    first, second = report["items"]
+    assert (first["question_id"], first["correct"], first["p_value"]) == (q1, "B", 0.667)
+    assert second["choice_rates"] == {"blank": 0.333, "A": 0.333, "B": 0.0, "C": 0.333, "D": 0.0}
+    assert analyses.stats()["misses"] == 1
+
+    client.get(f"/admin/analysis/items/{quiz.id}")
+    assert analyses.stats()["hits"] == 1
+
+    login_as(client, students[2])
+    client.post(f"/student/take_quiz/{quiz.id}", data={str(q1): "b", str(q2): "c"})
+    login_as(client, admin)
+    assert client.get(f"/admin/analysis/items/{quiz.id}").get_json()["attempts"] == 4
+
+
+def test_app_starts_without_importing_numpy():
+    # Only the item analysis and answer-sheet views need NumPy; they import it on first use
+    code = "import sys; from app import create_app; create_app(); print('numpy' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True,
+                         env=dict(os.environ, DATABASE_URL="sqlite://"))
+    assert out.stdout.strip() == "False"
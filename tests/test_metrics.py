@@ -0,0 +1,35 @@
+from conftest import login_as
+from metrics import metrics
+
+
+def test_requests_are_recorded_per_endpoint(app, client, admin):
+    metrics.reset()
+    login_as(client, admin)
+
+    client.get("/admin")
+    client.get("/admin")
+    html = client.get("/admin/metrics").get_data(as_text=True)
+
+    stats = metrics.snapshot()["admin.admin_dashboard"]
+    assert stats.requests == 2
+    assert stats.statements > 0
+    assert "admin.admin_dashboard" in html
+
+
+def test_prometheus_format_accepts_token(app, client):
+    metrics.reset()
+    app.config["METRICS_TOKEN"] = "secret"
+    try:
+        client.get("/login")
+        denied = client.get("/admin/metrics?format=prometheus")
+        wrong = client.get("/admin/metrics", headers={"Authorization": "Bearer wrong"})
+        text = client.get("/admin/metrics", headers={"Authorization": "Bearer secret"}).get_data(as_text=True)
+    finally:
+        app.config["METRICS_TOKEN"] = None
+
+    assert denied.status_code == 302
+    assert wrong.status_code == 302
+    assert 'quiz_http_request_duration_seconds_count{endpoint="auth.login"} 1' in text
+    assert "# TYPE quiz_db_statements_total counter" in text
+    assert "# TYPE quiz_cache_hits_total counter" in text
+    assert "# TYPE quiz_cache_entries gauge" in text
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+
+from conftest import login_as
+from db_utils import add_question
+from models import Result, StudentQuizStats
+from omr import grade_sheets
+
+SHEETS = """username,q1,q2,q3
+alice,B,C,A
+bob,b,,d
+carol,A,B
+dave,B,X,A
+alice,B,C,A
+mallory,A,A,A
+admin,B,C,A
+
+erin,B,C,A,,
+"""
+
+
+@pytest.fixture
+def exam(quiz, make_user, admin):
+    """The Algebra quiz with a third question (answer key B, C, A) and its students."""
+    for name in ("alice", "bob", "carol", "dave", "erin"):
+        make_user(name)
+    add_question(quiz.id, "3 + 3?", "5", "6", "7", "8", "a")
+    return quiz
+
+
+def test_sheets_are_graded_and_problems_reported(app, exam):
+    report = grade_sheets(exam, io.StringIO(SHEETS), batch_size=2)
+
+    statuses = [(entry["line"], entry["username"], entry["status"], entry["score"]) for entry in report]
+    assert statuses == [
+        (2, "alice", "graded", 3),
+        (3, "bob", "graded", 1),
+        (4, "carol", "malformed", None),
+        (5, "dave", "malformed", None),
+        (6, "alice", "duplicate", None),
+        (7, "mallory", "unknown_user", None),
+        (8, "admin", "not_a_student", None),
+        (10, "erin", "graded", 3),
+    ]
+    assert report[3]["error"] == "invalid answer in Q2"
+
+    stored = {r.student.username: (r.score, r.total, r.answers) for r in Result.query}
+    assert stored == {"alice": (3, 3, "BCA"), "bob": (1, 3, "B-D"), "erin": (3, 3, "BCA")}
+    assert sum(row.attempts for row in StudentQuizStats.query) == 3
+
+
+def test_upload_renders_the_report(app, client, admin, exam):
+    login_as(client, admin)
+
+    response = client.post(f"/admin/{exam.id}/grade_sheets",
+                           data={"sheets": (io.BytesIO(SHEETS.encode()), "scans.csv")},
+                           content_type="multipart/form-data")
+
+    page = response.get_data(as_text=True)
+    assert "3 of 8 sheets graded" in page
+    assert "expected 3 answers, found 2" in page
+    assert Result.query.count() == 3
+
+
+def test_unreadable_csv_is_reported(app, client, admin, exam):
+    login_as(client, admin)
+    oversized = b"alice," + b"A" * 200000 + b"\n"  # beyond csv.field_size_limit()
+
+    response = client.post(f"/admin/{exam.id}/grade_sheets", data={"sheets": (io.BytesIO(oversized), "scans.csv")},
+                           content_type="multipart/form-data", follow_redirects=True)
+
+    assert response.status_code == 200
+    assert "Could not grade the file: field larger than field limit" in response.get_data(as_text=True)
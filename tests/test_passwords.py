@@ -0,0 +1,61 @@
+import threading
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from conftest import login_as
+from models import User
+from passwords import normalize_method
+
+OLD_HASH = "pbkdf2:sha256:500"
+
+
+def test_login_upgrades_outdated_hash(app, client, make_user):
+    make_user("alice", password=generate_password_hash("pw", method=OLD_HASH))
+
+    response = client.post("/login", data={"username": "alice", "password": "pw"})
+
+    assert response.status_code == 302 and response.location.endswith("/student/dashboard")
+    stored = User.query.filter_by(username="alice").one().password
+    assert stored.startswith("pbkdf2:sha256:1000$") and check_password_hash(stored, "pw")
+    hasher = app.extensions["password_hasher"]
+    assert hasher.stats()["rehashed"] == 1
+    assert hasher.latency()["verify"].requests == 1 and not hasher.needs_rehash(stored)
+
+
+def test_login_answers_503_when_hashing_pool_is_full(app, client, make_user):
+    make_user("alice", password=generate_password_hash("pw", method="pbkdf2:sha256:1000"))
+    hasher = app.extensions["password_hasher"]
+    release = threading.Event()
+    busy = [threading.Thread(target=hasher.run, args=("verify", release.wait)) for _ in range(hasher.capacity)]
+    for thread in busy:
+        thread.start()
+    while hasher.stats()["in_flight"] < hasher.capacity:
+        release.wait(0.001)
+
+    try:
+        response = client.post("/login", data={"username": "alice", "password": "pw"})
+    finally:
+        release.set()
+        for thread in busy:
+            thread.join()
+
+    assert response.status_code == 503 and response.headers["Retry-After"] == "2"
+    assert hasher.stats()["rejected"] == 1
+    assert client.post("/login", data={"username": "alice", "password": "pw"}).status_code == 302
+
+
+def test_hash_metrics_are_exported(app, client, admin):
+    client.post("/login", data={"username": "admin", "password": "wrong"})
+    login_as(client, admin)
+
+    text = client.get("/admin/metrics?format=prometheus").get_data(as_text=True)
+
+    assert 'quiz_password_hash_seconds_count{operation="verify"} 1' in text
+    assert "quiz_password_hasher_rejected_total 0" in text
+    assert "Password Hashing" in client.get("/admin/metrics").get_data(as_text=True)
+
+
+def test_normalize_method_spells_out_defaults():
+    assert normalize_method("pbkdf2") == "pbkdf2:sha256:260000"
+    assert normalize_method("pbkdf2:sha512") == "pbkdf2:sha512:260000"
+    assert normalize_method("pbkdf2:sha256:1000") == "pbkdf2:sha256:1000"
@@ -0,0 +1,59 @@
+import io
+
+from werkzeug.security import check_password_hash
+
+from conftest import login_as
+from models import User
+from provisioning import provision_students
+
+CHEAP_HASH = "pbkdf2:sha256:1000"
+
+
+def test_new_students_are_created_with_hashed_passwords(app, student):
+    accounts = "username,password\nalice,a1\nbob,b 2\ncarol,\nbob,b3\ndave,d4\n"
+
+    report, summary = provision_students(io.StringIO(accounts), workers=2, batch_size=1, method=CHEAP_HASH)
+
+    assert [(e["line"], e["username"], e["status"]) for e in report] == [
+        (2, "alice", "exists"), (3, "bob", "created"), (4, "carol", "malformed"),
+        (5, "bob", "duplicate"), (6, "dave", "created"),
+    ]
+    assert (summary["rows"], summary["created"]) == (5, 2)
+    bob = User.query.filter_by(username="bob").one()
+    assert bob.role == "student" and bob.is_active
+    assert check_password_hash(bob.password, "b 2")
+
+
+def test_upload_creates_accounts(app, client, admin):
+    login_as(client, admin)
+
+    response = client.post("/admin/provision_students",
+                           data={"accounts": (io.BytesIO(b"erin,e5\nadmin,x\n"), "students.csv")},
+                           content_type="multipart/form-data")
+
+    assert "1 of 2 accounts created" in response.get_data(as_text=True)
+    erin = User.query.filter_by(username="erin").one()
+    assert erin.password.startswith(app.config["PASSWORD_HASH_METHOD"] + "$")
+    assert app.extensions["password_hasher"].latency()["hash"].requests == 1
+
+    oversized = b"frank," + b"f" * 200000 + b"\n"  # beyond csv.field_size_limit()
+    response = client.post("/admin/provision_students", data={"accounts": (io.BytesIO(oversized), "students.csv")},
+                           content_type="multipart/form-data", follow_redirects=True)
+    assert "Could not read the file: field larger than field limit" in response.get_data(as_text=True)
+
+
+def test_large_upload_is_refused_before_hashing(app, client, admin):
+    app.config["PROVISION_WEB_MAX_ACCOUNTS"] = 2
+    login_as(client, admin)
+
+    accounts = b"admin,x\nerin,e5\nfrank,f6\n"  # two new accounts: at the limit
+    client.post("/admin/provision_students", data={"accounts": (io.BytesIO(accounts), "students.csv")},
+                content_type="multipart/form-data")
+    assert User.query.filter_by(role="student").count() == 2
+
+    accounts = b"gina,g7\nhank,h8\nivan,i9\n"
+    response = client.post("/admin/provision_students", data={"accounts": (io.BytesIO(accounts), "students.csv")},
+                           content_type="multipart/form-data", follow_redirects=True)
+    assert "3 new accounts, at most 2 per upload; create larger lists with" in response.get_data(as_text=True)
+    assert User.query.filter_by(role="student").count() == 2
+    assert app.extensions["password_hasher"].latency()["hash"].requests == 2
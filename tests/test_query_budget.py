@@ -0,0 +1,180 @@
+"""SQL statement budgets per route.
+
+Every route is requested against a small generated database and again after the
+database has grown; the number of statements must stay the same and within the
+route's budget, so a new N+1 (a lazy load inside a loop) fails here.
+"""
+import io
+from datetime import datetime, timedelta
+from itertools import count
+from types import SimpleNamespace
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from conftest import login_as
+from answers import record_question_order
+from db_utils import add_quiz, add_questions_bulk, add_result, add_results_bulk
+from item_analysis import analyses
+from models import db, User, Quiz, Question
+from quiz_cache import answer_keys, quiz_pages, question_orders, compile_answer_key
+
+PASSWORD = "secret"
+
+# route name -> (role, method, url template, max statements)
+ROUTES = {
+    "home": (None, "GET", "/", 0),
+    "login_form": (None, "GET", "/login", 0),
+    "login": (None, "POST", "/login", 1),
+    "register_form": (None, "GET", "/register", 0),
+    "register": (None, "POST", "/register", 2),
+    "logout": ("student", "GET", "/logout", 0),
+    "dashboard": ("student", "GET", "/dashboard", 0),
+    "admin_dashboard": ("admin", "GET", "/admin", 6),
+    "add_quiz_form": ("admin", "GET", "/admin/add_quiz", 0),
+    "add_quiz": ("admin", "POST", "/admin/add_quiz", 3),
+    "update_quiz_form": ("admin", "GET", "/admin/update_quiz/{quiz_id}", 2),
+    "update_quiz": ("admin", "POST", "/admin/update_quiz/{scratch_quiz_id}", 3),
+    "delete_quiz": ("admin", "POST", "/admin/delete_quiz/{scratch_quiz_id}", 8),
+    "add_question_form": ("admin", "GET", "/admin/{quiz_id}/add_question", 1),
+    "add_question": ("admin", "POST", "/admin/{scratch_quiz_id}/add_question", 3),
+    "update_question_form": ("admin", "GET", "/admin/update_question/{question_id}", 1),
+    "update_question": ("admin", "POST", "/admin/update_question/{scratch_question_id}", 4),
+    "delete_question": ("admin", "POST", "/admin/delete_question/{scratch_question_id}", 3),
+    "update_user": ("admin", "POST", "/admin/update_user/{student_id}", 1),
+    "grade_sheets_form": ("admin", "GET", "/admin/{quiz_id}/grade_sheets", 2),
+    "grade_sheets": ("admin", "POST", "/admin/{quiz_id}/grade_sheets", 11),
+    "provision_students_form": ("admin", "GET", "/admin/provision_students", 0),
+    "provision_students": ("admin", "POST", "/admin/provision_students", 2),
+    "analysis": ("admin", "GET", "/admin/analysis", 4),
+    "analysis_results": ("admin", "GET", "/admin/analysis/results", 1),
+    "item_analysis": ("admin", "GET", "/admin/analysis/items/{quiz_id}", 6),
+    "export_results": ("admin", "GET", "/admin/export/results?format=csv&gzip=0", 1),
+    "metrics": ("admin", "GET", "/admin/metrics", 0),
+    "cache_stats": ("admin", "GET", "/admin/cache_stats", 0),
+    "student_dashboard": ("student", "GET", "/student/dashboard", 2),
+    "take_quiz_form": ("student", "GET", "/student/take_quiz/{quiz_id}", 3),
+    "submit_quiz": ("student", "POST", "/student/take_quiz/{quiz_id}", 10),
+    "student_results": ("student", "GET", "/student/results", 3),
+    "review_result": ("student", "GET", "/student/results/{result_id}/review", 3),
+    "update_profile_form": ("student", "GET", "/student/update_profile", 1),
+    "update_profile": ("student", "POST", "/student/update_profile", 3),
+}
+serial = count()
+
+
+def generate(quizzes, questions, students, attempts, start=0):
+    """Add quizzes with questions and `attempts` results per student and quiz."""
+    # A cheap hash keeps the generator fast; the login route still verifies it
+    password = generate_password_hash(PASSWORD, method="pbkdf2:sha256:1000")
+    users = [User(username=f"student{start + i}", password=password, role="student", is_active=True)
+             for i in range(students)]
+    db.session.add_all(users)
+    db.session.commit()
+    student_ids = [u.id for u in User.query.filter_by(role="student")]
+
+    when = datetime(2025, 1, 1)
+    for n in range(start, start + quizzes):
+        quiz = add_quiz(f"Quiz {n}", f"Generated quiz {n}")
+        add_questions_bulk(quiz.id, [(f"Question {k}", "a", "b", "c", "d", "abcd"[k % 4])
+                                     for k in range(questions)])
+        add_results_bulk([(student_id, quiz.id, (student_id + a) % (questions + 1), questions,
+                           when + timedelta(minutes=student_id * 7 + a))
+                          for student_id in student_ids for a in range(attempts)])
+
+
+@pytest.fixture
+def site(app):
+    admin = User(username="admin", password=generate_password_hash(PASSWORD, method="pbkdf2:sha256:1000"),
+                 role="admin", is_active=True)
+    db.session.add(admin)
+    db.session.commit()
+    generate(quizzes=2, questions=3, students=2, attempts=1)
+    quiz = Quiz.query.order_by(Quiz.id).first()
+    student = User.query.filter_by(role="student").order_by(User.id).first()
+    # The quiz has been taken before, so its question order is already stored
+    record_question_order(quiz, compile_answer_key(quiz.id))
+    reviewed = add_result(student.id, quiz.id, 1, 3, quiz_version=quiz.version, answers="A-C")
+    # Plain copies: the measured requests start from an empty session
+    as_login = lambda u: SimpleNamespace(id=u.id, username=u.username, role=u.role)
+    return {
+        "admin": as_login(admin),
+        "student": as_login(student),
+        "student_id": student.id,
+        "quiz_id": quiz.id,
+        "result_id": reviewed.id,
+        "question_id": Question.query.filter_by(quiz_id=quiz.id).order_by(Question.id).first().id,
+    }
+
+
+def scratch_quiz():
+    """A taken quiz of fixed size for the routes that change or delete one."""
+    n = next(serial)
+    quiz = add_quiz(f"Scratch {n}", "")
+    add_questions_bulk(quiz.id, [(f"Question {k}", "a", "b", "c", "d", "a") for k in range(3)])
+    student_id = User.query.filter_by(role="student").first().id
+    add_result(student_id, quiz.id, 1, 3)
+    question = Question.query.filter_by(quiz_id=quiz.id).first()
+    return {"scratch_quiz_id": quiz.id, "scratch_question_id": question.id}
+
+
+def request_for(route, site):
+    """Return (url parameters, form data) for route, creating any rows it will change."""
+    n = next(serial)
+    params = dict(site)
+    if "{scratch_" in ROUTES[route][2]:
+        params.update(scratch_quiz())
+    question = {"text": f"Changed {n}", "choice_a": "a", "choice_b": "b", "choice_c": "c",
+                "choice_d": "d", "correct": "b"}
+    forms = {
+        "login": {"username": "admin", "password": PASSWORD},
+        "register": {"username": f"newcomer{n}", "password": PASSWORD},
+        "add_quiz": {"title": f"Added {n}", "description": ""},
+        "update_quiz": {"title": f"Renamed {n}", "description": "Changed"},
+        "add_question": question,
+        "update_question": question,
+        "update_user": {"role": "student", "is_active": "1"},
+        "grade_sheets": {"sheets": (io.BytesIO(f"{site['student'].username},A,,C\n".encode()), "sheets.csv")},
+        "provision_students": {"accounts": (io.BytesIO(f"pupil{n},{PASSWORD}\n".encode()), "accounts.csv")},
+        "update_profile": {"username": site["student"].username, "password": PASSWORD},
+    }
+    if route == "submit_quiz":
+        ids = [q.id for q in Question.query.filter_by(quiz_id=site["quiz_id"])]
+        forms[route] = {str(i): "a" for i in ids}
+    return params, forms.get(route)
+
+
+def statements_for(app, client, query_counter, site, route):
+    role, method, url, _ = ROUTES[route]
+    params, data = request_for(route, site)
+    url = url.format(**params)
+    with client.session_transaction() as sess:
+        sess.clear()
+    if role:
+        login_as(client, site[role])
+
+    # Measure the cold path: nothing may be served from a warm cache
+    answer_keys.clear()
+    quiz_pages.clear()
+    question_orders.clear()
+    analyses.clear()
+    db.session.remove()
+    del query_counter[:]
+    response = client.open(url, method=method, data=data)
+    response.get_data()  # consume streamed bodies inside the measurement
+    assert response.status_code in (200, 302), (route, response.status_code)
+    count = len(query_counter)
+    db.session.remove()
+    return count
+
+
+def test_statements_per_route_do_not_grow_with_data(app, client, query_counter, site):
+    small = {route: statements_for(app, client, query_counter, site, route) for route in ROUTES}
+
+    generate(quizzes=25, questions=20, students=30, attempts=3, start=100)
+    large = {route: statements_for(app, client, query_counter, site, route) for route in ROUTES}
+
+    over_budget = {route: n for route, n in large.items() if n > ROUTES[route][3]}
+    grew = {route: (small[route], large[route]) for route in ROUTES if large[route] != small[route]}
+    assert grew == {}
+    assert over_budget == {}
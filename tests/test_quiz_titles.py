@@ -0,0 +1,24 @@
+from conftest import login_as
+from db_utils import add_quiz, update_quiz
+from models import db, Quiz
+
+
+def test_quiz_titles_stay_unique(app):
+    first = add_quiz("Algebra", "")
+    second = add_quiz("Geometry", "")
+
+    assert add_quiz("Algebra", "again") is None
+    assert update_quiz(second.id, new_title="Algebra") is None
+    assert db.session.get(Quiz, second.id).title == "Geometry"
+    assert update_quiz(first.id, new_title="Algebra I").title == "Algebra I"
+
+
+def test_renaming_to_a_taken_title_is_reported(app, client, admin):
+    add_quiz("Algebra", "")
+    quiz = add_quiz("Geometry", "")
+    login_as(client, admin)
+
+    response = client.post(f"/admin/update_quiz/{quiz.id}", data={"title": "Algebra", "description": ""})
+
+    assert response.status_code == 200
+    assert "Quiz with this title already exists." in response.get_data(as_text=True)
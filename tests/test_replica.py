@@ -0,0 +1,67 @@
+import pytest
+from flask import Flask
+
+from config import Config
+from database import init_database
+from models import db, User
+from replica import read_replica
+
+
+@pytest.fixture
+def split_app(tmp_path):
+    # Two SQLite files stand in for the primary and its replica
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'primary.db'}",
+                      READ_REPLICA_URL=f"sqlite:///{tmp_path / 'replica.db'}", SQLALCHEMY_BINDS={})
+    init_database(app)
+
+    @app.route("/users")
+    @read_replica
+    def users():
+        return ",".join(u.username for u in User.query.order_by(User.username))
+
+    @app.route("/users/primary")
+    def users_on_primary():
+        return ",".join(u.username for u in User.query.order_by(User.username))
+
+    @app.route("/users", methods=["POST"])
+    def add_user():
+        db.session.add(User(username="carol", password="x", role="student", is_active=True))
+        db.session.commit()
+        return "ok"
+
+    with app.app_context():
+        for engine in db.engines.values():
+            db.metadata.create_all(engine)
+        with db.engines[None].begin() as conn:
+            conn.execute(User.__table__.insert(), [{"username": "alice"}, {"username": "bob"}])
+        with db.engines["replica"].begin() as conn:
+            conn.execute(User.__table__.insert(), [{"username": "alice"}])  # lagging behind
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_read_only_routes_use_the_replica(split_app):
+    client = split_app.test_client()
+
+    assert client.get("/users").data == b"alice"
+    assert client.get("/users/primary").data == b"alice,bob"
+
+
+def test_request_can_be_pinned_to_primary(split_app):
+    client = split_app.test_client()
+
+    assert client.get("/users?primary=1").data == b"alice,bob"
+    assert client.get("/users", headers={"X-Read-Primary": "1"}).data == b"alice,bob"
+
+
+def test_reads_follow_the_users_own_writes(split_app):
+    client = split_app.test_client()
+    client.post("/users")
+
+    assert client.get("/users").data == b"alice,bob,carol"
+    # Another user, without a recent write, still reads the replica
+    assert split_app.test_client().get("/users").data == b"alice"
@@ -0,0 +1,47 @@
+import threading
+
+from models import db, Result, QuizStats
+from result_writer import ResultWriter
+
+
+def test_batched_writer_commits_rows_and_rollups(app, student, quiz):
+    writer = ResultWriter(app, batch_size=16, max_delay_ms=5)
+
+    for score in range(50):
+        writer.submit(student.id, quiz.id, score % 5, 4)
+    writer.flush()
+
+    assert Result.query.count() == 50
+    assert db.session.get(QuizStats, quiz.id).attempts == 50
+    assert writer.stats()["written"] == 50
+    assert writer.stats()["batches"] < 50
+    writer.stop()
+
+
+def test_writer_falls_back_to_sync_writes(app, student, quiz):
+    writer = ResultWriter(app)
+    writer.stop()
+
+    writer.submit(student.id, quiz.id, 3, 4)
+
+    assert Result.query.count() == 1
+    assert writer.stats()["sync_writes"] == 1
+
+
+def test_row_submitted_during_stop_is_not_lost(app, student, quiz):
+    writer = ResultWriter(app)
+    writer.start()
+    put_nowait = writer._queue.put_nowait
+    stopper = threading.Thread(target=writer.stop)
+
+    def put_while_stopping(row):
+        # stop() runs between submit()'s check and its enqueue
+        stopper.start()
+        stopper.join(0.2)
+        put_nowait(row)
+
+    writer._queue.put_nowait = put_while_stopping
+    writer.submit(student.id, quiz.id, 3, 4)
+    stopper.join()
+
+    assert Result.query.count() == 1
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from db_utils import add_quiz, add_result, add_results_bulk, delete_result, update_result
+from models import db, Result, QuizStats, StudentQuizStats
+from stats import COUNTERS, rebuild_stats
+
+# (score, total) covering an empty quiz and every band, including the 80/60/50% edges
+ATTEMPTS = [(0, 0), (9, 10), (8, 10), (7, 10), (6, 10), (5, 10), (4, 10), (0, 10)]
+
+
+def rollups():
+    """Every rollup row as {key: counters}; student rows emptied by deletes are left out."""
+    db.session.expire_all()
+    per_quiz = {(row.quiz_id,): tuple(round(getattr(row, name), 6) for name in COUNTERS)
+                for row in QuizStats.query}
+    per_student = {(row.student_id, row.quiz_id): tuple(round(getattr(row, name), 6) for name in COUNTERS)
+                   for row in StudentQuizStats.query if row.attempts}
+    return per_quiz, per_student
+
+
+def assert_matches_rebuild():
+    maintained = rollups()
+    rebuild_stats()
+    assert maintained == rollups()
+
+
+def test_single_writes_match_rebuild(app, make_user, student, quiz):
+    bob = make_user("bob")
+    for score, total in ATTEMPTS:
+        add_result(student.id, quiz.id, score, total)
+    add_result(bob.id, quiz.id, 3, 4)
+    assert_matches_rebuild()
+
+    first, second, *_ = Result.query.filter_by(student_id=student.id).order_by(Result.id)
+    update_result(first.id, score=2, total=4)  # 0/0 poor -> 50% fair
+    update_result(second.id, score=1)  # 90% excellent -> 10% poor
+    assert_matches_rebuild()
+
+    bobs = Result.query.filter_by(student_id=bob.id).one()
+    assert delete_result(bobs.id)
+    assert_matches_rebuild()
+    assert QuizStats.query.get(quiz.id).attempts == len(ATTEMPTS)
+
+
+def test_bulk_writes_match_rebuild(app, make_user, student, quiz):
+    bob = make_user("bob")
+    other = add_quiz("Geometry", "Shapes")
+    now = datetime.utcnow()
+    add_results_bulk([(user.id, quiz_id, score, total, now)
+                      for user in (student, bob) for quiz_id in (quiz.id, other.id)
+                      for score, total in ATTEMPTS])
+    add_results_bulk([(student.id, quiz.id, 10, 10, now)])  # existing rows are incremented
+    assert_matches_rebuild()
+    assert QuizStats.query.get(quiz.id).attempts == 2 * len(ATTEMPTS) + 1
+
+
+def test_new_quiz_starts_with_an_empty_rollup(app):
+    quiz = add_quiz("Geometry", "Shapes")
+    assert QuizStats.query.get(quiz.id).attempts == 0
+    assert_matches_rebuild()
+
+
+def test_first_attempt_that_loses_the_insert_race_is_retried(app, monkeypatch, student, quiz):
+    add_result(student.id, quiz.id, 1, 2)  # another worker's first attempt, committed first
+    real_get = db.session.get
+    stale = []
+
+    def get(model, key, **kwargs):
+        if model is StudentQuizStats and not stale:
+            stale.append(key)
+            return None  # looked up before the other worker's row was committed
+        return real_get(model, key, **kwargs)
+
+    monkeypatch.setattr(db.session, "get", get)
+    add_result(student.id, quiz.id, 2, 2)
+
+    assert stale and Result.query.count() == 2
+    assert StudentQuizStats.query.one().attempts == 2
+    assert_matches_rebuild()
@@ -0,0 +1,46 @@
+from conftest import login_as
+from db_utils import add_quiz, add_question, add_result
+
+
+def make_quizzes(count, start=0, student_ids=()):
+    for i in range(start, start + count):
+        quiz = add_quiz(f"Quiz {i}", f"Description {i}")
+        for n in range(3):
+            add_question(quiz.id, f"Question {n}", "a", "b", "c", "d", "b")
+        for student_id in student_ids:
+            add_result(student_id, quiz.id, i % 4, 3)
+
+
+def dashboard_queries(client, query_counter):
+    del query_counter[:]
+    response = client.get("/student/dashboard")
+    assert response.status_code == 200
+    return len(query_counter)
+
+
+def test_dashboard_query_count_does_not_grow_with_quizzes(app, client, query_counter, make_user, student):
+    other = make_user("bob")
+    login_as(client, student)
+
+    make_quizzes(2, student_ids=(student.id, other.id))
+    few = dashboard_queries(client, query_counter)
+
+    make_quizzes(20, start=2, student_ids=(student.id, other.id))
+    many = dashboard_queries(client, query_counter)
+
+    assert many == few
+    assert many <= 2
+
+
+def test_dashboard_shows_only_the_students_attempts(app, client, make_user, student, quiz):
+    other = make_user("bob")
+    add_result(student.id, quiz.id, 1, 1)
+    add_result(other.id, quiz.id, 0, 1)
+    add_result(other.id, quiz.id, 0, 1)
+    login_as(client, student)
+
+    html = client.get("/student/dashboard").get_data(as_text=True)
+
+    assert "Attempts: 1" in html
+    assert "2 questions" in html
+    assert "100.0%" in html
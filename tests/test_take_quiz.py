@@ -0,0 +1,84 @@
+from answers import decode_answers
+from conftest import login_as
+from db_utils import add_quiz, add_question, delete_quiz, update_question
+from models import Result
+from quiz_cache import answer_keys, quiz_pages
+
+
+def test_submission_is_graded_from_cached_answer_key(app, client, query_counter, student, quiz, questions):
+    answer_keys.clear()
+    q1, q2 = (q.id for q in questions)
+    login_as(client, student)
+
+    client.post(f"/student/take_quiz/{quiz.id}", data={str(q1): "b", str(q2): "a"})
+    del query_counter[:]
+    client.post(f"/student/take_quiz/{quiz.id}", data={str(q1): "b", str(q2): "c"})
+
+    # The review page still renders the questions; only the answer-key load must be skipped
+    grading = [s for s in query_counter if s.startswith("SELECT question.id, question.correct")]
+    assert grading == []
+    assert [r.score for r in Result.query.order_by(Result.id)] == [1, 2]
+
+
+def test_answer_key_is_invalidated_by_question_update(app, client, student, quiz, questions):
+    answer_keys.clear()
+    q1, q2 = (q.id for q in questions)
+    login_as(client, student)
+
+    client.post(f"/student/take_quiz/{quiz.id}", data={str(q1): "b", str(q2): "c"})
+    update_question(q2, correct="a")
+    client.post(f"/student/take_quiz/{quiz.id}", data={str(q1): "b", str(q2): "c"})
+
+    assert [r.score for r in Result.query.order_by(Result.id)] == [2, 1]
+
+
+def test_quiz_page_is_rendered_once_per_version(app, client, student, quiz, questions):
+    quiz_pages.clear()
+    login_as(client, student)
+
+    first = client.get(f"/student/take_quiz/{quiz.id}").get_data(as_text=True)
+    second = client.get(f"/student/take_quiz/{quiz.id}").get_data(as_text=True)
+    assert first == second
+    assert "2 + 2?" in first
+    assert quiz_pages.stats()["hits"] == 1
+
+    update_question(questions[1].id, new_text="3 + 3?")
+    third = client.get(f"/student/take_quiz/{quiz.id}").get_data(as_text=True)
+    assert "3 + 3?" in third
+    assert quiz_pages.stats()["misses"] == 2
+
+
+def test_answers_are_packed_and_can_be_reviewed_later(app, client, student, quiz, questions):
+    q1, q2 = (q.id for q in questions)
+    login_as(client, student)
+    client.post(f"/student/take_quiz/{quiz.id}", data={str(q1): "b"})
+
+    result = Result.query.one()
+    assert (result.quiz_version, result.answers) == (3, "B-")
+
+    # A later edit reorders nothing for the stored attempt: it decodes with its own version
+    q3 = add_question(quiz.id, "3 + 3?", "5", "6", "7", "8", "b")
+    assert decode_answers(result) == {q1: "B", q2: None}
+    assert q3.id not in decode_answers(result)
+
+    page = client.get(f"/student/results/{result.id}/review")
+    assert page.status_code == 200
+    assert "2 + 2?" in page.get_data(as_text=True)
+    assert "3 + 3?" not in page.get_data(as_text=True)
+
+
+def test_recreated_quiz_does_not_get_the_deleted_quiz_cache(app, client, student, quiz, questions):
+    login_as(client, student)
+    old_id, old_version = quiz.id, quiz.version
+    assert "2 + 2?" in client.get(f"/student/take_quiz/{old_id}").get_data(as_text=True)
+
+    delete_quiz(old_id)
+    other = add_quiz("Geometry", "Shapes")
+    add_question(other.id, "Sides of a triangle?", "2", "3", "4", "5", "b")
+    square = add_question(other.id, "Sides of a square?", "2", "3", "4", "5", "c")
+    assert (other.id, other.version) == (old_id + 1, old_version)
+
+    page = client.get(f"/student/take_quiz/{other.id}").get_data(as_text=True)
+    assert "Sides of a square?" in page and "2 + 2?" not in page
+    client.post(f"/student/take_quiz/{other.id}", data={str(square.id): "c"})
+    assert Result.query.one().score == 1
@@ -0,0 +1,75 @@
+from docx import Document
+
+from models import Quiz, Question
+from word_import import find_documents, import_documents, parse_document
+
+CHOICES = [("What is 1 + 1?", ["1", "2", "3", "4"]),
+           ("What is 2 + 2?", ["2", "3", "4", "5"])]
+
+
+def write_document(title="Arithmetic", questions=CHOICES, bold=None, star=None):
+    """Save a question bank; bold/star map a question index to the marked choice index."""
+    doc = Document()
+    doc.add_paragraph(title)
+    for i, (text, choices) in enumerate(questions):
+        doc.add_paragraph(f"{i + 1}. {text}")
+        for c, choice in enumerate(choices):
+            label = f"{'abcd'[c]}) {choice}"
+            if star and star.get(i) == c:
+                label += " *"
+            run = doc.add_paragraph().add_run(label)
+            run.bold = bool(bold and bold.get(i) == c)
+    return doc
+
+
+def test_answer_table_and_answer_key_section(tmp_path):
+    doc = write_document()
+    table = doc.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text, table.rows[0].cells[1].text = "1", "b"
+    doc.add_paragraph("Answer key")
+    doc.add_paragraph("2. C")
+    doc.save(tmp_path / "keyed.docx")
+
+    parsed = parse_document(str(tmp_path / "keyed.docx"))
+
+    assert parsed.title == "Arithmetic"
+    assert parsed.questions == [("What is 1 + 1?", "1", "2", "3", "4", "B"),
+                                ("What is 2 + 2?", "2", "3", "4", "5", "C")]
+    assert parsed.unanswered == []
+
+
+def test_bold_and_starred_choices_mark_the_answer(tmp_path):
+    write_document(bold={0: 1}, star={1: 2}).save(tmp_path / "marked.docx")
+
+    parsed = parse_document(str(tmp_path / "marked.docx"))
+
+    assert [q[5] for q in parsed.questions] == ["B", "C"]
+    assert parsed.questions[1][3] == "4"  # the marker is stripped from the choice
+
+
+def test_fallback_answers_fill_unmarked_questions(tmp_path):
+    write_document(bold={0: 3}).save(tmp_path / "partial.docx")
+
+    assert parse_document(str(tmp_path / "partial.docx")).unanswered == [2]
+    parsed = parse_document(str(tmp_path / "partial.docx"), fallback_answers=["a", "b"])
+    assert [q[5] for q in parsed.questions] == ["D", "B"]
+    assert parsed.unanswered == []
+
+
+def test_documents_are_found_and_imported(app, tmp_path):
+    write_document(title="First", bold={0: 1, 1: 2}).save(tmp_path / "first.docx")
+    write_document(title="Second", star={0: 0}).save(tmp_path / "second.docx")
+    (tmp_path / "~$first.docx").write_bytes(b"lock file")
+    (tmp_path / "notes.txt").write_text("not a question bank")
+    (tmp_path / "broken.docx").write_bytes(b"not a zip")
+
+    paths = find_documents([str(tmp_path), str(tmp_path / "first.docx")])
+    assert [p.rsplit("/", 1)[-1] for p in paths] == ["broken.docx", "first.docx", "second.docx"]
+
+    reports = {r["file"].rsplit("/", 1)[-1]: r for r in import_documents(paths, workers=1)}
+
+    assert reports["broken.docx"]["status"] == "parse_failed"
+    assert (reports["first.docx"]["status"], reports["first.docx"]["inserted"]) == ("ok", 2)
+    assert reports["second.docx"]["status"] == "partial"  # question 2 has no answer
+    assert Quiz.query.filter_by(title="Second").one() is not None
+    assert Question.query.count() == 3
@@ -0,0 +1,210 @@
+"""Import directories of Word (.docx) question banks.
+
+Documents are parsed in a process pool and their questions are streamed into the
+database in batches as each file finishes:
+
+    python word_import.py lectures/ "extra/*.docx" --workers 8 --report report.json
+
+Each document starts with the quiz title, followed by numbered questions
+("1. ...") with four choices ("a) ..." / "A. ..."). The answer key is read from
+the document itself, in this order of preference:
+
+  * a table whose rows are "<question number> | <letter>", or an "Answer key"
+    section with lines such as "1. B" after the questions;
+  * a marked choice: bold text, or a leading/trailing "*", "✓" or "✔".
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+QUESTION_RE = re.compile(r'^(\d+)\s*[.)]\s*(.+)$')
+CHOICE_RE = re.compile(r'^([a-dA-D])\s*[.):\-]\s*(.*)$')
+ANSWER_RE = re.compile(r'^(\d+)\s*[.):\-]?\s*([a-dA-D])\s*$')
+ANSWER_HEADING_RE = re.compile(r'^(answer\s*key|answers|correct\s*answers)\b', re.IGNORECASE)
+MARKERS = ('*', '✓', '✔')
+
+# questions: list of (text, choice_a, choice_b, choice_c, choice_d, correct) ready for
+# db_utils.add_questions_bulk; unanswered lists question numbers without a key
+ParsedQuiz = namedtuple('ParsedQuiz', 'path title questions unanswered parse_seconds')
+
+
+# --- Parsing (runs in worker processes, no database access) ---
+def _is_bold(paragraph):
+    runs = [r for r in paragraph.runs if r.text.strip()]
+    return bool(runs) and all(r.bold for r in runs)
+
+
+def _strip_marker(text):
+    for marker in MARKERS:
+        if text.startswith(marker):
+            return text[len(marker):].strip(), True
+        if text.endswith(marker):
+            return text[:-len(marker)].strip(), True
+    return text, False
+
+
+def _table_answers(doc):
+    answers = {}
+    for table in doc.tables:
+        for row in table.rows:
+            cells = [c.text.strip() for c in row.cells]
+            # A row may hold several "number | letter" pairs side by side
+            for number, letter in zip(cells[::2], cells[1::2]):
+                if number.isdigit() and len(letter) == 1 and letter.upper() in 'ABCD':
+                    answers[int(number)] = letter.upper()
+    return answers
+
+
+def parse_document(path, fallback_answers=None):
+    """Parse one .docx question bank into a ParsedQuiz.
+
+    fallback_answers is an optional list of letters (in question order) used for
+    questions the document itself does not mark.
+    """
+    from docx import Document  # heavy import, only needed by the parser
+
+    started = time.perf_counter()
+    doc = Document(path)
+    paragraphs = [p for p in doc.paragraphs if p.text.strip()]
+    if not paragraphs:
+        raise ValueError("document is empty")
+
+    title = paragraphs[0].text.strip()
+    answers = _table_answers(doc)
+    parsed = []  # [number, text, {letter: text}, marked letter]
+    in_answer_key = False
+
+    for paragraph in paragraphs[1:]:
+        line = paragraph.text.strip()
+        if ANSWER_HEADING_RE.match(line):
+            in_answer_key = True
+            continue
+        if in_answer_key:
+            match = ANSWER_RE.match(line)
+            if match:
+                answers[int(match.group(1))] = match.group(2).upper()
+            continue
+
+        question = QUESTION_RE.match(line)
+        choice = CHOICE_RE.match(line)
+        if choice and parsed and len(parsed[-1][2]) < 4:
+            letter = choice.group(1).upper()
+            text, marked = _strip_marker(choice.group(2).strip())
+            parsed[-1][2][letter] = text
+            if marked or _is_bold(paragraph):
+                parsed[-1][3] = letter
+        elif question:
+            parsed.append([int(question.group(1)), question.group(2).strip(), {}, None])
+
+    questions = []
+    unanswered = []
+    for ordinal, (number, text, choices, marked) in enumerate(parsed):
+        correct = answers.get(number) or marked
+        if not correct and fallback_answers and ordinal < len(fallback_answers):
+            correct = fallback_answers[ordinal].upper()
+        if not correct:
+            unanswered.append(number)
+        questions.append((text, choices.get('A'), choices.get('B'), choices.get('C'),
+                          choices.get('D'), correct))
+
+    return ParsedQuiz(path, title, questions, unanswered, time.perf_counter() - started)
+
+
+# --- Database side (main process) ---
+def store_quiz(parsed, batch_size, description=None):
+    """Create the quiz and bulk-insert its questions; must run in an app context."""
+    from db_utils import add_quiz, add_questions_bulk
+
+    description = description or f"Auto-imported from {os.path.basename(parsed.path)}."
+    quiz = add_quiz(parsed.title, description)
+    if quiz is None:
+        return None, None
+    return quiz, add_questions_bulk(quiz.id, parsed.questions, batch_size=batch_size)
+
+
+def find_documents(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.docx')
+        paths.extend(p for p in sorted(glob.glob(pattern))
+                     if p.lower().endswith('.docx') and not os.path.basename(p).startswith('~$'))
+    return list(dict.fromkeys(paths))  # de-duplicate, keep order
+
+
+def import_documents(paths, workers=None, batch_size=500):
+    """Parse paths in a process pool and store each quiz as soon as it is parsed.
+
+    Must run inside an app context. Returns one report dict per file.
+    """
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(parse_document, path): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            report = {'file': path, 'status': 'ok', 'title': None, 'questions': 0,
+                      'inserted': 0, 'errors': [], 'parse_seconds': None, 'db_seconds': None}
+            try:
+                parsed = future.result()
+            except Exception as exc:  # a broken document must not stop the others
+                report.update(status='parse_failed', errors=[str(exc)])
+                reports.append(report)
+                continue
+
+            report.update(title=parsed.title, questions=len(parsed.questions),
+                          parse_seconds=round(parsed.parse_seconds, 3))
+            started = time.perf_counter()
+            quiz, result = store_quiz(parsed, batch_size)
+            report['db_seconds'] = round(time.perf_counter() - started, 3)
+            if quiz is None:
+                report.update(status='skipped', errors=['quiz with this title already exists'])
+            else:
+                report['inserted'] = result.inserted
+                report['errors'] = [f"question {i + 1}: {msg}" for i, msg in result.errors]
+                if result.errors:
+                    report['status'] = 'partial'
+            reports.append(report)
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import Word (.docx) question banks.")
+    parser.add_argument('paths', nargs='+', help="directories or glob patterns of .docx files")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=500, help="questions per insert batch")
+    parser.add_argument('--report', help="write the per-file report to this JSON file")
+    args = parser.parse_args(argv)
+
+    paths = find_documents(args.paths)
+    if not paths:
+        parser.error("no .docx files found")
+
+    from app import create_app
+
+    app = create_app()
+    started = time.perf_counter()
+    with app.app_context():
+        reports = import_documents(paths, workers=args.workers, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+
+    for r in reports:
+        print(f"{r['status']:>12}  {r['inserted']:>4}/{r['questions']:<4} "
+              f"parse {r['parse_seconds'] or 0:.2f}s  db {r['db_seconds'] or 0:.2f}s  {r['file']}")
+        for error in r['errors']:
+            print(f"{'':>14}- {error}")
+    total = sum(r['inserted'] for r in reports)
+    print(f"✅ Imported {total} questions from {len(reports)} files in {elapsed:.2f}s")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as fh:
+            json.dump({'elapsed_seconds': round(elapsed, 3), 'files': reports}, fh, indent=2)
+    return 0 if all(r['status'] == 'ok' for r in reports) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())